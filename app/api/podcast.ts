@@ -60,6 +60,7 @@ export interface PaperPreviewResponse {
   conference: string;
   can_reselect: boolean;
   total_papers_in_conference: number;
+  session_id?: string;
 }
 
 // 논문 분석만 수행
@@ -215,14 +216,15 @@ export const getPaperPreview = async (field: string, conference: string): Promis
 };
 
 // 같은 조건으로 다른 논문 재선택
-export const reselectPaper = async (field: string, conference: string, currentPaperId?: string): Promise<PaperPreviewResponse> => {
+export const reselectPaper = async (field: string, conference: string, currentPaperId?: string, sessionId?: string): Promise<PaperPreviewResponse> => {
   const response = await fetch(`${BACKEND_URL}/api/v1/podcast/papers/reselect?field=${encodeURIComponent(field)}&conference=${encodeURIComponent(conference)}`, {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
     },
     body: JSON.stringify({
-      current_paper_id: currentPaperId
+      current_paper_id: currentPaperId,
+      session_id: sessionId
     }),
   });
   
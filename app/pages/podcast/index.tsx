@@ -176,7 +176,7 @@ const PodcastPage: React.FC = () => {
     setError(null);
     
     try {
-      const response = await reselectPaper(field, selectedConference.name, paperPreview.paper.id);
+      const response = await reselectPaper(field, selectedConference.name, paperPreview.paper.id, paperPreview.session_id);
       setPaperPreview(response);
     } catch (err) {
       setError('논문 재선택에 실패했습니다.');
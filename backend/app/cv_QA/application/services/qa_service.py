@@ -10,6 +10,7 @@ from docx import Document
 from ...domain.entities.qa_session import QASession, QAMessage
 from ...domain.repositories.qa_repository import QARepository
 from app.shared.infra.external.openai_client import get_openai_client
+from app.shared.infra.external.llm_scheduler import PRIORITY_INTERACTIVE
 
 logger = logging.getLogger(__name__)
 
@@ -318,7 +319,7 @@ JSON 배열 형태로 5개의 질문만 반환해주세요:
             """
             
             openai_client = get_openai_client(self.api_key)
-            response = await openai_client._call_chat_completion(prompt)
+            response = await openai_client._call_chat_completion(prompt, priority=PRIORITY_INTERACTIVE)
             
             # JSON 파싱 시도
             try:
@@ -391,7 +392,7 @@ JSON 형식으로만 응답해주세요.
 """
 
             openai_client = get_openai_client(self.api_key)
-            response = await openai_client._call_chat_completion(prompt)
+            response = await openai_client._call_chat_completion(prompt, priority=PRIORITY_INTERACTIVE)
             
             # JSON 파싱 시도
             try:
@@ -452,7 +453,7 @@ CV 분석 정보:
 """
 
             openai_client = get_openai_client(self.api_key)
-            response = await openai_client._call_chat_completion(prompt)
+            response = await openai_client._call_chat_completion(prompt, priority=PRIORITY_INTERACTIVE)
             
             return {
                 "content": response
@@ -589,7 +590,7 @@ JSON 배열 형태로 5개의 질문만 반환해주세요:
 """
 
             openai_client = get_openai_client(self.api_key)
-            response = await openai_client._call_chat_completion(prompt)
+            response = await openai_client._call_chat_completion(prompt, priority=PRIORITY_INTERACTIVE)
             
             # JSON 파싱 시도
             try:
@@ -1,17 +1,62 @@
-from typing import List, Dict, Any, Optional
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
+import asyncio
 import logging
+import os
 import re
 from ...domain.repositories.cv_repository import CVRepository
 from ...domain.entities.cv_analysis import CVAnalysis
 from ...domain.value_objects.cv_skill import CVSkill, SkillLevel, SkillCategory, SkillAssessment
 from ...domain.value_objects.radar_chart_data import CVRadarChartData
 from app.shared.infra.external.openai_client import get_openai_client
+from app.shared.infra.external.llm_scheduler import PRIORITY_BATCH, llm_priority
+from app.shared.infra.external.prompt_budget import PromptBlock, PromptBudget
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 class CVAnalysisService:
     """CV 분석 서비스"""
     
+    # 요청 하나에서 동시에 보낼 LLM 호출 수
+    MAX_CONCURRENT_LLM_CALLS = int(os.getenv("CV_ANALYSIS_MAX_CONCURRENCY", "6"))
+    
+    # 분석 항목별 기본값 (호출이 실패한 항목만 기본값으로 대체)
+    DEFAULT_STRENGTHS = [
+        "{field} 분야에서 다양한 프로젝트 경험 보유",
+        "LLM 및 AI 기술에 대한 깊은 이해",
+        "실제 서비스 개발 및 배포 경험"
+    ]
+    DEFAULT_WEAKNESSES = [
+        "더 많은 학술 논문 발표 경험 필요",
+        "특정 분야에서의 전문성 심화 필요",
+        "국제적인 연구 협력 경험 확대 필요"
+    ]
+    DEFAULT_SCORE = 0.5
+    
+    # 분석 프롬프트마다 들어가는 CV 본문의 토큰 예산 (넘으면 뒷부분을 생략)
+    CV_TEXT_TOKEN_BUDGET = 6000
+    
+    # 레이더 차트 6개 영역을 한 번에 받는 구조화 출력 스키마 (영역마다 점수와 근거)
+    RADAR_SCORE_SCHEMA = {
+        "type": "object",
+        "properties": {
+            dimension: {
+                "type": "object",
+                "properties": {
+                    "score": {"type": "number"},
+                    "rationale": {"type": "string"}
+                },
+                "required": ["score", "rationale"],
+                "additionalProperties": False
+            }
+            for dimension in CVRadarChartData.DIMENSIONS
+        },
+        "required": list(CVRadarChartData.DIMENSIONS),
+        "additionalProperties": False
+    }
+    RADAR_SCORE_MAX_TOKENS = 1200
+    
     def __init__(self, cv_repository: CVRepository, api_key: str = None):
         self.cv_repository = cv_repository
         self.openai_client = get_openai_client(api_key)
@@ -21,27 +66,30 @@ class CVAnalysisService:
         try:
             logger.info(f"CV 분석 시작: {field} 분야")
             
-            # 1. 트렌드 분석 결과 조회
-            trend_analysis = await self.cv_repository.get_trend_analysis(field)
-            
-            # 2. 필수 스킬 목록 조회
-            required_skills = await self.cv_repository.get_required_skills(field)
-            
-            # 3. 강점/약점 분석 (LLM이 직접 CV 전체를 분석)
-            strengths, weaknesses = await self._analyze_strengths_weaknesses(
-                cv_text, field, trend_analysis, required_skills
-            )
-            
-            # 4. 레이더 차트 데이터 생성 (LLM이 직접 CV 전체를 분석)
-            radar_chart_data = await self._generate_radar_chart_data(
-                cv_text, field, trend_analysis
+            # 1~2. 트렌드 분석 결과와 필수 스킬 목록 조회
+            trend_analysis, required_skills = await asyncio.gather(
+                self.cv_repository.get_trend_analysis(field),
+                self.cv_repository.get_required_skills(field)
             )
             
-            # 5. 스킬 추출 (LLM이 직접 분석)
-            skills = await self._extract_skills_from_cv(cv_text, field)
-            
-            # 6. 경험 추출 (LLM이 직접 분석)
-            experiences = await self._extract_experiences_from_cv(cv_text, field)
+            # 모든 분석 프롬프트에 같은 CV 본문이 들어가므로 한 번만 예산에 맞춤 (저장은 원문)
+            prompt_cv_text = self._fit_cv_text(cv_text)
+            
+            # 3~6. 강점/약점, 레이더 차트, 스킬, 경험 분석 (서로 독립이므로 동시에 호출)
+            # 레이더 차트의 6개 점수 호출까지 요청 단위 세마포어 하나로 동시 호출 수를 제한
+            # 여러 호출을 한꺼번에 보내는 분석이므로 batch 우선순위 (대화형 호출에 슬롯을 양보)
+            with llm_priority(PRIORITY_BATCH):
+                semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_LLM_CALLS)
+                (strengths, weaknesses), radar_chart_data, skills, experiences = await asyncio.gather(
+                    self._run_limited(
+                        semaphore, "강점/약점 분석",
+                        self._analyze_strengths_weaknesses(prompt_cv_text, field, trend_analysis, required_skills),
+                        self._default_strengths_weaknesses(field)
+                    ),
+                    self._generate_radar_chart_data(prompt_cv_text, field, trend_analysis, semaphore),
+                    self._run_limited(semaphore, "스킬 추출", self._extract_skills_from_cv(prompt_cv_text, field), []),
+                    self._run_limited(semaphore, "경험 추출", self._extract_experiences_from_cv(prompt_cv_text, field), [])
+                )
             
             # 7. 결과 생성
             cv_analysis = CVAnalysis.create(
@@ -63,6 +111,28 @@ class CVAnalysisService:
             logger.error(f"CV 분석 실패: {e}")
             raise
     
+    def _fit_cv_text(self, cv_text: str) -> str:
+        """프롬프트용 CV 본문 (토큰 예산을 넘으면 뒷부분 생략, 토큰 수 기록)"""
+        budget = PromptBudget("cv_analysis.cv_text", self.CV_TEXT_TOKEN_BUDGET)
+        return budget.finish(budget.fit(cv_text=PromptBlock(cv_text))['cv_text'])
+    
+    async def _run_limited(self, semaphore: asyncio.Semaphore, label: str,
+                           call: Awaitable[T], default: T) -> T:
+        """세마포어 안에서 분석 호출 실행 (실패하면 해당 항목만 기본값으로 대체)"""
+        async with semaphore:
+            try:
+                return await call
+            except Exception as e:
+                logger.warning(f"{label} 실패, 기본값 사용: {e}")
+                return default
+    
+    def _default_strengths_weaknesses(self, field: str):
+        """기본 강점/약점"""
+        return (
+            [strength.format(field=field) for strength in self.DEFAULT_STRENGTHS],
+            list(self.DEFAULT_WEAKNESSES)
+        )
+    
     async def _extract_skills_from_cv(self, cv_text: str, field: str) -> List[str]:
         """CV에서 스킬 추출"""
         try:
@@ -318,58 +388,107 @@ CV의 각 섹션에서 발견되는 모든 관련 경험을 포함해주세요.
                         weaknesses.append(content)
             
             # 최소한의 기본 강점/약점 보장
+            default_strengths, default_weaknesses = self._default_strengths_weaknesses(field)
             if not strengths:
-                strengths = [f"{field} 분야에서 다양한 프로젝트 경험 보유", "LLM 및 AI 기술에 대한 깊은 이해", "실제 서비스 개발 및 배포 경험"]
+                strengths = default_strengths
             if not weaknesses:
-                weaknesses = ["더 많은 학술 논문 발표 경험 필요", "특정 분야에서의 전문성 심화 필요", "국제적인 연구 협력 경험 확대 필요"]
+                weaknesses = default_weaknesses
             
             return strengths, weaknesses
             
         except Exception as e:
             logger.error(f"강점/약점 분석 실패: {e}")
             # 기본값 반환
-            return [
-                f"{field} 분야에서 다양한 프로젝트 경험 보유",
-                "LLM 및 AI 기술에 대한 깊은 이해",
-                "실제 서비스 개발 및 배포 경험"
-            ], [
-                "더 많은 학술 논문 발표 경험 필요",
-                "특정 분야에서의 전문성 심화 필요",
-                "국제적인 연구 협력 경험 확대 필요"
-            ]
+            return self._default_strengths_weaknesses(field)
     
     async def _generate_radar_chart_data(self, cv_text: str, field: str, 
-                                        trend_analysis: Optional[Dict[str, Any]]) -> CVRadarChartData:
-        """레이더 차트 데이터 생성"""
-        try:
-            # LLM을 사용하여 각 영역별 점수 계산
-            research_ability = await self._calculate_research_score_llm(cv_text, field)
-            development_skill = await self._calculate_development_score_llm(cv_text, field)
-            awards_achievements = await self._calculate_awards_score_llm(cv_text, field)
-            latest_tech_trend = await self._calculate_trend_score_llm(cv_text, field, trend_analysis)
-            academic_background = await self._calculate_academic_score_llm(cv_text, field)
-            project_experience = await self._calculate_project_score_llm(cv_text, field)
-            
-            return CVRadarChartData(
-                research_ability=research_ability,
-                development_skill=development_skill,
-                awards_achievements=awards_achievements,
-                latest_tech_trend=latest_tech_trend,
-                academic_background=academic_background,
-                project_experience=project_experience
-            )
+                                        trend_analysis: Optional[Dict[str, Any]],
+                                        semaphore: Optional[asyncio.Semaphore] = None) -> CVRadarChartData:
+        """레이더 차트 데이터 생성
+        
+        6개 영역 점수와 근거를 구조화 출력 호출 한 번으로 받습니다. 호출이 실패하거나
+        일부 영역 값이 유효하지 않으면 해당 영역만 영역별 호출로 다시 계산합니다.
+        """
+        semaphore = semaphore or asyncio.Semaphore(self.MAX_CONCURRENT_LLM_CALLS)
+        
+        scores, rationales = await self._run_limited(
+            semaphore, "레이더 차트 통합 점수",
+            self._calculate_radar_scores_llm(cv_text, field, trend_analysis),
+            ({}, {})
+        )
+        
+        # 통합 호출에서 받지 못한 영역만 영역별 호출로 계산
+        missing = [dimension for dimension in CVRadarChartData.DIMENSIONS if dimension not in scores]
+        if missing:
+            logger.warning(f"레이더 차트 영역별 점수 계산으로 대체: {', '.join(missing)}")
+            fallback_calls = {
+                "research_ability": lambda: self._calculate_research_score_llm(cv_text, field),
+                "development_skill": lambda: self._calculate_development_score_llm(cv_text, field),
+                "awards_achievements": lambda: self._calculate_awards_score_llm(cv_text, field),
+                "latest_tech_trend": lambda: self._calculate_trend_score_llm(cv_text, field, trend_analysis),
+                "academic_background": lambda: self._calculate_academic_score_llm(cv_text, field),
+                "project_experience": lambda: self._calculate_project_score_llm(cv_text, field)
+            }
+            fallback_scores = await asyncio.gather(*[
+                self._run_limited(
+                    semaphore, f"{CVRadarChartData.DIMENSIONS[dimension]} 점수",
+                    fallback_calls[dimension](), self.DEFAULT_SCORE
+                )
+                for dimension in missing
+            ])
+            scores.update(zip(missing, fallback_scores))
+        
+        return CVRadarChartData(rationales=rationales, **scores)
+    
+    async def _calculate_radar_scores_llm(self, cv_text: str, field: str,
+                                          trend_analysis: Optional[Dict[str, Any]]):
+        """레이더 차트 6개 영역 점수와 근거 계산 (구조화 출력 호출 한 번)
+        
+        반환값은 (영역 -> 점수, 영역 -> 근거)이며 유효한 영역만 포함합니다.
+        """
+        prompt = f"""
+            당신은 {field} 분야의 저명한 교수입니다.
+            연구실 학생 선발을 위해 지원자의 CV를 아래 6개 영역으로 평가하고 있습니다.
             
-        except Exception as e:
-            logger.error(f"레이더 차트 데이터 생성 실패: {e}")
-            # 기본값 반환
-            return CVRadarChartData(
-                research_ability=0.5,
-                development_skill=0.5,
-                awards_achievements=0.5,
-                latest_tech_trend=0.5,
-                academic_background=0.5,
-                project_experience=0.5
-            )
+            - 지원자 CV:
+            {cv_text}
+            
+            - 현재 트렌드 정보:
+            {trend_analysis.get('trend_summary', 'N/A') if trend_analysis else 'N/A'}
+            
+            영역별 평가 기준:
+            - research_ability (연구 능력): 논문 발표 경험, 연구 프로젝트 참여와 성과, 연구 방법론 이해도, 학회 참여 및 발표, 연구 성과의 영향력
+            - development_skill (개발 스킬): 프로그래밍 언어와 프레임워크 숙련도, 개발 도구(Docker, AWS, Git, CI/CD, GPU 등) 경험, 실제 구현 능력, 코드 품질과 시스템 설계
+            - awards_achievements (수상/성과): 대회 수상(Kaggle, Dacon, 해커톤 등), 논문 발표/인용, 특허, 인증과 장학금, 성과의 질과 영향력
+            - latest_tech_trend (최신 기술 트렌드): LLM, RAG, 멀티모달, 생성 AI 등 최신 기술 경험, 최신 프레임워크와 모델 활용, 최신 연구 동향 추적, 위 트렌드 정보와의 부합도
+            - academic_background (학술 배경): 학위 수준과 전공, GPA와 관련 수업, 학술 활동과 성취, 학술적 네트워크와 국제 활동
+            - project_experience (프로젝트 경험): 프로젝트 규모와 복잡도, 역할과 책임, 기술적 난이도, 성과와 완성도(실제 배포, 운영), 팀 협업 경험
+            
+            각 영역에 대해 0.0~1.0 사이의 점수(score)와 CV에 근거한 한두 문장의 평가 근거(rationale)를 작성해주세요.
+            """
+        
+        payload = await self.openai_client.chat_completion_json(
+            prompt, "cv_radar_scores", self.RADAR_SCORE_SCHEMA,
+            temperature=0, max_tokens=self.RADAR_SCORE_MAX_TOKENS
+        )
+        return self._parse_radar_scores(payload)
+    
+    def _parse_radar_scores(self, payload: Dict[str, Any]):
+        """구조화 출력 응답 검증 (점수가 0.0~1.0 사이 숫자인 영역만 채택)"""
+        scores, rationales = {}, {}
+        for dimension in CVRadarChartData.DIMENSIONS:
+            entry = payload.get(dimension)
+            if not isinstance(entry, dict):
+                continue
+            score = entry.get("score")
+            if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0.0 <= score <= 1.0:
+                logger.warning(f"레이더 차트 점수 값이 유효하지 않음: {dimension}={score!r}")
+                continue
+            scores[dimension] = float(score)
+            rationale = entry.get("rationale")
+            if isinstance(rationale, str) and rationale.strip():
+                rationales[dimension] = rationale.strip()
+        return scores, rationales
     
     async def _calculate_research_score_llm(self, cv_text: str, field: str) -> float:
         """연구 능력 점수 계산 (LLM 사용)"""
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Any
 
 @dataclass
@@ -58,6 +58,18 @@ class CVRadarChartData:
     latest_tech_trend: float
     academic_background: float
     project_experience: float
+    # 영역별 점수 근거 (필드 이름 -> 근거, 구조화 출력으로 함께 받은 경우에만 채워짐)
+    rationales: Dict[str, str] = field(default_factory=dict)
+    
+    # 영역 필드 이름 -> 표시 이름
+    DIMENSIONS = {
+        "research_ability": "연구 능력",
+        "development_skill": "개발 스킬",
+        "awards_achievements": "수상/성과",
+        "latest_tech_trend": "최신 기술 트렌드",
+        "academic_background": "학술 배경",
+        "project_experience": "프로젝트 경험"
+    }
     
     def __post_init__(self):
         # 모든 점수가 0-1 범위인지 확인
@@ -102,5 +114,6 @@ class CVRadarChartData:
             'academic_background': self.academic_background,
             'project_experience': self.project_experience,
             'overall_score': self.get_overall_score(),
+            'rationales': self.rationales,
             'radar_chart_data': self.to_radar_chart_data().to_dict()
         } 
\ No newline at end of file
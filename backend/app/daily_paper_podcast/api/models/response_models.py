@@ -70,4 +70,5 @@ class PaperPreviewResponse(BaseModel):
     field: str
     conference: str
     can_reselect: bool
-    total_papers_in_conference: int 
\ No newline at end of file
+    total_papers_in_conference: int
+    session_id: Optional[str] = None  # 재선택 시 전달하면 같은 논문이 반복되지 않음 
\ No newline at end of file
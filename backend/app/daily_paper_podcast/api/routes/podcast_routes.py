@@ -18,6 +18,7 @@ from ..models.response_models import (
     PaperPreviewInfo
 )
 from ...application.services.podcast_service import PodcastService
+from app.shared.api.sse import sse_response
 from ...infra.repositories.paper_repository_impl import PaperRepositoryImpl
 from ...infra.repositories.podcast_repository_impl import PodcastRepositoryImpl
 
@@ -135,7 +136,8 @@ async def get_paper_preview(
             field=preview_data['field'],
             conference=preview_data['conference'],
             can_reselect=preview_data['can_reselect'],
-            total_papers_in_conference=preview_data['total_papers_in_conference']
+            total_papers_in_conference=preview_data['total_papers_in_conference'],
+            session_id=preview_data.get('session_id')
         )
         
     except HTTPException:
@@ -149,13 +151,14 @@ async def reselect_paper(
     field: str,
     conference: str,
     current_paper_id: Optional[str] = Body(default=None, embed=True),
+    session_id: Optional[str] = Body(default=None, embed=True),
     podcast_service: PodcastService = Depends(get_podcast_service)
 ):
     """같은 조건으로 다른 논문 재선택"""
     try:
         logger.info(f"논문 재선택 요청: {field} - {conference}, 현재 논문 ID: {current_paper_id}")
         
-        preview_data = await podcast_service.reselect_paper(field, conference, current_paper_id)
+        preview_data = await podcast_service.reselect_paper(field, conference, current_paper_id, session_id)
         
         if not preview_data:
             raise HTTPException(
@@ -181,7 +184,8 @@ async def reselect_paper(
             field=preview_data['field'],
             conference=preview_data['conference'],
             can_reselect=preview_data['can_reselect'],
-            total_papers_in_conference=preview_data['total_papers_in_conference']
+            total_papers_in_conference=preview_data['total_papers_in_conference'],
+            session_id=preview_data.get('session_id')
         )
         
     except HTTPException:
@@ -216,6 +220,29 @@ async def analyze_paper(
         logger.error(f"논문 분석 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/analyze/stream")
+async def analyze_paper_stream(
+    request: PodcastGenerationRequest,
+    podcast_service: PodcastService = Depends(get_podcast_service)
+):
+    """논문 분석 스트리밍 (SSE: stage, paper, section_start, token, section_end, result, done)"""
+    logger.info(f"논문 분석 스트리밍 요청: {request.field} 분야")
+    
+    events = podcast_service.analyze_paper_stream(
+        request.field,
+        request.papers if request.papers else None
+    )
+    return sse_response(
+        events,
+        to_result=lambda analysis_result: PodcastGenerationResponse(
+            success=True,
+            analysis_id=analysis_result.id,
+            message="논문 분석이 완료되었습니다.",
+            estimated_duration=0
+        ),
+        error_message="논문 분석 중 오류가 발생했습니다."
+    )
+
 @router.post("/generate-tts/{analysis_id}", response_model=PodcastGenerationResponse)
 async def generate_tts(
     analysis_id: str,
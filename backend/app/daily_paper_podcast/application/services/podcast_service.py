@@ -1,10 +1,12 @@
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 import logging
 from app.daily_paper_podcast.domain.entities.podcast_analysis import PodcastAnalysis
 from app.daily_paper_podcast.domain.entities.paper import Paper
 from app.daily_paper_podcast.domain.repositories.paper_repository import PaperRepository
 from app.daily_paper_podcast.domain.repositories.podcast_repository import PodcastRepository
 from app.shared.infra.external.openai_client import get_openai_client
+from app.shared.infra.external.llm_stream import StreamEvent, StreamedSection, stream_event
+from app.shared.infra.external.llm_scheduler import PRIORITY_BATCH
 # 기존 분석 노드들은 더 이상 사용하지 않음 (통합 프롬프트로 대체)
 from app.daily_paper_podcast.infra.services.tts_service import TTSService
 
@@ -23,30 +25,8 @@ class PodcastService:
         try:
             logger.info(f"논문 분석 시작: {field} 분야")
             
-            # 1. DB에서 랜덤으로 단일 논문 가져오기
-            if not papers:
-                papers_entities = await self.paper_repository.get_random_papers_by_field(field, limit=1)
-                if not papers_entities:
-                    raise Exception(f"{field} 분야에서 논문을 찾을 수 없습니다.")
-                
-                selected_paper = papers_entities[0]
-                logger.info(f"선택된 논문: {selected_paper.title}")
-            else:
-                # papers가 제공된 경우 첫 번째 논문만 사용
-                if not papers:
-                    raise Exception("논문이 제공되지 않았습니다.")
-                
-                paper_data = papers[0]
-                selected_paper = Paper.create(
-                    title=paper_data.get('title', ''),
-                    abstract=paper_data.get('abstract', ''),
-                    authors=paper_data.get('authors', []),
-                    conference=paper_data.get('conference'),
-                    year=paper_data.get('year'),
-                    field=paper_data.get('field'),
-                    url=paper_data.get('url')
-                )
-                logger.info(f"선택된 논문: {selected_paper.title}")
+            # 1. 분석할 논문 선택 (제공된 논문 또는 DB 랜덤)
+            selected_paper = await self._select_paper(field, papers)
             
             # 2. 단일 논문에 대한 5단계 분석 수행
             analysis_text = await self._generate_single_paper_analysis(selected_paper)
@@ -74,6 +54,59 @@ class PodcastService:
             logger.error(f"논문 분석 실패: {e}")
             raise
 
+    async def analyze_paper_stream(self, field: str, papers: List[Dict[str, Any]] = None) -> AsyncIterator[StreamEvent]:
+        """논문 분석 스트리밍 (TTS 생성 제외, 분석 리포트를 토큰 단위로 전달)"""
+        logger.info(f"논문 분석 스트리밍 시작: {field} 분야")
+        yield stream_event("stage", stage="select_paper")
+        
+        selected_paper = await self._select_paper(field, papers)
+        yield stream_event("paper", paper=selected_paper.to_dict())
+        
+        openai_client = get_openai_client()
+        analysis = StreamedSection(
+            "analysis", self._build_comprehensive_analysis_prompt(selected_paper),
+            cache_ttl=openai_client.PAPER_CACHE_TTL, cache_nondeterministic=True
+        )
+        async for event in analysis.stream(openai_client):
+            yield event
+        
+        podcast_analysis = PodcastAnalysis.create(
+            field=field,
+            papers=[selected_paper.to_dict()],
+            analysis_text=analysis.text,
+            audio_file_path="",  # 아직 생성되지 않음
+            duration_seconds=0
+        )
+        try:
+            await self.podcast_repository.save_analysis(podcast_analysis)
+        except Exception as e:
+            logger.warning(f"데이터베이스 저장 실패 (임시): {e}")
+        
+        logger.info(f"논문 분석 스트리밍 완료: {selected_paper.title} 논문 분석")
+        yield stream_event("result", podcast_analysis)
+    
+    async def _select_paper(self, field: str, papers: List[Dict[str, Any]] = None) -> Paper:
+        """분석할 논문 선택 (papers가 제공되면 첫 번째 논문, 없으면 DB에서 랜덤 단일 논문)"""
+        if not papers:
+            papers_entities = await self.paper_repository.get_random_papers_by_field(field, limit=1)
+            if not papers_entities:
+                raise Exception(f"{field} 분야에서 논문을 찾을 수 없습니다.")
+            
+            selected_paper = papers_entities[0]
+        else:
+            paper_data = papers[0]
+            selected_paper = Paper.create(
+                title=paper_data.get('title', ''),
+                abstract=paper_data.get('abstract', ''),
+                authors=paper_data.get('authors', []),
+                conference=paper_data.get('conference'),
+                year=paper_data.get('year'),
+                field=paper_data.get('field'),
+                url=paper_data.get('url')
+            )
+        logger.info(f"선택된 논문: {selected_paper.title}")
+        return selected_paper
+
     async def generate_tts_from_analysis(self, analysis_id: str, tts_settings: dict = None) -> PodcastAnalysis:
         """기존 분석 결과를 바탕으로 TTS 생성"""
         try:
@@ -228,14 +261,22 @@ class PodcastService:
             logger.error(f"분야별 학회 목록 조회 실패: {e}")
             raise
     
-    async def get_random_paper_preview(self, field: str, conference: str) -> Optional[Dict[str, Any]]:
-        """특정 분야와 학회의 랜덤 논문 미리보기"""
+    async def get_random_paper_preview(self, field: str, conference: str, session_id: str = None,
+                                       current_paper_id: str = None) -> Optional[Dict[str, Any]]:
+        """특정 분야와 학회의 랜덤 논문 미리보기
+        
+        세션 ID별로 논문 순서를 유지하므로 같은 세션의 재선택에서는 논문이 반복되지 않습니다.
+        """
         try:
             logger.info(f"랜덤 논문 미리보기: {field} - {conference}")
             
             # Supabase 클라이언트를 통해 랜덤 논문 조회
             from app.shared.infra.external.supabase_client import supabase_client
-            paper_data = await supabase_client.get_random_paper_by_field_and_conference(field, conference)
+            session_id = session_id or supabase_client.new_selection_session()
+            exclude_id = int(current_paper_id) if current_paper_id and current_paper_id.isdigit() else None
+            paper_data = await supabase_client.get_random_paper_by_field_and_conference(
+                field, conference, session_id=session_id, exclude_id=exclude_id
+            )
             
             if not paper_data:
                 return None
@@ -262,7 +303,8 @@ class PodcastService:
                 'field': field,
                 'conference': conference,
                 'can_reselect': total_papers > 1,  # 논문이 2개 이상이면 재선택 가능
-                'total_papers_in_conference': total_papers
+                'total_papers_in_conference': total_papers,
+                'session_id': session_id
             }
             
             logger.info(f"논문 미리보기 생성 완료: {paper.title[:50]}...")
@@ -272,27 +314,19 @@ class PodcastService:
             logger.error(f"랜덤 논문 미리보기 실패: {e}")
             raise
     
-    async def reselect_paper(self, field: str, conference: str, current_paper_id: str = None) -> Optional[Dict[str, Any]]:
-        """같은 조건으로 다른 논문 재선택"""
+    async def reselect_paper(self, field: str, conference: str, current_paper_id: str = None,
+                             session_id: str = None) -> Optional[Dict[str, Any]]:
+        """같은 조건으로 다른 논문 재선택 (세션 내에서 중복 없이)"""
         try:
             logger.info(f"논문 재선택: {field} - {conference}")
             
-            # 최대 10번 시도해서 다른 논문 찾기
-            max_attempts = 10
-            for attempt in range(max_attempts):
-                paper_preview = await self.get_random_paper_preview(field, conference)
-                
-                if not paper_preview:
-                    break
-                
-                # 현재 논문과 다른 논문이면 반환
-                if not current_paper_id or paper_preview['paper']['id'] != current_paper_id:
-                    logger.info(f"재선택 성공 (시도 {attempt + 1}회): {paper_preview['paper']['title'][:50]}...")
-                    return paper_preview
+            paper_preview = await self.get_random_paper_preview(
+                field, conference, session_id=session_id, current_paper_id=current_paper_id
+            )
             
-            # 다른 논문을 찾지 못한 경우, 그냥 아무 논문이나 반환
-            logger.warning(f"재선택에서 다른 논문을 찾지 못함, 기존 로직 사용")
-            return await self.get_random_paper_preview(field, conference)
+            if paper_preview:
+                logger.info(f"재선택 성공: {paper_preview['paper']['title'][:50]}...")
+            return paper_preview
             
         except Exception as e:
             logger.error(f"논문 재선택 실패: {e}")
@@ -338,10 +372,9 @@ class PodcastService:
             logger.error(f"단일 논문 분석 실패: {e}")
             raise
     
-    async def _analyze_paper_with_comprehensive_prompt(self, paper: Paper) -> str:
-        """포괄적인 프롬프트로 논문을 한 번에 분석"""
-        try:
-            prompt = f"""
+    def _build_comprehensive_analysis_prompt(self, paper: Paper) -> str:
+        """논문 통합 분석 프롬프트"""
+        return f"""
 당신은 AI/ML 분야의 논문을 전문적으로 분석하는 연구자입니다. 
 다음 논문을 체계적이고 깊이 있게 분석해주세요.
 
@@ -412,9 +445,18 @@ class PodcastService:
 
 분석 결과는 마크다운 형식으로 작성하고, 각 섹션은 명확하게 구분해주세요.
 """
+    
+    async def _analyze_paper_with_comprehensive_prompt(self, paper: Paper) -> str:
+        """포괄적인 프롬프트로 논문을 한 번에 분석"""
+        try:
+            prompt = self._build_comprehensive_analysis_prompt(paper)
 
             openai_client = get_openai_client()
-            response = await openai_client._call_chat_completion(prompt)
+            # 같은 논문의 재분석은 캐시된 응답을 재사용
+            response = await openai_client._call_chat_completion(
+                prompt, cache_ttl=openai_client.PAPER_CACHE_TTL, cache_nondeterministic=True,
+                priority=PRIORITY_BATCH
+            )
             return response
             
         except Exception as e:
@@ -477,7 +519,7 @@ class PodcastService:
 """
 
             openai_client = get_openai_client()
-            response = await openai_client._call_chat_completion(prompt)
+            response = await openai_client._call_chat_completion(prompt, priority=PRIORITY_BATCH)
             return response
             
         except Exception as e:
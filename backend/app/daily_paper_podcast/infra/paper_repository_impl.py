@@ -1,6 +1,5 @@
 from typing import List, Optional
 import logging
-import random
 from app.daily_paper_podcast.domain.paper_repository import PaperRepository
 from app.daily_paper_podcast.domain.paper import Paper
 from app.shared.infra.external.supabase_client import supabase_client
@@ -40,16 +39,13 @@ class PaperRepositoryImpl(PaperRepository):
     async def get_random_papers_by_field(self, field: str, limit: int = 5) -> List[Paper]:
         """분야별 랜덤 논문 조회"""
         try:
-            # 먼저 해당 분야의 모든 논문을 가져옴
-            all_papers_data = await self.supabase_client.get_papers_by_field(field, 1000)  # 충분한 수의 논문
+            # 샘플러에서 ID만 뽑아 선택된 논문만 조회
+            selected_papers_data = await self.supabase_client.get_random_papers(field, limit)
             
-            if not all_papers_data:
+            if not selected_papers_data:
                 logger.warning(f"{field} 분야에서 논문을 찾을 수 없습니다.")
                 return []
             
-            # 랜덤하게 선택
-            selected_papers_data = random.sample(all_papers_data, min(limit, len(all_papers_data)))
-            
             papers = []
             for paper_data in selected_papers_data:
                 paper = Paper.create(
@@ -27,7 +27,7 @@ class PodcastRepositoryImpl(PodcastRepository):
             }
             
             # podcast_analyses 테이블에 저장
-            result = self.supabase_client.client.table("podcast_analyses").insert(data).execute()
+            result = await self.supabase_client.run_query(self.supabase_client.client.table("podcast_analyses").insert(data))
             
             if result.data:
                 logger.info(f"팟캐스트 분석 결과 저장 완료: {analysis.id}")
@@ -42,7 +42,7 @@ class PodcastRepositoryImpl(PodcastRepository):
     async def get_analysis_by_id(self, analysis_id: str) -> Optional[PodcastAnalysis]:
         """ID로 팟캐스트 분석 결과 조회"""
         try:
-            result = self.supabase_client.client.table("podcast_analyses").select("*").eq("id", analysis_id).execute()
+            result = await self.supabase_client.run_query(self.supabase_client.client.table("podcast_analyses").select("*").eq("id", analysis_id))
             
             if not result.data:
                 return None
@@ -72,7 +72,7 @@ class PodcastRepositoryImpl(PodcastRepository):
     async def get_all_analyses(self, limit: int = 10, offset: int = 0) -> List[PodcastAnalysis]:
         """모든 팟캐스트 분석 결과 조회"""
         try:
-            result = self.supabase_client.client.table("podcast_analyses").select("*").order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+            result = await self.supabase_client.run_query(self.supabase_client.client.table("podcast_analyses").select("*").order("created_at", desc=True).range(offset, offset + limit - 1))
             
             analyses = []
             for data in result.data:
@@ -111,7 +111,7 @@ class PodcastRepositoryImpl(PodcastRepository):
             }
             
             # podcast_analyses 테이블에서 업데이트
-            result = self.supabase_client.client.table("podcast_analyses").update(data).eq("id", analysis.id).execute()
+            result = await self.supabase_client.run_query(self.supabase_client.client.table("podcast_analyses").update(data).eq("id", analysis.id))
             
             if result.data:
                 logger.info(f"팟캐스트 분석 결과 업데이트 완료: {analysis.id}")
@@ -127,7 +127,7 @@ class PodcastRepositoryImpl(PodcastRepository):
     async def delete_analysis(self, analysis_id: str) -> bool:
         """팟캐스트 분석 결과 삭제"""
         try:
-            result = self.supabase_client.client.table("podcast_analyses").delete().eq("id", analysis_id).execute()
+            result = await self.supabase_client.run_query(self.supabase_client.client.table("podcast_analyses").delete().eq("id", analysis_id))
             
             if result.data:
                 logger.info(f"팟캐스트 분석 결과 삭제 완료: {analysis_id}")
@@ -5,6 +5,7 @@ from app.lab_analysis.api.models.request_models import LabAnalysisRequest, Profe
 from app.lab_analysis.api.models.response_models import LabAnalysisResponse, ProfessorListResponse, LabAnalysisResultResponse, HealthCheckResponse, AvailableFieldsResponse
 from app.lab_analysis.application.services.lab_analysis_service import LabAnalysisService
 from app.lab_analysis.infra.repositories.lab_analysis_repository_impl import LabAnalysisRepositoryImpl
+from app.shared.api.sse import sse_response
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +79,20 @@ async def get_professors_by_field(
         logger.error(f"교수 목록 조회 실패: {e}")
         raise HTTPException(status_code=500, detail="교수 목록 조회 중 오류가 발생했습니다.")
 
+def to_lab_analysis_response(result) -> LabAnalysisResultResponse:
+    """연구실 분석 결과 엔티티를 응답 모델로 변환"""
+    return LabAnalysisResultResponse(
+        id=result.id,
+        professor_name=result.professor_name,
+        university_name=result.university_name,
+        field=result.field,
+        recent_publications=result.recent_publications,
+        analysis_summary=result.analysis_summary,
+        research_trends=result.research_trends,
+        key_insights=result.key_insights,
+        created_at=result.created_at.isoformat()
+    )
+
 @router.post("/analyze", response_model=LabAnalysisResultResponse)
 async def analyze_lab(
     request: ProfessorSelectionRequest,
@@ -95,17 +110,7 @@ async def analyze_lab(
         )
         
         # 응답 모델로 변환
-        response = LabAnalysisResultResponse(
-            id=result.id,
-            professor_name=result.professor_name,
-            university_name=result.university_name,
-            field=result.field,
-            recent_publications=result.recent_publications,
-            analysis_summary=result.analysis_summary,
-            research_trends=result.research_trends,
-            key_insights=result.key_insights,
-            created_at=result.created_at.isoformat()
-        )
+        response = to_lab_analysis_response(result)
         
         logger.info(f"연구실 분석 완료: {result.id}")
         return response
@@ -117,6 +122,21 @@ async def analyze_lab(
         logger.error(f"연구실 분석 실패: {e}")
         raise HTTPException(status_code=500, detail="연구실 분석 중 오류가 발생했습니다.")
 
+@router.post("/analyze/stream")
+async def analyze_lab_stream(
+    request: ProfessorSelectionRequest,
+    lab_service: LabAnalysisService = Depends(get_lab_analysis_service)
+):
+    """연구실 분석 스트리밍 (SSE: stage, publications, section_start, token, section_end, result, done)"""
+    logger.info(f"연구실 분석 스트리밍 요청: {request.professor_name} ({request.university_name})")
+    
+    events = lab_service.analyze_lab_stream(
+        professor_name=request.professor_name,
+        university_name=request.university_name,
+        field=request.field
+    )
+    return sse_response(events, to_result=to_lab_analysis_response, error_message="연구실 분석 중 오류가 발생했습니다.")
+
 @router.get("/result/{result_id}", response_model=LabAnalysisResultResponse)
 async def get_analysis_result(
     result_id: str,
@@ -1,10 +1,11 @@
 import logging
 import uuid
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from app.lab_analysis.domain.entities.lab_analysis import LabAnalysis, LabAnalysisResult, Professor
 from app.lab_analysis.domain.repositories.lab_analysis_repository import LabAnalysisRepository
 from app.lab_analysis.infra.services.arxiv_service import ArxivService
 from app.lab_analysis.infra.services.llm_analysis_service import LLMAnalysisService
+from app.shared.infra.external.llm_stream import StreamEvent, stream_event
 
 logger = logging.getLogger(__name__)
 
@@ -32,26 +33,8 @@ class LabAnalysisService:
         try:
             logger.info(f"연구실 분석 시작: {professor_name} ({university_name})")
             
-            # 1. 교수 정보 조회
-            professors = await self.repository.get_professors_by_field(field)
-            professor = next((p for p in professors if p.name == professor_name and p.university == university_name), None)
-            
-            if not professor:
-                raise ValueError(f"교수를 찾을 수 없습니다: {professor_name} ({university_name})")
-            
-            # 2. 교수의 publications에서 논문 제목들을 사용하여 초록 수집
-            if professor.publications:
-                recent_publications = await self.arxiv_service.get_publications_from_titles(
-                    professor.publications, limit=10
-                )
-            else:
-                # publications가 없는 경우 교수명으로 검색
-                recent_publications = await self.arxiv_service.get_recent_publications(
-                    professor_name, university_name, limit=10
-                )
-            
-            if not recent_publications:
-                raise ValueError("최신 논문을 찾을 수 없습니다.")
+            # 1~2. 교수 정보 조회 및 최신 논문 초록 수집
+            recent_publications = await self._collect_recent_publications(professor_name, university_name, field)
             
             # 3. LLM을 통한 분석
             analysis_result = await self.llm_service.analyze_lab_research(
@@ -82,6 +65,61 @@ class LabAnalysisService:
             logger.error(f"연구실 분석 실패: {e}")
             raise
     
+    async def analyze_lab_stream(self, professor_name: str, university_name: str,
+                                 field: str) -> AsyncIterator[StreamEvent]:
+        """연구실 분석 스트리밍 (논문 수집 후 섹션별 LLM 응답을 토큰 단위로 전달)"""
+        logger.info(f"연구실 분석 스트리밍 시작: {professor_name} ({university_name})")
+        yield stream_event("stage", stage="collect_publications")
+        
+        recent_publications = await self._collect_recent_publications(professor_name, university_name, field)
+        yield stream_event("publications", recent_publications=recent_publications)
+        
+        sections = self.llm_service.build_sections(professor_name, university_name, field, recent_publications)
+        for section in sections:
+            async for event in section.stream(self.llm_service.openai_client):
+                yield event
+        analysis_result = {section.name: section.text.strip() for section in sections}
+        
+        result = LabAnalysisResult(
+            id=str(uuid.uuid4()),
+            professor_name=professor_name,
+            university_name=university_name,
+            field=field,
+            recent_publications=recent_publications,
+            analysis_summary=analysis_result.get("research_direction", ""),
+            research_trends=analysis_result.get("research_trends", ""),
+            key_insights=analysis_result.get("research_strategy", "")
+        )
+        saved_result = await self.repository.save_analysis_result(result)
+        
+        logger.info(f"연구실 분석 스트리밍 완료: {result.id}")
+        yield stream_event("result", saved_result)
+    
+    async def _collect_recent_publications(self, professor_name: str, university_name: str, field: str) -> List[Dict[str, str]]:
+        """교수 정보를 조회하고 최신 논문 초록 수집 (교수나 논문이 없으면 ValueError)"""
+        # 1. 교수 정보 조회
+        professors = await self.repository.get_professors_by_field(field)
+        professor = next((p for p in professors if p.name == professor_name and p.university == university_name), None)
+        
+        if not professor:
+            raise ValueError(f"교수를 찾을 수 없습니다: {professor_name} ({university_name})")
+        
+        # 2. 교수의 publications에서 논문 제목들을 사용하여 초록 수집
+        if professor.publications:
+            recent_publications = await self.arxiv_service.get_publications_from_titles(
+                professor.publications, limit=10
+            )
+        else:
+            # publications가 없는 경우 교수명으로 검색
+            recent_publications = await self.arxiv_service.get_recent_publications(
+                professor_name, university_name, limit=10
+            )
+        
+        if not recent_publications:
+            raise ValueError("최신 논문을 찾을 수 없습니다.")
+        
+        return recent_publications
+    
     async def get_analysis_result(self, result_id: str) -> Optional[LabAnalysisResult]:
         """분석 결과 조회"""
         try:
@@ -1,12 +1,23 @@
+import asyncio
 import logging
+import os
 from typing import List, Dict, Any
 from app.shared.infra.external.openai_client import OpenAIClient
+from app.shared.infra.external.llm_stream import StreamedSection
+from app.shared.infra.external.prompt_budget import PromptBlock, PromptBudget
 
 logger = logging.getLogger(__name__)
 
 class LLMAnalysisService:
     """LLM 분석 서비스"""
     
+    # 같은 교수/논문 목록의 섹션 분석은 하루 동안 캐시된 응답을 재사용
+    ANALYSIS_CACHE_TTL = 24 * 3600
+    # 섹션별 LLM HTTP 요청 제한 시간(초, 스케줄러 슬롯 대기와 재시도 대기는 제외), 초과한 섹션만 오류 문구로 대체
+    SECTION_TIMEOUT = float(os.getenv("LAB_ANALYSIS_SECTION_TIMEOUT", "60"))
+    # 섹션 프롬프트의 논문 목록 토큰 예산 (넘으면 논문별로 고르게 줄임)
+    PUBLICATIONS_PROMPT_BUDGET = 6000
+    
     def __init__(self):
         self.openai_client = OpenAIClient()
     
@@ -21,17 +32,12 @@ class LLMAnalysisService:
         try:
             logger.info(f"LLM 분석 시작: {professor_name} ({university_name})")
             
-            # 각 섹션별로 별도 LLM 호출
-            research_direction = await self._analyze_research_direction(
-                professor_name, university_name, field, publications
-            )
-            
-            research_trends = await self._analyze_research_trends(
-                professor_name, university_name, field, publications
-            )
-            
-            research_strategy = await self._analyze_research_strategy(
-                professor_name, university_name, field, publications
+            # 각 섹션별로 별도 LLM 호출 (서로 독립이므로 동시에 실행, 실패한 섹션은 각자 오류 문구로 대체)
+            args = (professor_name, university_name, field, publications)
+            research_direction, research_trends, research_strategy = await asyncio.gather(
+                self._analyze_research_direction(*args),
+                self._analyze_research_trends(*args),
+                self._analyze_research_strategy(*args)
             )
             
             analysis_result = {
@@ -51,20 +57,39 @@ class LLMAnalysisService:
                 "research_strategy": "분석 중 오류가 발생했습니다."
             }
     
-    async def _analyze_research_direction(
+    def build_sections(
+        self, 
+        professor_name: str, 
+        university_name: str, 
+        field: str, 
+        publications: List[str]
+    ) -> List[StreamedSection]:
+        """스트리밍용 섹션 목록 (research_direction, research_trends, research_strategy)"""
+        args = (professor_name, university_name, field, publications)
+        cache_options = {"cache_ttl": self.ANALYSIS_CACHE_TTL, "cache_nondeterministic": True}
+        return [
+            StreamedSection("research_direction", self._build_research_direction_prompt(*args),
+                            fallback="연구 방향 분석 중 오류가 발생했습니다.", **cache_options),
+            StreamedSection("research_trends", self._build_research_trends_prompt(*args),
+                            fallback="연구 트렌드 분석 중 오류가 발생했습니다.", **cache_options),
+            StreamedSection("research_strategy", self._build_research_strategy_prompt(*args),
+                            fallback="연구 전략 분석 중 오류가 발생했습니다.", **cache_options),
+        ]
+    
+    def _build_research_direction_prompt(
         self, 
         professor_name: str, 
         university_name: str, 
         field: str, 
         publications: List[str]
     ) -> str:
-        """연구 방향 및 특징 분석"""
-        try:
-            publications_text = "\n\n".join([
-                f"논문 {i+1}: {pub}" for i, pub in enumerate(publications)
-            ])
-            
-            prompt = f"""
+        """연구 방향 및 특징 분석 프롬프트"""
+        budget = PromptBudget("lab_analysis.research_direction", self.PUBLICATIONS_PROMPT_BUDGET)
+        publications_text = budget.fit(publications=PromptBlock(items=[
+            f"논문 {i+1}: {pub}" for i, pub in enumerate(publications)
+        ]))['publications']
+        
+        return budget.finish(f"""
             다음은 {university_name}의 {professor_name} 교수님의 최신 연구 논문들의 초록들입니다.
             이 논문들을 분석하여 연구실의 전체적인 연구 방향과 특징을 분석해주세요.
 
@@ -83,29 +108,22 @@ class LLMAnalysisService:
 
             분석은 한국어로 작성해주시고, 마크다운 형식으로 구조화하여 작성해주세요.
             구체적이고 실용적인 내용으로 작성해주세요.
-            """
-            
-            response = await self.openai_client._call_chat_completion(prompt)
-            return response.strip()
-            
-        except Exception as e:
-            logger.error(f"연구 방향 분석 실패: {e}")
-            return "연구 방향 분석 중 오류가 발생했습니다."
+            """)
     
-    async def _analyze_research_trends(
+    def _build_research_trends_prompt(
         self, 
         professor_name: str, 
         university_name: str, 
         field: str, 
         publications: List[str]
     ) -> str:
-        """연구 트렌드 분석"""
-        try:
-            publications_text = "\n\n".join([
-                f"논문 {i+1}: {pub}" for i, pub in enumerate(publications)
-            ])
-            
-            prompt = f"""
+        """연구 트렌드 분석 프롬프트"""
+        budget = PromptBudget("lab_analysis.research_trends", self.PUBLICATIONS_PROMPT_BUDGET)
+        publications_text = budget.fit(publications=PromptBlock(items=[
+            f"논문 {i+1}: {pub}" for i, pub in enumerate(publications)
+        ]))['publications']
+        
+        return budget.finish(f"""
             다음은 {university_name}의 {professor_name} 교수님의 최신 연구 논문들입니다.
             이 논문들을 분석하여 연구실의 최신 연구 트렌드를 분석해주세요.
 
@@ -124,29 +142,22 @@ class LLMAnalysisService:
 
             분석은 한국어로 작성해주시고, 마크다운 형식으로 구조화하여 작성해주세요.
             각 트렌드를 명확하게 구분하여 작성해주세요.
-            """
-            
-            response = await self.openai_client._call_chat_completion(prompt)
-            return response.strip()
-            
-        except Exception as e:
-            logger.error(f"연구 트렌드 분석 실패: {e}")
-            return "연구 트렌드 분석 중 오류가 발생했습니다."
+            """)
     
-    async def _analyze_research_strategy(
+    def _build_research_strategy_prompt(
         self, 
         professor_name: str, 
         university_name: str, 
         field: str, 
         publications: List[str]
     ) -> str:
-        """학부생을 위한 연구 계획 및 전략 분석"""
-        try:
-            publications_text = "\n\n".join([
-                f"논문 {i+1}: {pub}" for i, pub in enumerate(publications)
-            ])
-            
-            prompt = f"""
+        """학부생을 위한 연구 계획 및 전략 분석 프롬프트"""
+        budget = PromptBudget("lab_analysis.research_strategy", self.PUBLICATIONS_PROMPT_BUDGET)
+        publications_text = budget.fit(publications=PromptBlock(items=[
+            f"논문 {i+1}: {pub}" for i, pub in enumerate(publications)
+        ]))['publications']
+        
+        return budget.finish(f"""
             다음은 {university_name}의 {professor_name} 교수님의 최신 연구 논문들입니다.
             이 논문들을 분석하여 학부생이 해당 연구실에 지원하기 위한 연구 계획 및 전략을 제시해주세요.
 
@@ -166,13 +177,57 @@ class LLMAnalysisService:
 
             분석은 한국어로 작성해주시고, 마크다운 형식으로 구조화하여 작성해주세요.
             실용적이고 구체적인 조언을 제공해주세요.
-            """
-            
-            response = await self.openai_client._call_chat_completion(prompt)
+            """)
+    
+    async def _analyze_research_direction(
+        self, 
+        professor_name: str, 
+        university_name: str, 
+        field: str, 
+        publications: List[str]
+    ) -> str:
+        """연구 방향 및 특징 분석"""
+        prompt = self._build_research_direction_prompt(professor_name, university_name, field, publications)
+        return await self._complete_section("연구 방향", prompt)
+    
+    async def _analyze_research_trends(
+        self, 
+        professor_name: str, 
+        university_name: str, 
+        field: str, 
+        publications: List[str]
+    ) -> str:
+        """연구 트렌드 분석"""
+        prompt = self._build_research_trends_prompt(professor_name, university_name, field, publications)
+        return await self._complete_section("연구 트렌드", prompt)
+    
+    async def _analyze_research_strategy(
+        self, 
+        professor_name: str, 
+        university_name: str, 
+        field: str, 
+        publications: List[str]
+    ) -> str:
+        """학부생을 위한 연구 계획 및 전략 분석"""
+        prompt = self._build_research_strategy_prompt(professor_name, university_name, field, publications)
+        return await self._complete_section("연구 전략", prompt)
+    
+    async def _complete_section(self, section_label: str, prompt: str) -> str:
+        """섹션 하나의 LLM 호출 (제한 시간 초과나 오류 시 해당 섹션만 오류 문구 반환)
+        
+        제한 시간은 슬롯을 받은 뒤의 HTTP 요청에만 적용하므로, 부하가 높아 대기가 길어져도
+        요청을 보내기 전에 섹션이 실패 처리되지 않습니다.
+        """
+        try:
+            response = await self.openai_client._call_chat_completion(
+                prompt, cache_ttl=self.ANALYSIS_CACHE_TTL, cache_nondeterministic=True,
+                request_timeout=self.SECTION_TIMEOUT
+            )
             return response.strip()
             
+        except asyncio.TimeoutError:
+            logger.error(f"{section_label} 분석 시간 초과 ({self.SECTION_TIMEOUT:g}초)")
+            return f"{section_label} 분석 중 오류가 발생했습니다."
         except Exception as e:
-            logger.error(f"연구 전략 분석 실패: {e}")
-            return "연구 전략 분석 중 오류가 발생했습니다."
-    
- 
\ No newline at end of file
+            logger.error(f"{section_label} 분석 실패: {e}")
+            return f"{section_label} 분석 중 오류가 발생했습니다."
@@ -1,8 +1,12 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
+import hmac
+import importlib
 import logging
 import os
+import threading
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -24,55 +28,60 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 라우터 등록
-try:
-    from app.paper_trend.api.routes.trend_routes import router as trend_router
-    logger.info("trend_router import 성공")
-except Exception as e:
-    logger.error(f"trend_router import 실패: {e}")
-    trend_router = None
-
-try:
-    from app.paper_comparsion.api.routes.comparison_routes import router as comparison_router
-    logger.info("comparison_router import 성공")
-except Exception as e:
-    logger.error(f"comparison_router import 실패: {e}")
-    comparison_router = None
-
-try:
-    from app.cv_analysis.api.routes.cv_routes import router as cv_router
-    logger.info("cv_router import 성공")
-except Exception as e:
-    logger.error(f"cv_router import 실패: {e}")
-    cv_router = None
-
-try:
-    from app.daily_paper_podcast.api.routes.podcast_routes import router as daily_paper_podcast_router
-    logger.info("daily_paper_podcast_router import 성공")
-except Exception as e:
-    logger.error(f"daily_paper_podcast_router import 실패: {e}")
-    daily_paper_podcast_router = None
-
-try:
-    from app.cv_QA.api.routes.cv_qa_routes import router as cv_qa_router
-    logger.info("cv_qa_router import 성공")
-except Exception as e:
-    logger.error(f"cv_qa_router import 실패: {e}")
-    cv_qa_router = None
-
-try:
-    from app.shared.api.routes.lab_search_routes import router as lab_search_router
-    logger.info("lab_search_router import 성공")
-except Exception as e:
-    logger.error(f"lab_search_router import 실패: {e}")
-    lab_search_router = None
-
-try:
-    from app.lab_analysis.api.routes.lab_analysis_routes import router as lab_analysis_router
-    logger.info("lab_analysis_router import 성공")
-except Exception as e:
-    logger.error(f"lab_analysis_router import 실패: {e}")
-    lab_analysis_router = None
+# 라우터 목록: (모듈 경로, URL prefix, 태그, 이름)
+ROUTERS = [
+    ("app.paper_trend.api.routes.trend_routes", "/api/v1/trends", "trends", "trend_router"),
+    ("app.paper_comparsion.api.routes.comparison_routes", "/api/v1/comparison", "comparison", "comparison_router"),
+    ("app.cv_analysis.api.routes.cv_routes", "/api/v1/cv", "cv", "cv_router"),
+    ("app.daily_paper_podcast.api.routes.podcast_routes", "/api/v1/podcast", "podcast", "daily_paper_podcast_router"),
+    ("app.cv_QA.api.routes.cv_qa_routes", "/api/v1/cv-qa", "cv_qa", "cv_qa_router"),
+    ("app.shared.api.routes.lab_search_routes", "/api/v1/labs", "lab_search", "lab_search_router"),
+    ("app.lab_analysis.api.routes.lab_analysis_routes", "/api/v1/lab-analysis", "lab_analysis", "lab_analysis_router"),
+]
+
+# 지연 라우터 import: 요청 경로에 해당하는 라우터만 처음 사용할 때 import (Lambda 콜드 스타트 단축)
+# 기본값은 Lambda 환경에서만 활성화
+LAZY_ROUTER_IMPORTS = os.getenv(
+    "LAZY_ROUTER_IMPORTS", "true" if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else "false"
+).lower() == "true"
+
+# 전체 라우터가 필요한 문서 경로
+_DOC_PATHS = ("/docs", "/redoc", "/openapi.json")
+
+_loaded_routers = set()
+_router_lock = threading.Lock()
+
+def register_router(module_path: str, prefix: str, tag: str, name: str) -> bool:
+    """라우터 모듈을 import하여 앱에 등록 (이미 시도한 라우터는 건너뜀)"""
+    with _router_lock:
+        if name in _loaded_routers:
+            return True
+        # import 실패도 다시 시도하지 않도록 먼저 기록
+        _loaded_routers.add(name)
+        try:
+            router = importlib.import_module(module_path).router
+            logger.info(f"{name} import 성공")
+        except Exception as e:
+            logger.error(f"{name} import 실패: {e}")
+            logger.error(f"{name}가 None이므로 등록하지 않음")
+            return False
+
+        app.include_router(router, prefix=prefix, tags=[tag])
+        # 라우터가 추가되면 OpenAPI 스키마를 다시 생성
+        app.openapi_schema = None
+        logger.info(f"{name} 등록 완료")
+        return True
+
+def register_all_routers():
+    """등록되지 않은 모든 라우터 등록"""
+    for spec in ROUTERS:
+        register_router(*spec)
+
+def routers_for_path(path: str):
+    """요청 경로를 처리할 라우터 목록 (문서 경로는 전체)"""
+    if path in _DOC_PATHS:
+        return ROUTERS
+    return [spec for spec in ROUTERS if path == spec[1] or path.startswith(spec[1] + "/")]
 
 # 정적 파일 서빙 설정 (오디오 파일용)
 # Lambda 환경에서는 /tmp 디렉토리 사용
@@ -85,52 +94,47 @@ else:
 os.makedirs(temp_dir, exist_ok=True)
 app.mount("/audio", StaticFiles(directory=temp_dir), name="audio")
 
-# 라우터 등록
-logger.info("라우터 등록 시작...")
+if LAZY_ROUTER_IMPORTS:
+    logger.info("지연 라우터 import 사용: 첫 요청 시 라우터 등록")
 
-if trend_router:
-    app.include_router(trend_router, prefix="/api/v1/trends", tags=["trends"])
-    logger.info("trend_router 등록 완료")
+    @app.middleware("http")
+    async def lazy_router_import(request: Request, call_next):
+        """요청 경로의 라우터가 아직 등록되지 않았으면 등록 후 처리"""
+        for spec in routers_for_path(request.url.path):
+            if spec[3] not in _loaded_routers:
+                register_router(*spec)
+        return await call_next(request)
 else:
-    logger.error("trend_router가 None이므로 등록하지 않음")
-
-if comparison_router:
-    app.include_router(comparison_router, prefix="/api/v1/comparison", tags=["comparison"])
-    logger.info("comparison_router 등록 완료")
-else:
-    logger.error("comparison_router가 None이므로 등록하지 않음")
-
-if cv_router:
-    app.include_router(cv_router, prefix="/api/v1/cv", tags=["cv"])
-    logger.info("cv_router 등록 완료")
-else:
-    logger.error("cv_router가 None이므로 등록하지 않음")
-
-if daily_paper_podcast_router:
-    app.include_router(daily_paper_podcast_router, prefix="/api/v1/podcast", tags=["podcast"])
-    logger.info("daily_paper_podcast_router 등록 완료")
-else:
-    logger.error("daily_paper_podcast_router가 None이므로 등록하지 않음")
-
-if cv_qa_router:
-    app.include_router(cv_qa_router, prefix="/api/v1/cv-qa", tags=["cv_qa"])
-    logger.info("cv_qa_router 등록 완료")
-else:
-    logger.error("cv_qa_router가 None이므로 등록하지 않음")
-
-if lab_search_router:
-    app.include_router(lab_search_router, prefix="/api/v1/labs", tags=["lab_search"])
-    logger.info("lab_search_router 등록 완료")
-else:
-    logger.error("lab_search_router가 None이므로 등록하지 않음")
-
-if lab_analysis_router:
-    app.include_router(lab_analysis_router, prefix="/api/v1/lab-analysis", tags=["lab_analysis"])
-    logger.info("lab_analysis_router 등록 완료")
-else:
-    logger.error("lab_analysis_router가 None이므로 등록하지 않음")
-
-logger.info("라우터 등록 완료")
+    logger.info("라우터 등록 시작...")
+    register_all_routers()
+    logger.info("라우터 등록 완료")
+
+@app.on_event("startup")
+async def load_embedding_snapshots():
+    """임베딩 스냅샷 메모리 매핑 (EMBEDDING_SNAPSHOT_DIR 설정 시)"""
+    try:
+        from app.shared.infra.external.supabase_client import supabase_client
+        supabase_client.load_embedding_snapshots()
+    except Exception as e:
+        logger.error(f"임베딩 스냅샷 로드 실패: {e}")
+
+@app.on_event("startup")
+async def start_index_sync():
+    """임베딩 인덱스 증분 동기화 시작 (EMBEDDING_SYNC_INTERVAL 설정 시)"""
+    from app.shared.infra.external.supabase_client import supabase_client
+    supabase_client.start_index_sync()
+
+@app.on_event("shutdown")
+async def stop_index_sync():
+    """임베딩 인덱스 증분 동기화 중지"""
+    from app.shared.infra.external.supabase_client import supabase_client
+    await supabase_client.stop_index_sync()
+
+@app.on_event("shutdown")
+async def close_http_session():
+    """공용 HTTP 연결 풀 종료"""
+    from app.shared.infra.external.http_session import close_http_session as close_session
+    await close_session()
 
 @app.get("/")
 async def root():
@@ -159,8 +163,47 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """헬스체크 엔드포인트"""
-    return {"status": "healthy", "service": "fom2025_backend"}
+    """헬스체크 엔드포인트 (임베딩 인덱스 동기화 지연 포함)"""
+    from app.shared.infra.external.supabase_client import supabase_client
+    sync_stats = supabase_client.get_sync_stats()
+    return {
+        "status": "healthy",
+        "service": "fom2025_backend",
+        "index_sync": {
+            "enabled": sync_stats["enabled"],
+            "sync_lag_seconds": sync_stats["sync_lag_seconds"],
+            "rows_applied": sync_stats["rows_applied"],
+            "last_error": sync_stats["last_error"]
+        }
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request, format: str = "prometheus"):
+    """내부 지표 엔드포인트 (LLM 호출부별 시간/토큰/비용 히스토그램)
+    
+    기본은 Prometheus 텍스트 형식이며, format=json이면 스케줄러 대기, 프롬프트 토큰,
+    응답 캐시 통계를 함께 반환합니다. METRICS_TOKEN이 설정되지 않으면 비활성화(404)되며,
+    설정된 경우 X-Metrics-Token 헤더가 일치해야 합니다.
+    """
+    metrics_token = os.getenv("METRICS_TOKEN")
+    if not metrics_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    provided_token = request.headers.get("X-Metrics-Token", "")
+    if not hmac.compare_digest(provided_token.encode("utf-8"), metrics_token.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="지표 조회 권한이 없습니다.")
+    
+    from app.shared.infra.cache.llm_response_cache import get_llm_response_cache
+    from app.shared.infra.external.llm_metrics import get_llm_metrics
+    from app.shared.infra.external.llm_scheduler import get_llm_scheduler
+    from app.shared.infra.external.prompt_budget import get_prompt_token_stats
+    if format == "json":
+        return {
+            "llm_calls": get_llm_metrics().snapshot(),
+            "scheduler": get_llm_scheduler().stats(),
+            "prompt_tokens": get_prompt_token_stats(),
+            "llm_response_cache": get_llm_response_cache().stats()
+        }
+    return PlainTextResponse(get_llm_metrics().render_prometheus(), media_type="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     import uvicorn
@@ -7,6 +7,7 @@ from ..models.response_models import (
     AvailableFieldsResponse, HealthCheckResponse
 )
 from ...application.services.comparison_service import ComparisonService
+from app.shared.api.sse import sse_response
 from ...infra.repositories.comparison_repository_impl import ComparisonRepositoryImpl
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,20 @@ def get_comparison_service(api_key: str = None) -> ComparisonService:
     repository = ComparisonRepositoryImpl()
     return ComparisonService(repository, api_key=api_key)
 
+def to_comparison_response(result) -> ComparisonResponse:
+    """비교 분석 엔티티를 응답 모델로 변환"""
+    return ComparisonResponse(
+        id=result.id,
+        user_idea=result.user_idea,
+        field=result.field,
+        similar_papers=result.similar_papers,
+        comparison_analysis=result.comparison_analysis,
+        differentiation_strategy=result.differentiation_strategy,
+        reviewer_feedback=result.reviewer_feedback,
+        recommendations=result.recommendations,
+        created_at=result.created_at.isoformat()
+    )
+
 @router.post("/compare", response_model=ComparisonResponse)
 async def compare_methods(
     request: ComparisonRequest,
@@ -46,17 +61,7 @@ async def compare_methods(
         )
         
         # 응답 모델로 변환
-        response = ComparisonResponse(
-            id=result.id,
-            user_idea=result.user_idea,
-            field=result.field,
-            similar_papers=result.similar_papers,
-            comparison_analysis=result.comparison_analysis,
-            differentiation_strategy=result.differentiation_strategy,
-            reviewer_feedback=result.reviewer_feedback,
-            recommendations=result.recommendations,
-            created_at=result.created_at.isoformat()
-        )
+        response = to_comparison_response(result)
         
         logger.info(f"방법론 비교 분석 완료: {result.id}")
         return response
@@ -68,6 +73,31 @@ async def compare_methods(
         logger.error(f"방법론 비교 분석 실패: {e}")
         raise HTTPException(status_code=500, detail="방법론 비교 분석 중 오류가 발생했습니다.")
 
+@router.post("/compare/stream")
+async def compare_methods_stream(
+    request: ComparisonRequest,
+    x_api_key: str = Header(None, alias="X-API-Key")
+):
+    """방법론 비교 분석 스트리밍 (SSE: stage, papers, section_start, token, section_end, result, done)"""
+    logger.info(f"방법론 비교 분석 스트리밍 요청: {request.field}, 아이디어: {request.user_idea[:50]}...")
+    
+    # API Key 검증
+    if not x_api_key:
+        raise HTTPException(
+            status_code=401, 
+            detail="API Key가 필요합니다. X-API-Key 헤더를 추가해주세요."
+        )
+    
+    comparison_service = get_comparison_service(x_api_key)
+    events = comparison_service.compare_methods_stream(
+        user_idea=request.user_idea,
+        field=request.field,
+        limit=request.limit,
+        similarity_threshold=request.similarity_threshold
+    )
+    return sse_response(events, to_result=to_comparison_response,
+                        error_message="방법론 비교 분석 중 오류가 발생했습니다.")
+
 @router.get("/fields", response_model=AvailableFieldsResponse)
 async def get_available_fields(
     comparison_service: ComparisonService = Depends(get_comparison_service)
@@ -1,15 +1,28 @@
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 import logging
+import os
 from ...domain.repositories.comparison_repository import ComparisonRepository
 from ...domain.entities.comparison_analysis import ComparisonAnalysis
 from ...domain.value_objects.comparison_score import ComparisonScore, ComparisonType, ComparisonResult
+from app.shared.application.services.dag_executor import DagExecutor, DagNode
 from app.shared.infra.external.openai_client import get_openai_client
+from app.shared.infra.external.llm_scheduler import PRIORITY_BATCH, llm_priority
+from app.shared.infra.external.prompt_budget import PromptBlock, PromptBudget
+from app.shared.infra.external.llm_stream import StreamEvent, StreamedSection, stream_event
 
 logger = logging.getLogger(__name__)
 
 class ComparisonService:
     """비교 분석 서비스"""
     
+    # 동시에 실행할 LLM 분석 단계 수
+    MAX_CONCURRENT_STEPS = int(os.getenv("COMPARISON_MAX_CONCURRENT_STEPS", "2"))
+    
+    # 프롬프트 가변 블록(아이디어, 논문 초록, 이전 단계 결과)의 단계별 토큰 예산
+    COMPARISON_PROMPT_BUDGET = 6000
+    FOLLOWUP_PROMPT_BUDGET = 3500
+    RECOMMENDATIONS_PROMPT_BUDGET = 4000
+    
     def __init__(self, comparison_repository: ComparisonRepository, api_key: str = None):
         self.comparison_repository = comparison_repository
         self.openai_client = get_openai_client(api_key)
@@ -58,44 +71,130 @@ class ComparisonService:
             logger.error(f"방법론 비교 분석 실패: {e}")
             raise
     
+    async def compare_methods_stream(self, user_idea: str, field: str,
+                                     limit: int = 10, similarity_threshold: float = 0.6) -> AsyncIterator[StreamEvent]:
+        """방법론 비교 분석 스트리밍 (검색 후 단계별 LLM 응답을 토큰 단위로 전달)
+        
+        비스트리밍 경로와 같이 4단계 LLM 호출을 batch 우선순위로 보냅니다. 제너레이터 안에서 바꾼 컨텍스트 변수는
+        yield 사이에 소비하는 쪽 코드에도 적용되므로 llm_priority 블록 대신 섹션마다 우선순위를 지정합니다.
+        """
+        logger.info(f"방법론 비교 분석 스트리밍 시작: {field}, 아이디어: {user_idea[:50]}...")
+        yield stream_event("stage", stage="search_papers")
+        
+        user_idea_embedding = await self.openai_client.generate_embedding(user_idea)
+        similar_papers = await self.comparison_repository.search_similar_papers(
+            query_embedding=user_idea_embedding,
+            field=field,
+            limit=limit,
+            threshold=similarity_threshold
+        )
+        if not similar_papers:
+            raise ValueError(f"{field} 분야에서 유사한 논문을 찾을 수 없습니다.")
+        yield stream_event("papers", similar_papers=similar_papers)
+        
+        comparison = StreamedSection(
+            "comparison_analysis", self._build_comparison_prompt(user_idea, similar_papers),
+            fallback="비교 분석을 수행하는 중 오류가 발생했습니다.",
+            priority=PRIORITY_BATCH
+        )
+        async for event in comparison.stream(self.openai_client):
+            yield event
+        
+        differentiation = StreamedSection(
+            "differentiation_strategy", self._build_differentiation_prompt(user_idea, comparison.text),
+            fallback="차별화 전략을 제시하는 중 오류가 발생했습니다.",
+            priority=PRIORITY_BATCH
+        )
+        async for event in differentiation.stream(self.openai_client):
+            yield event
+        
+        reviewer = StreamedSection(
+            "reviewer_feedback", self._build_reviewer_feedback_prompt(user_idea, comparison.text),
+            fallback="리뷰어 피드백을 생성하는 중 오류가 발생했습니다.",
+            priority=PRIORITY_BATCH
+        )
+        async for event in reviewer.stream(self.openai_client):
+            yield event
+        
+        analysis_result = {
+            'comparison_analysis': comparison.text,
+            'differentiation_strategy': differentiation.text,
+            'reviewer_feedback': reviewer.text
+        }
+        recommendations_section = StreamedSection(
+            "recommendations", self._build_recommendations_prompt(user_idea, analysis_result), fallback="",
+            priority=PRIORITY_BATCH
+        )
+        async for event in recommendations_section.stream(self.openai_client):
+            yield event
+        recommendations = self._parse_recommendations(recommendations_section.text) or self._get_default_recommendations()
+        
+        comparison_analysis = ComparisonAnalysis.create(
+            user_idea=user_idea,
+            field=field,
+            similar_papers=similar_papers,
+            comparison_analysis=comparison.text,
+            differentiation_strategy=differentiation.text,
+            reviewer_feedback=reviewer.text,
+            recommendations=recommendations
+        )
+        await self.comparison_repository.save_comparison_analysis(comparison_analysis)
+        
+        logger.info(f"방법론 비교 분석 스트리밍 완료: {len(similar_papers)}개 논문과 비교")
+        yield stream_event("result", comparison_analysis)
+    
     async def _perform_comparison_analysis(self, user_idea: str, 
                                          similar_papers: List[Dict[str, Any]]) -> ComparisonResult:
-        """3단계 LLM 분석 수행"""
+        """3단계 LLM 분석 수행
+        
+        2단계(차별화 전략)와 3단계(리뷰어 피드백)는 1단계 결과에만 의존하므로 동시에 실행하고,
+        추천사항은 세 단계가 모두 끝난 뒤 생성합니다.
+        """
         try:
             logger.info(f"3단계 LLM 분석 시작: {len(similar_papers)}개 논문")
             
-            # 1단계: 비교 분석
-            comparison_analysis = await self._perform_comparison_analysis_step1(user_idea, similar_papers)
-            logger.info(f"1단계 비교 분석 완료: {len(comparison_analysis)}자")
-            
-            # 2단계: 차별화 전략
-            differentiation_strategy = await self._perform_differentiation_strategy_step2(user_idea, comparison_analysis)
-            logger.info(f"2단계 차별화 전략 완료: {len(differentiation_strategy)}자")
-            
-            # 3단계: 리뷰어 피드백
-            reviewer_feedback = await self._perform_reviewer_feedback_step3(user_idea, comparison_analysis)
-            logger.info(f"3단계 리뷰어 피드백 완료: {len(reviewer_feedback)}자")
+            async def generate_recommendations(user_idea, comparison_analysis, differentiation_strategy, reviewer_feedback):
+                return await self._generate_recommendations(user_idea, {
+                    'comparison_analysis': comparison_analysis,
+                    'differentiation_strategy': differentiation_strategy,
+                    'reviewer_feedback': reviewer_feedback
+                })
+            
+            pipeline = DagExecutor([
+                # 1단계: 비교 분석
+                DagNode("comparison_analysis", self._perform_comparison_analysis_step1,
+                        ("user_idea", "similar_papers")),
+                # 2단계: 차별화 전략
+                DagNode("differentiation_strategy", self._perform_differentiation_strategy_step2,
+                        ("user_idea", "comparison_analysis")),
+                # 3단계: 리뷰어 피드백
+                DagNode("reviewer_feedback", self._perform_reviewer_feedback_step3,
+                        ("user_idea", "comparison_analysis")),
+                # 추천사항 생성
+                DagNode("recommendations", generate_recommendations,
+                        ("user_idea", "comparison_analysis", "differentiation_strategy", "reviewer_feedback")),
+            ], max_concurrency=self.MAX_CONCURRENT_STEPS)
+            # 4단계 파이프라인이므로 batch 우선순위 (대화형 호출에 슬롯을 양보)
+            with llm_priority(PRIORITY_BATCH):
+                run = await pipeline.run({"user_idea": user_idea, "similar_papers": similar_papers})
             
             # 분석 결과 통합
             analysis_result = {
-                'comparison_analysis': comparison_analysis,
-                'differentiation_strategy': differentiation_strategy,
-                'reviewer_feedback': reviewer_feedback
+                'comparison_analysis': run.results['comparison_analysis'],
+                'differentiation_strategy': run.results['differentiation_strategy'],
+                'reviewer_feedback': run.results['reviewer_feedback']
             }
             
             # 점수 계산
             scores = self._calculate_comparison_scores(analysis_result)
             
-            # 추천사항 생성
-            recommendations = await self._generate_recommendations(user_idea, analysis_result)
-            
             return ComparisonResult(
                 user_idea=user_idea,
                 similar_papers=similar_papers,
-                comparison_analysis=comparison_analysis,
-                differentiation_strategy=differentiation_strategy,
-                reviewer_feedback=reviewer_feedback,
-                recommendations=recommendations,
+                comparison_analysis=analysis_result['comparison_analysis'],
+                differentiation_strategy=analysis_result['differentiation_strategy'],
+                reviewer_feedback=analysis_result['reviewer_feedback'],
+                recommendations=run.results['recommendations'],
                 scores=scores
             )
             
@@ -134,19 +233,23 @@ class ComparisonService:
         
         return scores
     
-    async def _perform_comparison_analysis_step1(self, user_idea: str, similar_papers: List[Dict[str, Any]]) -> str:
-        """1단계: 사용자 아이디어와 유사 논문들의 비교 분석"""
-        try:
-            # 논문 정보를 상세하게 포맷팅
-            papers_text = "\n\n".join([
+    def _build_comparison_prompt(self, user_idea: str, similar_papers: List[Dict[str, Any]]) -> str:
+        """1단계 비교 분석 프롬프트"""
+        # 논문 정보를 상세하게 포맷팅 (예산을 넘으면 초록을 고르게 줄임)
+        budget = PromptBudget("comparison.comparison_analysis", self.COMPARISON_PROMPT_BUDGET)
+        blocks = budget.fit(
+            user_idea=PromptBlock(user_idea, priority=1),
+            papers_text=PromptBlock(items=[
                 f"논문 {i+1}: {paper.get('title', 'N/A')}\n"
                 f"저자: {paper.get('authors', 'N/A')}\n"
                 f"학회: {paper.get('conference', 'N/A')} ({paper.get('year', 'N/A')})\n"
                 f"초록: {paper.get('abstract', 'N/A')}"
                 for i, paper in enumerate(similar_papers[:10])  # 상위 10개 논문만 사용
             ])
-            
-            prompt = f"""
+        )
+        user_idea, papers_text = blocks['user_idea'], blocks['papers_text']
+        
+        return budget.finish(f"""
             당신은 AI 대학원 교수로서, 당신의 제자의 연구 아이디어를 최신 논문들과 비교 분석하여 
             유사점과 차별화 포인트를 명확하게 도출해야 합니다.
 
@@ -177,19 +280,18 @@ class ComparisonService:
                 - [논문2: "제목" (저자, 학회/연도)] - 차별화 요소 및 혁신 포인트
                 - ...
             - **혁신적인 접근 방법** 및 기존 연구와의 차별성을 강조
-            """
-            
-            result = await self.openai_client._call_chat_completion(prompt)
-            return result
-            
-        except Exception as e:
-            logger.error(f"1단계 비교 분석 실패: {e}")
-            return "비교 분석을 수행하는 중 오류가 발생했습니다."
+            """)
     
-    async def _perform_differentiation_strategy_step2(self, user_idea: str, comparison_analysis: str) -> str:
-        """2단계: 차별화 전략 제시"""
-        try:
-            prompt = f"""
+    def _build_differentiation_prompt(self, user_idea: str, comparison_analysis: str) -> str:
+        """2단계 차별화 전략 프롬프트"""
+        budget = PromptBudget("comparison.differentiation_strategy", self.FOLLOWUP_PROMPT_BUDGET)
+        blocks = budget.fit(
+            user_idea=PromptBlock(user_idea, priority=1),
+            comparison_analysis=PromptBlock(comparison_analysis)
+        )
+        user_idea, comparison_analysis = blocks['user_idea'], blocks['comparison_analysis']
+        
+        return budget.finish(f"""
         당신은 AI 대학원 교수입니다. 아래의 정보들을 바탕으로 당신의 제자의 연구 아이디어를
         기존 연구들과 비교하여 차별화 전략을 제시하는 것이 목표입니다. 당신의 제자의 연구 아이디어가 기존 연구들과 비교했을 때 돋보일 수 있도록 차별화 전략을 제시해주세요.
 
@@ -222,19 +324,18 @@ class ComparisonService:
         # 향후 연구 방향
         - 추가 연구가 필요한 부분
         - 확장 가능한 연구 영역
-        """
-            
-            result = await self.openai_client._call_chat_completion(prompt)
-            return result
-            
-        except Exception as e:
-            logger.error(f"2단계 차별화 전략 실패: {e}")
-            return "차별화 전략을 제시하는 중 오류가 발생했습니다."
+        """)
     
-    async def _perform_reviewer_feedback_step3(self, user_idea: str, comparison_analysis: str) -> str:
-        """3단계: 리뷰어 관점의 비판적 평가"""
-        try:
-            prompt = f"""
+    def _build_reviewer_feedback_prompt(self, user_idea: str, comparison_analysis: str) -> str:
+        """3단계 리뷰어 피드백 프롬프트"""
+        budget = PromptBudget("comparison.reviewer_feedback", self.FOLLOWUP_PROMPT_BUDGET)
+        blocks = budget.fit(
+            user_idea=PromptBlock(user_idea, priority=1),
+            comparison_analysis=PromptBlock(comparison_analysis)
+        )
+        user_idea, comparison_analysis = blocks['user_idea'], blocks['comparison_analysis']
+        
+        return budget.finish(f"""
             당신의 제자의 연구 아이디어: {user_idea}
             
             기존 연구들과의 비교 분석 결과:
@@ -262,23 +363,24 @@ class ComparisonService:
             
             객관적이고 건설적인 피드백을 제공해주세요.
             한국어로 작성해주세요.
-            """
-            
-            result = await self.openai_client._call_chat_completion(prompt)
-            return result
-            
-        except Exception as e:
-            logger.error(f"3단계 리뷰어 피드백 실패: {e}")
-            return "리뷰어 피드백을 생성하는 중 오류가 발생했습니다."
+            """)
     
-    async def _generate_recommendations(self, user_idea: str, analysis_result: Dict[str, str]) -> List[str]:
-        """LLM을 사용하여 구체적이고 실용적인 추천사항 생성"""
-        try:
-            comparison_analysis = analysis_result.get('comparison_analysis', '')
-            differentiation_strategy = analysis_result.get('differentiation_strategy', '')
-            reviewer_feedback = analysis_result.get('reviewer_feedback', '')
-            
-            prompt = f"""
+    def _build_recommendations_prompt(self, user_idea: str, analysis_result: Dict[str, str]) -> str:
+        """추천사항 생성 프롬프트"""
+        # 이전 단계 결과를 전부 넣지 않고 예산 안에서 고르게 줄임 (아이디어는 우선 보존)
+        budget = PromptBudget("comparison.recommendations", self.RECOMMENDATIONS_PROMPT_BUDGET)
+        blocks = budget.fit(
+            user_idea=PromptBlock(user_idea, priority=1),
+            comparison_analysis=PromptBlock(analysis_result.get('comparison_analysis', '')),
+            differentiation_strategy=PromptBlock(analysis_result.get('differentiation_strategy', '')),
+            reviewer_feedback=PromptBlock(analysis_result.get('reviewer_feedback', ''))
+        )
+        user_idea = blocks['user_idea']
+        comparison_analysis = blocks['comparison_analysis']
+        differentiation_strategy = blocks['differentiation_strategy']
+        reviewer_feedback = blocks['reviewer_feedback']
+        
+        return budget.finish(f"""
             당신은 AI 대학원 교수입니다. 당신의 제자의 연구 아이디어와 관련된 모든 분석 결과를 종합하여 
             구체적이고 실용적인 추천사항을 제시해야 합니다.
 
@@ -303,27 +405,67 @@ class ComparisonService:
             - ...
 
             각 추천사항은 구체적이고 실용적이어야 하며, 실제 연구에 적용할 수 있는 내용이어야 합니다.
-            """
+            """)
+    
+    def _parse_recommendations(self, response: str) -> List[str]:
+        """LLM 응답의 불릿 목록에서 추천사항 추출 (최대 8개)"""
+        recommendations = []
+        for line in (response or '').strip().split('\n'):
+            line = line.strip()
+            if line.startswith('-') or line.startswith('•') or line.startswith('*'):
+                # 불릿 포인트 제거하고 텍스트만 추출
+                recommendation = line.lstrip('-•* ').strip()
+                if recommendation and len(recommendation) > 10:
+                    recommendations.append(recommendation)
+        return recommendations[:8]
+    
+    async def _perform_comparison_analysis_step1(self, user_idea: str, similar_papers: List[Dict[str, Any]]) -> str:
+        """1단계: 사용자 아이디어와 유사 논문들의 비교 분석"""
+        try:
+            prompt = self._build_comparison_prompt(user_idea, similar_papers)
+            
+            result = await self.openai_client._call_chat_completion(prompt)
+            return result
+            
+        except Exception as e:
+            logger.error(f"1단계 비교 분석 실패: {e}")
+            return "비교 분석을 수행하는 중 오류가 발생했습니다."
+    
+    async def _perform_differentiation_strategy_step2(self, user_idea: str, comparison_analysis: str) -> str:
+        """2단계: 차별화 전략 제시"""
+        try:
+            prompt = self._build_differentiation_prompt(user_idea, comparison_analysis)
+            
+            result = await self.openai_client._call_chat_completion(prompt)
+            return result
+            
+        except Exception as e:
+            logger.error(f"2단계 차별화 전략 실패: {e}")
+            return "차별화 전략을 제시하는 중 오류가 발생했습니다."
+    
+    async def _perform_reviewer_feedback_step3(self, user_idea: str, comparison_analysis: str) -> str:
+        """3단계: 리뷰어 관점의 비판적 평가"""
+        try:
+            prompt = self._build_reviewer_feedback_prompt(user_idea, comparison_analysis)
+            
+            result = await self.openai_client._call_chat_completion(prompt)
+            return result
+            
+        except Exception as e:
+            logger.error(f"3단계 리뷰어 피드백 실패: {e}")
+            return "리뷰어 피드백을 생성하는 중 오류가 발생했습니다."
+    
+    async def _generate_recommendations(self, user_idea: str, analysis_result: Dict[str, str]) -> List[str]:
+        """LLM을 사용하여 구체적이고 실용적인 추천사항 생성"""
+        try:
+            prompt = self._build_recommendations_prompt(user_idea, analysis_result)
 
             response = await self.openai_client._call_chat_completion(prompt)
             
-            if response and len(response.strip()) > 0:
-                # 응답에서 추천사항 추출
-                lines = response.strip().split('\n')
-                recommendations = []
-                
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('-') or line.startswith('•') or line.startswith('*'):
-                        # 불릿 포인트 제거하고 텍스트만 추출
-                        recommendation = line.lstrip('-•* ').strip()
-                        if recommendation and len(recommendation) > 10:
-                            recommendations.append(recommendation)
-                
-                # 최대 8개까지만 반환
-                if recommendations:
-                    logger.info(f"LLM 추천사항 생성 완료: {len(recommendations)}개")
-                    return recommendations[:8]
+            recommendations = self._parse_recommendations(response)
+            if recommendations:
+                logger.info(f"LLM 추천사항 생성 완료: {len(recommendations)}개")
+                return recommendations
             
             # LLM 응답이 실패한 경우 기본 추천사항 반환
             logger.warning("LLM 추천사항 생성 실패, 기본 추천사항 사용")
@@ -7,6 +7,9 @@ class TrendAnalysisRequest(BaseModel):
     keywords: List[str] = Field(..., description="키워드 목록")
     limit: int = Field(50, ge=1, le=100, description="분석할 논문 수")
     similarity_threshold: float = Field(0.7, ge=0.0, le=1.0, description="유사도 임계값")
+    conferences: Optional[List[str]] = Field(None, description="대상 학회 목록 (없으면 전체)")
+    year_from: Optional[int] = Field(None, description="시작 연도 (포함)")
+    year_to: Optional[int] = Field(None, description="종료 연도 (포함)")
 
 class FieldStatisticsRequest(BaseModel):
     """분야 통계 요청 모델"""
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query, Depends, Header
-from typing import List
+from typing import List, Optional
 import logging
 from ..models.request_models import TrendAnalysisRequest, FieldStatisticsRequest, PopularKeywordsRequest
 from ..models.response_models import (
@@ -7,6 +7,7 @@ from ..models.response_models import (
     PopularKeywordsResponse, AvailableFieldsResponse, HealthCheckResponse
 )
 from ...application.services.trend_analysis_service import TrendAnalysisService
+from app.shared.api.sse import sse_response
 from ...infra.repositories.trend_repository_impl import TrendRepositoryImpl
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,9 @@ async def get_paper_trend(
     interest: str = Query(..., description="관심 분야"),
     detailed_interests: str = Query("", description="세부 분야 (쉼표로 구분)"),
     limit: int = Query(10, ge=1, le=100, description="반환할 논문 수"),
+    conferences: str = Query("", description="대상 학회 (쉼표로 구분, 비우면 전체)"),
+    year_from: Optional[int] = Query(None, description="시작 연도 (포함)"),
+    year_to: Optional[int] = Query(None, description="종료 연도 (포함)"),
     trend_service: TrendAnalysisService = Depends(get_trend_service)
 ):
     """논문 트렌드 조회"""
@@ -32,11 +36,16 @@ async def get_paper_trend(
         if detailed_interests:
             detailed_interests_list = [interest.strip() for interest in detailed_interests.split(",")]
         
+        conferences_list = [conference.strip() for conference in conferences.split(",") if conference.strip()]
+        
         # 트렌드 서비스를 통해 논문 조회
         papers = await trend_service.get_papers_by_interest(
             interest=interest,
             detailed_interests=detailed_interests_list,
-            limit=limit
+            limit=limit,
+            conferences=conferences_list or None,
+            year_from=year_from,
+            year_to=year_to
         )
         
         return {
@@ -50,6 +59,18 @@ async def get_paper_trend(
         logger.error(f"논문 트렌드 조회 실패: {e}")
         raise HTTPException(status_code=500, detail="논문 트렌드 조회 중 오류가 발생했습니다.")
 
+def to_trend_response(result) -> TrendAnalysisResponse:
+    """트렌드 분석 엔티티를 응답 모델로 변환"""
+    return TrendAnalysisResponse(
+        id=result.id,
+        field=result.field,
+        keywords=result.keywords,
+        top_papers=result.top_papers,
+        wordcloud_data=result.wordcloud_data,
+        trend_summary=result.trend_summary,
+        created_at=result.created_at.isoformat()
+    )
+
 @router.post("/analyze", response_model=TrendAnalysisResponse)
 async def analyze_trends(
     request: TrendAnalysisRequest,
@@ -74,19 +95,14 @@ async def analyze_trends(
             field=request.field,
             keywords=request.keywords,
             limit=request.limit,
-            similarity_threshold=request.similarity_threshold
+            similarity_threshold=request.similarity_threshold,
+            conferences=request.conferences,
+            year_from=request.year_from,
+            year_to=request.year_to
         )
         
         # 응답 모델로 변환
-        response = TrendAnalysisResponse(
-            id=result.id,
-            field=result.field,
-            keywords=result.keywords,
-            top_papers=result.top_papers,
-            wordcloud_data=result.wordcloud_data,
-            trend_summary=result.trend_summary,
-            created_at=result.created_at.isoformat()
-        )
+        response = to_trend_response(result)
         
         logger.info(f"트렌드 분석 완료: {result.id}")
         return response
@@ -98,6 +114,33 @@ async def analyze_trends(
         logger.error(f"트렌드 분석 실패: {e}")
         raise HTTPException(status_code=500, detail="트렌드 분석 중 오류가 발생했습니다.")
 
+@router.post("/analyze/stream")
+async def analyze_trends_stream(
+    request: TrendAnalysisRequest,
+    x_api_key: str = Header(None, alias="X-API-Key")
+):
+    """트렌드 분석 스트리밍 (SSE: stage, papers, section_start, token, section_end, result, done)"""
+    logger.info(f"트렌드 분석 스트리밍 요청: {request.field}, 키워드: {request.keywords}")
+    
+    # API Key 검증
+    if not x_api_key:
+        raise HTTPException(
+            status_code=401, 
+            detail="API Key가 필요합니다. X-API-Key 헤더를 추가해주세요."
+        )
+    
+    trend_service = get_trend_service(x_api_key)
+    events = trend_service.analyze_trends_stream(
+        field=request.field,
+        keywords=request.keywords,
+        limit=request.limit,
+        similarity_threshold=request.similarity_threshold,
+        conferences=request.conferences,
+        year_from=request.year_from,
+        year_to=request.year_to
+    )
+    return sse_response(events, to_result=to_trend_response, error_message="트렌드 분석 중 오류가 발생했습니다.")
+
 @router.get("/fields", response_model=AvailableFieldsResponse)
 async def get_available_fields(
     trend_service: TrendAnalysisService = Depends(get_trend_service)
@@ -1,8 +1,10 @@
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional
 import logging
 from app.paper_trend.domain.repositories.trend_repository import TrendRepository
 from app.paper_trend.domain.entities.trend_analysis import TrendAnalysis
 from app.shared.infra.external.openai_client import get_openai_client
+from app.shared.infra.external.llm_stream import StreamEvent, StreamedSection, stream_event
+from app.shared.infra.search.embedding_index import SearchFilter
 
 logger = logging.getLogger(__name__)
 
@@ -14,13 +16,17 @@ class TrendAnalysisService:
         self.openai_client = get_openai_client(api_key)
     
     async def analyze_trends(self, field: str, keywords: List[str], 
-                           limit: int = 50, similarity_threshold: float = 0.7) -> TrendAnalysis:
-        """트렌드 분석 수행"""
+                           limit: int = 50, similarity_threshold: float = 0.7,
+                           conferences: Optional[List[str]] = None,
+                           year_from: Optional[int] = None,
+                           year_to: Optional[int] = None) -> TrendAnalysis:
+        """트렌드 분석 수행 (학회/연도 조건이 있으면 해당 논문만 대상)"""
         try:
             logger.info(f"트렌드 분석 시작: {field}, 키워드: {keywords}")
             
             # 1. 학회별로 Top-3 논문 선택 (각 학회에서 3개씩)
-            top_papers = await self._get_top_papers_by_conference(field, keywords, top_per_conference=3)
+            filters = SearchFilter.create(conferences=conferences, year_from=year_from, year_to=year_to)
+            top_papers = await self._get_top_papers_by_conference(field, keywords, top_per_conference=3, filters=filters)
             
             if not top_papers:
                 # 논문이 없어도 기본 분석 결과 생성
@@ -50,14 +56,53 @@ class TrendAnalysisService:
             # 에러 발생 시 기본 분석 결과 반환
             return self._create_default_analysis(field, keywords)
     
-    async def _get_top_papers_by_keywords(self, field: str, keywords: List[str], top_k: int = 7) -> List[Dict[str, Any]]:
+    async def analyze_trends_stream(self, field: str, keywords: List[str],
+                                    limit: int = 50, similarity_threshold: float = 0.7,
+                                    conferences: Optional[List[str]] = None,
+                                    year_from: Optional[int] = None,
+                                    year_to: Optional[int] = None) -> AsyncIterator[StreamEvent]:
+        """트렌드 분석 스트리밍 (논문 선택 후 트렌드 요약을 토큰 단위로 전달)"""
+        logger.info(f"트렌드 분석 스트리밍 시작: {field}, 키워드: {keywords}")
+        yield stream_event("stage", stage="search_papers")
+        
+        filters = SearchFilter.create(conferences=conferences, year_from=year_from, year_to=year_to)
+        top_papers = await self._get_top_papers_by_conference(field, keywords, top_per_conference=3, filters=filters)
+        if not top_papers:
+            logger.warning(f"{field} 분야에서 키워드와 관련된 논문을 찾을 수 없습니다. 기본 분석을 수행합니다.")
+            yield stream_event("result", self._create_default_analysis(field, keywords))
+            return
+        yield stream_event("papers", top_papers=top_papers)
+        
+        abstracts = [paper.get('abstract', '') for paper in top_papers[:20]]
+        summary = StreamedSection(
+            "trend_summary", self.openai_client.build_trend_prompt(abstracts, field, keywords),
+            fallback=self._create_default_analysis(field, keywords).trend_summary,
+            cache_ttl=self.openai_client.TREND_CACHE_TTL, cache_nondeterministic=True
+        )
+        async for event in summary.stream(self.openai_client):
+            yield event
+        
+        trend_analysis = TrendAnalysis.create(
+            field=field,
+            keywords=keywords,
+            top_papers=top_papers,
+            wordcloud_data={},
+            trend_summary=summary.text
+        )
+        await self.trend_repository.save_trend_analysis(trend_analysis)
+        
+        logger.info(f"트렌드 분석 스트리밍 완료: {len(top_papers)}개 논문 분석")
+        yield stream_event("result", trend_analysis)
+    
+    async def _get_top_papers_by_keywords(self, field: str, keywords: List[str], top_k: int = 7,
+                                          filters: Optional[SearchFilter] = None) -> List[Dict[str, Any]]:
         """키워드 기반으로 Top-K 논문 선택 (전체에서 선택)"""
         try:
             logger.info(f"키워드 기반 Top-{top_k} 논문 선택: {field}, 키워드: {keywords}")
             
             # Supabase 클라이언트를 통해 Top-K 논문 선택
             from app.shared.infra.external.supabase_client import supabase_client
-            top_papers = await supabase_client.get_top_papers_by_keywords(field, keywords, top_k)
+            top_papers = await supabase_client.get_top_papers_by_keywords(field, keywords, top_k, filters=filters)
             
             logger.info(f"Top-{top_k} 논문 선택 완료: {len(top_papers)}개 논문")
             return top_papers
@@ -66,14 +111,15 @@ class TrendAnalysisService:
             logger.error(f"Top-K 논문 선택 실패: {e}")
             return []
     
-    async def _get_top_papers_by_conference(self, field: str, keywords: List[str], top_per_conference: int = 3) -> List[Dict[str, Any]]:
+    async def _get_top_papers_by_conference(self, field: str, keywords: List[str], top_per_conference: int = 3,
+                                            filters: Optional[SearchFilter] = None) -> List[Dict[str, Any]]:
         """학회별로 Top-K 논문 선택"""
         try:
             logger.info(f"학회별 Top-{top_per_conference} 논문 선택: {field}, 키워드: {keywords}")
             
             # Supabase 클라이언트를 통해 학회별 Top-K 논문 선택
             from app.shared.infra.external.supabase_client import supabase_client
-            top_papers = await supabase_client.get_top_papers_by_conference(field, keywords, top_per_conference)
+            top_papers = await supabase_client.get_top_papers_by_conference(field, keywords, top_per_conference, filters=filters)
             
             logger.info(f"학회별 Top-{top_per_conference} 논문 선택 완료: {len(top_papers)}개 논문")
             return top_papers
@@ -164,36 +210,41 @@ class TrendAnalysisService:
     async def get_field_statistics(self, field: str) -> Dict[str, Any]:
         """특정 분야의 통계 정보 조회"""
         try:
-            # 기본 통계 정보 반환
-            return {
-                "total_papers": 0,
-                "year_distribution": {},
-                "conference_distribution": {}
-            }
+            # 카탈로그 집계에서 통계 정보 조회
+            return await self.trend_repository.get_field_statistics(field)
         except Exception as e:
             logger.error(f"분야 통계 조회 실패: {e}")
             raise e
     
-    async def get_papers_by_interest(self, interest: str, detailed_interests: List[str] = [], limit: int = 10) -> List[Dict[str, Any]]:
-        """관심 분야에 따른 논문 조회"""
+    async def get_papers_by_interest(self, interest: str, detailed_interests: List[str] = [], limit: int = 10,
+                                     conferences: Optional[List[str]] = None,
+                                     year_from: Optional[int] = None,
+                                     year_to: Optional[int] = None) -> List[Dict[str, Any]]:
+        """관심 분야에 따른 논문 조회 (학회/연도 조건은 세부 분야 유무와 관계없이 적용)"""
         try:
             logger.info(f"관심 분야 논문 조회: {interest}, 세부 분야: {detailed_interests}, 제한: {limit}")
             
             # Supabase 클라이언트를 통해 논문 조회
             from app.shared.infra.external.supabase_client import supabase_client
             
-            # 기본 분야로 논문 조회
-            papers = await supabase_client.get_papers_by_field(interest, limit=limit)
-            
-            # 세부 분야가 있으면 필터링
-            if detailed_interests:
-                filtered_papers = []
-                for paper in papers:
-                    # 논문의 키워드나 제목에서 세부 분야 키워드가 포함되어 있는지 확인
-                    paper_text = f"{paper.get('title', '')} {paper.get('abstract', '')}".lower()
-                    if any(detail.lower() in paper_text for detail in detailed_interests):
-                        filtered_papers.append(paper)
-                papers = filtered_papers[:limit]  # 제한 수만큼만 반환
+            filters = SearchFilter.create(conferences=conferences, year_from=year_from, year_to=year_to)
+            
+            # 세부 분야가 없으면 기본 분야로 논문 조회
+            if not detailed_interests:
+                papers = await supabase_client.get_papers_by_field(interest, limit=limit, filters=filters)
+            else:
+                # 세부 분야로 분야 전체에서 BM25 + 벡터 하이브리드 검색
+                query = " ".join(detailed_interests)
+                try:
+                    query_embedding = await self.openai_client.generate_embedding(query)
+                except Exception as e:
+                    logger.warning(f"세부 분야 임베딩 생성 실패, BM25 검색만 사용합니다: {e}")
+                    query_embedding = None
+                
+                papers = await supabase_client.search_papers_hybrid(
+                    interest, query, limit=limit, query_embedding=query_embedding,
+                    filters=filters
+                )
             
             logger.info(f"관심 분야 논문 조회 완료: {len(papers)}개 논문")
             return papers
@@ -0,0 +1,47 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # 프록시(nginx 등)의 응답 버퍼링 비활성화
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """SSE 메시지 한 개 (event, data 줄과 빈 줄)"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def sse_response(events: AsyncIterator[Dict[str, Any]],
+                 to_result: Optional[Callable[[Any], Any]] = None,
+                 error_message: str = "처리 중 오류가 발생했습니다.") -> StreamingResponse:
+    """서비스 스트리밍 이벤트를 SSE 응답으로 변환
+
+    result 이벤트의 내용은 to_result로 응답 형식으로 변환합니다.
+    오류는 스트림 도중이므로 HTTP 상태 코드 대신 error 이벤트로 전달하며 (ValueError는 400, 그 외 500),
+    스트림은 항상 done 이벤트로 끝납니다.
+    """
+    async def body():
+        try:
+            async for item in events:
+                data = item["data"]
+                if item["event"] == "result" and to_result is not None:
+                    data = to_result(data)
+                    if hasattr(data, "model_dump"):
+                        data = data.model_dump()
+                yield format_sse(item["event"], data)
+        except ValueError as e:
+            logger.error(f"스트리밍 검증 실패: {e}")
+            yield format_sse("error", {"status_code": 400, "detail": str(e)})
+        except Exception as e:
+            logger.error(f"스트리밍 실패: {e}")
+            yield format_sse("error", {"status_code": 500, "detail": error_message})
+        yield format_sse("done", {})
+
+    return StreamingResponse(body(), media_type="text/event-stream", headers=SSE_HEADERS)
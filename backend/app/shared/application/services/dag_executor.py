@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DagNode:
+    """파이프라인 단계
+
+    func는 inputs에 나열한 이름(초기값 또는 다른 단계)의 결과를 같은 이름의 키워드 인자로 받습니다.
+    """
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    inputs: Tuple[str, ...] = ()
+
+
+@dataclass
+class NodeTiming:
+    """단계별 시간 (파이프라인 시작 기준, 초)"""
+    ready_at: float = 0.0      # 입력이 모두 준비된 시각
+    started_at: float = 0.0    # 동시 실행 제한을 통과해 실행을 시작한 시각
+    finished_at: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.finished_at - self.started_at
+
+    @property
+    def wait(self) -> float:
+        """동시 실행 제한 때문에 기다린 시간"""
+        return self.started_at - self.ready_at
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'ready_at': round(self.ready_at, 3),
+            'started_at': round(self.started_at, 3),
+            'finished_at': round(self.finished_at, 3),
+            'duration': round(self.duration, 3),
+            'wait': round(self.wait, 3)
+        }
+
+
+@dataclass
+class DagRun:
+    """파이프라인 실행 결과 (단계 이름 -> 결과, 단계별 시간, 전체 시간)"""
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, NodeTiming] = field(default_factory=dict)
+    total_seconds: float = 0.0
+
+    def timings_dict(self) -> Dict[str, Dict[str, float]]:
+        return {name: timing.to_dict() for name, timing in self.timings.items()}
+
+
+class DagExecutor:
+    """의존성 그래프 실행기
+
+    각 단계는 입력으로 쓰는 단계가 끝나는 즉시 시작하며, 서로 독립인 단계는
+    asyncio.gather로 동시에 실행합니다. 동시에 실행되는 단계 수는 max_concurrency로 제한합니다.
+    한 단계가 실패하면 나머지 단계를 취소하고 예외를 그대로 전달합니다.
+    """
+
+    def __init__(self, nodes: Sequence[DagNode], max_concurrency: int = 4):
+        self.nodes = {node.name: node for node in nodes}
+        if len(self.nodes) != len(nodes):
+            raise ValueError("단계 이름이 중복되었습니다.")
+        self.max_concurrency = max(1, max_concurrency)
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        """순환 의존성 검사 (초기값 이름은 그래프 밖 입력으로 간주)"""
+        visiting, done = set(), set()
+
+        def visit(name: str, path: List[str]) -> None:
+            if name in done or name not in self.nodes:
+                return
+            if name in visiting:
+                raise ValueError(f"순환 의존성: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dependency in self.nodes[name].inputs:
+                visit(dependency, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.nodes:
+            visit(name, [])
+
+    async def run(self, initial: Optional[Dict[str, Any]] = None) -> DagRun:
+        """모든 단계 실행 (initial은 단계가 입력으로 참조할 수 있는 초기값)"""
+        initial = dict(initial or {})
+        missing = {
+            dependency for node in self.nodes.values() for dependency in node.inputs
+            if dependency not in self.nodes and dependency not in initial
+        }
+        if missing:
+            raise ValueError(f"정의되지 않은 입력: {', '.join(sorted(missing))}")
+
+        run = DagRun(results={})
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        futures = {name: loop.create_future() for name in self.nodes}
+        start = time.perf_counter()
+
+        async def execute(node: DagNode) -> None:
+            kwargs = {}
+            for dependency in node.inputs:
+                kwargs[dependency] = await futures[dependency] if dependency in futures else initial[dependency]
+            timing = NodeTiming(ready_at=time.perf_counter() - start)
+            run.timings[node.name] = timing
+            async with semaphore:
+                timing.started_at = time.perf_counter() - start
+                try:
+                    result = await node.func(**kwargs)
+                finally:
+                    timing.finished_at = time.perf_counter() - start
+            run.results[node.name] = result
+            futures[node.name].set_result(result)
+
+        tasks = [asyncio.ensure_future(execute(node)) for node in self.nodes.values()]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            for future in futures.values():
+                future.cancel()
+            raise
+        finally:
+            run.total_seconds = time.perf_counter() - start
+
+        logger.info(
+            f"파이프라인 완료 ({run.total_seconds:.2f}초): " + ", ".join(
+                f"{name} {timing.duration:.2f}초" + (f" (대기 {timing.wait:.2f}초)" if timing.wait >= 0.01 else "")
+                for name, timing in run.timings.items()
+            )
+        )
+        return run
@@ -18,15 +18,19 @@ class LabSearchService:
         self.labs_data = []  # 초기화 시에는 빈 리스트, 필요할 때 로드
     
     async def _load_labs_data(self) -> List[Dict]:
-        """Supabase에서 연구실 데이터 로드"""
+        """연구실 데이터 로드 (Lambda 스냅샷 번들이 있으면 번들, 없으면 Supabase)"""
         try:
-            if not self.supabase_client.client:
-                print("⚠️ Supabase 연결이 없습니다.")
-                return []
-            
-            # professors 테이블에서 모든 데이터 가져오기
-            result = self.supabase_client.client.table("professors").select("*").execute()
-            professors = result.data
+            professors = self._load_snapshot_professors()
+            source = "스냅샷 번들"
+            if professors is None:
+                if not self.supabase_client.client:
+                    print("⚠️ Supabase 연결이 없습니다.")
+                    return []
+                
+                # professors 테이블에서 모든 데이터 가져오기
+                result = await self.supabase_client.run_query(self.supabase_client.client.table("professors").select("*"))
+                professors = result.data
+                source = "Supabase"
             
             # 데이터 형식 변환
             all_labs = []
@@ -50,13 +54,25 @@ class LabSearchService:
                 }
                 all_labs.append(lab_data)
             
-            print(f"✅ Supabase에서 {len(all_labs)}명의 교수 데이터 로드 완료")
+            print(f"✅ {source}에서 {len(all_labs)}명의 교수 데이터 로드 완료")
             return all_labs
             
         except Exception as e:
             print(f"❌ 연구실 데이터 로드 실패: {e}")
             return []
     
+    def _load_snapshot_professors(self) -> Optional[List[Dict]]:
+        """압축 해제된 Lambda 스냅샷 번들(LAMBDA_SNAPSHOT_DIR)의 교수 행 목록"""
+        snapshot_dir = os.getenv("LAMBDA_SNAPSHOT_DIR")
+        if not snapshot_dir:
+            return None
+        from ...infra.search.lambda_snapshot import load_lab_catalogue
+        try:
+            return load_lab_catalogue(snapshot_dir)
+        except Exception as e:
+            print(f"⚠️ 스냅샷 연구실 카탈로그 로드 실패, Supabase에서 조회합니다: {e}")
+            return None
+    
     async def search_labs_by_category(self, category: str, min_score: float = 0.3) -> List[Dict]:
         """
         카테고리별 연구실 검색
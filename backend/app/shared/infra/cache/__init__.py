@@ -0,0 +1 @@
+# Shared caches 
\ No newline at end of file
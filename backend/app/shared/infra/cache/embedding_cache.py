@@ -0,0 +1,69 @@
+import hashlib
+import logging
+import os
+import tempfile
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.shared.infra.cache.two_tier_store import TwoTierStore
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키 생성을 위한 텍스트 정규화 (유니코드 NFC, 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_cache_key(model: str, text: str) -> str:
+    """(모델, 정규화된 텍스트 해시) 캐시 키"""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class EmbeddingCache:
+    """질의 임베딩 2단계 캐시 (메모리 LRU + SQLite, TwoTierStore 사용)
+
+    키는 (모델, 정규화된 텍스트 해시)이며 항목은 만료되지 않고 항목 수 기준으로만 제거됩니다.
+    디스크에는 float32 바이트로 저장합니다.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, memory_size: int = 1024,
+                 max_disk_entries: int = 50000):
+        self._store = TwoTierStore(
+            "임베딩", db_path=db_path, memory_size=memory_size, max_disk_entries=max_disk_entries,
+            encode=lambda embedding: np.asarray(embedding, dtype=np.float32).tobytes(),
+            decode=lambda blob: np.frombuffer(blob, dtype=np.float32).tolist()
+        )
+
+    async def get(self, model: str, text: str) -> Optional[List[float]]:
+        """캐시된 임베딩 조회 (없으면 None)"""
+        return await self._store.get(make_cache_key(model, text))
+
+    async def set(self, model: str, text: str, embedding: List[float]) -> None:
+        """임베딩 저장 (메모리와 디스크 모두)"""
+        await self._store.set(make_cache_key(model, text), embedding)
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/실패 카운터와 캐시 크기"""
+        return self._store.stats()
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """프로세스 공용 임베딩 캐시 반환 (첫 호출 시 생성)"""
+    global _embedding_cache
+    if _embedding_cache is None:
+        db_path = os.getenv("EMBEDDING_CACHE_PATH") or os.path.join(
+            tempfile.gettempdir(), "cvpilot_embedding_cache.sqlite3"
+        )
+        _embedding_cache = EmbeddingCache(
+            db_path=db_path,
+            memory_size=int(os.getenv("EMBEDDING_CACHE_MEMORY_SIZE", "1024")),
+            max_disk_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
+        )
+    return _embedding_cache
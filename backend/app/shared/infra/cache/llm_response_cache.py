@@ -0,0 +1,71 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+from app.shared.infra.cache.two_tier_store import TwoTierStore
+
+logger = logging.getLogger(__name__)
+
+
+def make_response_key(model: str, system_prompt: str, prompt: str,
+                      temperature: float, max_tokens: int,
+                      response_format: Optional[Dict[str, Any]] = None) -> str:
+    """(모델, 시스템 프롬프트, 사용자 프롬프트, temperature, max_tokens, 응답 형식) 내용 해시 키
+
+    프롬프트는 정규화하지 않으므로 바이트 단위로 같은 요청만 같은 키가 됩니다.
+    응답 형식을 지정하지 않은 요청은 기존과 같은 키를 사용합니다.
+    """
+    parts = [model, system_prompt, prompt, float(temperature), int(max_tokens)]
+    if response_format is not None:
+        parts.append(response_format)
+    payload = json.dumps(parts, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """LLM 응답 2단계 캐시 (메모리 LRU + SQLite, TwoTierStore 사용)
+
+    항목마다 저장 시 지정한 TTL로 만료 시각을 기록하며, 만료된 항목은 조회 시 제외하고
+    항목 수가 최대치를 넘으면 만료된 항목과 오래 사용되지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, memory_size: int = 256,
+                 max_disk_entries: int = 10000):
+        self._store = TwoTierStore(
+            "LLM 응답", db_path=db_path, memory_size=memory_size, max_disk_entries=max_disk_entries
+        )
+
+    async def get(self, key: str) -> Optional[str]:
+        """만료되지 않은 캐시 응답 조회 (없으면 None)"""
+        return await self._store.get(key)
+
+    async def set(self, key: str, response: str, ttl: float) -> None:
+        """응답 저장 (메모리와 디스크 모두, ttl초 후 만료)"""
+        if ttl <= 0:
+            return
+        await self._store.set(key, response, ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/실패 카운터와 캐시 크기"""
+        return self._store.stats()
+
+
+_llm_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """프로세스 공용 LLM 응답 캐시 반환 (첫 호출 시 생성)"""
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        db_path = os.getenv("LLM_CACHE_PATH") or os.path.join(
+            tempfile.gettempdir(), "cvpilot_llm_cache.sqlite3"
+        )
+        _llm_response_cache = LLMResponseCache(
+            db_path=db_path,
+            memory_size=int(os.getenv("LLM_CACHE_MEMORY_SIZE", "256")),
+            max_disk_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+        )
+    return _llm_response_cache
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 디스크 항목의 마지막 사용 시각은 모아 두었다가 이 개수마다(또는 다음 저장 때) 한 번에 반영
+ACCESS_FLUSH_SIZE = 256
+
+
+class TwoTierStore:
+    """메모리 LRU + SQLite 파일 2단계 키-값 저장소
+
+    메모리 단계는 이벤트 루프에서 바로 조회하고, 디스크 단계의 조회/저장/제거는
+    asyncio.to_thread로 스레드에서 실행하여 SQLite 쓰기(fsync)가 이벤트 루프를 막지 않습니다.
+    항목은 선택적으로 만료 시각을 가지며, 디스크 항목 수는 메모리에서 추적하여
+    최대치를 넘으면 만료된 항목과 오래 사용되지 않은 항목부터 10% 여유를 두고 제거합니다.
+    조회 시 마지막 사용 시각 갱신은 모아서 반영하므로 디스크 LRU 순서는 근사값입니다.
+    SQLite를 열 수 없는 환경에서는 메모리 단계만 사용합니다.
+    """
+
+    def __init__(self, label: str, db_path: Optional[str] = None, memory_size: int = 256,
+                 max_disk_entries: int = 10000,
+                 encode: Callable[[Any], Any] = lambda value: value,
+                 decode: Callable[[Any], Any] = lambda value: value):
+        self.label = label
+        self.memory_size = memory_size
+        self.max_disk_entries = max_disk_entries
+        self._encode = encode
+        self._decode = decode
+        # 키 -> (값, 만료 시각 또는 None)
+        self._memory: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        # 디스크에 아직 반영하지 않은 마지막 사용 시각 (키 -> 시각)
+        self._pending_access: Dict[str, float] = {}
+
+        self.db_path = db_path
+        self._disk_lock = threading.Lock()
+        self._disk_entries = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path:
+            try:
+                self._conn = sqlite3.connect(db_path, check_same_thread=False)
+                # 캐시 데이터는 잃어도 되므로 WAL + synchronous=NORMAL로 쓰기 비용을 줄임
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                    "expires_at REAL, last_access REAL NOT NULL)"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access)")
+                self._conn.commit()
+                self._disk_entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            except sqlite3.Error as e:
+                logger.warning(f"{label} 디스크 캐시를 열 수 없어 메모리 캐시만 사용합니다 ({db_path}): {e}")
+                self._conn = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        """만료되지 않은 값 조회 (없으면 None)"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > now:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return entry[0]
+                del self._memory[key]
+
+        entry = await asyncio.to_thread(self._get_from_disk, key, now) if self._conn is not None else None
+
+        with self._lock:
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["disk_hits"] += 1
+            self._put_in_memory(key, entry)
+            self._pending_access[key] = now
+            flush = len(self._pending_access) >= ACCESS_FLUSH_SIZE
+        if flush:
+            await asyncio.to_thread(self._write_to_disk, None)
+        return entry[0]
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """값 저장 (메모리와 디스크 모두, ttl을 지정하면 ttl초 후 만료)"""
+        entry = (value, time.time() + ttl if ttl is not None else None)
+        with self._lock:
+            self._put_in_memory(key, entry)
+        if self._conn is not None:
+            await asyncio.to_thread(self._write_to_disk, (key, entry))
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/실패 카운터와 캐시 크기"""
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            total = hits + self._counters["misses"]
+            return {
+                **self._counters,
+                "hits": hits,
+                "hit_rate": hits / total if total else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_entries,
+            }
+
+    def _put_in_memory(self, key: str, entry: Tuple[Any, Optional[float]]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _get_from_disk(self, key: str, now: float) -> Optional[Tuple[Any, Optional[float]]]:
+        """디스크 조회 (스레드에서 실행, 만료된 항목은 None)"""
+        with self._disk_lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"{self.label} 디스크 캐시 조회 실패: {e}")
+                return None
+        if row is None or (row[1] is not None and row[1] <= now):
+            # 만료된 항목은 다음 저장 시 제거
+            return None
+        return self._decode(row[0]), row[1]
+
+    def _write_to_disk(self, item: Optional[Tuple[str, Tuple[Any, Optional[float]]]]) -> None:
+        """항목 저장과 모아 둔 사용 시각 반영, 필요 시 제거를 한 트랜잭션으로 실행 (스레드에서 실행)"""
+        with self._lock:
+            accesses = list(self._pending_access.items())
+            self._pending_access.clear()
+        with self._disk_lock:
+            try:
+                if item is not None:
+                    key, (value, expires_at) = item
+                    encoded = self._encode(value)
+                    params = (encoded, expires_at, time.time(), key)
+                    inserted = self._conn.execute(
+                        "INSERT OR IGNORE INTO entries (value, expires_at, last_access, key) VALUES (?, ?, ?, ?)",
+                        params
+                    ).rowcount
+                    if inserted:
+                        self._disk_entries += 1
+                    else:
+                        self._conn.execute(
+                            "UPDATE entries SET value = ?, expires_at = ?, last_access = ? WHERE key = ?", params
+                        )
+                if accesses:
+                    self._conn.executemany(
+                        "UPDATE entries SET last_access = ? WHERE key = ?",
+                        [(accessed_at, key) for key, accessed_at in accesses]
+                    )
+                if self._disk_entries > self.max_disk_entries:
+                    self._evict_disk_entries()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"{self.label} 디스크 캐시 저장 실패: {e}")
+
+    def _evict_disk_entries(self) -> None:
+        """만료된 항목을 지운 뒤, 여전히 많으면 오래 사용되지 않은 항목부터 10% 여유를 두고 제거"""
+        evicted = max(self._conn.execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+        ).rowcount, 0)
+        self._disk_entries -= evicted
+        if self._disk_entries > self.max_disk_entries:
+            excess = self._disk_entries - int(self.max_disk_entries * 0.9)
+            removed = max(self._conn.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY last_access ASC LIMIT ?)",
+                (excess,)
+            ).rowcount, 0)
+            self._disk_entries -= removed
+            evicted += removed
+        with self._lock:
+            self._counters["evictions"] += evicted
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64"))  # 한 번에 전송할 최대 입력 수
+MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))  # 배치를 모으는 최대 대기 시간 (ms)
+
+SendBatch = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+class _PendingBatch:
+    """전송 대기 중인 배치 (동일 API Key/모델)"""
+
+    def __init__(self, send_batch: SendBatch):
+        self.send_batch = send_batch
+        self.futures: Dict[str, List[asyncio.Future]] = {}
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self) -> int:
+        return len(self.futures)
+
+
+class EmbeddingBatcher:
+    """임베딩 요청 마이크로 배칭
+
+    여러 핸들러에서 동시에 들어온 임베딩 요청을 (API Key, 모델)별로
+    최대 `max_wait_ms` 동안 또는 `max_batch_size`개가 모일 때까지 모아
+    한 번의 API 호출로 전송하고, 결과를 각 호출자에게 나눠 돌려줍니다.
+    같은 배치 안의 동일한 텍스트는 한 번만 전송합니다.
+    """
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE, max_wait_ms: float = MAX_WAIT_MS):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._pending: Dict[Tuple[str, str], _PendingBatch] = {}
+        # 전송 중인 태스크 (이벤트 루프는 태스크를 약한 참조로만 보관하므로 완료 전까지 참조 유지)
+        self._tasks: Set[asyncio.Task] = set()
+        self._loop = asyncio.get_running_loop()
+        self.batches_sent = 0
+        self.inputs_sent = 0
+
+    async def embed(self, api_key: str, model: str, text: str, send_batch: SendBatch) -> List[float]:
+        """텍스트 하나의 임베딩을 배치를 통해 요청"""
+        key = (api_key, model)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch(send_batch)
+            self._pending[key] = batch
+            batch.timer = self._loop.call_later(self.max_wait, self._flush, key)
+
+        future = self._loop.create_future()
+        batch.futures.setdefault(text, []).append(future)
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: Tuple[str, str]) -> None:
+        """대기 중인 배치를 꺼내 전송 태스크 시작"""
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = self._loop.create_task(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: _PendingBatch) -> None:
+        texts = list(batch.futures.keys())
+        try:
+            embeddings = await batch.send_batch(texts)
+            if len(embeddings) != len(texts):
+                raise ValueError(f"임베딩 응답 수 불일치: {len(embeddings)} != {len(texts)}")
+        except asyncio.CancelledError:
+            # 전송이 취소되면 대기 중인 호출자도 함께 취소
+            for futures in batch.futures.values():
+                for future in futures:
+                    future.cancel()
+            raise
+        except Exception as e:
+            for futures in batch.futures.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        self.batches_sent += 1
+        self.inputs_sent += len(texts)
+        if len(texts) > 1:
+            logger.info(f"임베딩 배치 전송: {len(texts)}개 입력")
+
+        for text, embedding in zip(texts, embeddings):
+            for future in batch.futures[text]:
+                if not future.done():
+                    future.set_result(embedding)
+
+
+_batcher: Optional[EmbeddingBatcher] = None
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """현재 이벤트 루프의 공용 임베딩 배처 반환"""
+    global _batcher
+    if _batcher is None or _batcher._loop is not asyncio.get_running_loop():
+        _batcher = EmbeddingBatcher()
+    return _batcher
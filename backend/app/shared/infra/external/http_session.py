@@ -0,0 +1,64 @@
+import asyncio
+import os
+import aiohttp
+import logging
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# 연결 풀 설정 (환경변수로 조정 가능)
+POOL_LIMIT = int(os.getenv("OPENAI_HTTP_POOL_LIMIT", "100"))  # 전체 동시 연결 수
+POOL_LIMIT_PER_HOST = int(os.getenv("OPENAI_HTTP_POOL_LIMIT_PER_HOST", "50"))  # 호스트별 동시 연결 수
+KEEPALIVE_TIMEOUT = float(os.getenv("OPENAI_HTTP_KEEPALIVE_TIMEOUT", "60"))  # 유휴 연결 유지 시간 (초)
+DNS_CACHE_TTL = int(os.getenv("OPENAI_HTTP_DNS_CACHE_TTL", "300"))  # DNS 캐시 유지 시간 (초)
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """프로세스 공용 aiohttp 세션 반환
+
+    연결(TCP/TLS)을 요청 간에 재사용하기 위해 앱 수명 동안 하나의 세션을 유지합니다.
+    인증 헤더는 요청마다 전달하므로 API Key별로 세션을 나눌 필요가 없습니다.
+    이벤트 루프가 바뀐 경우(예: Lambda 재시작) 이전 세션을 닫고 새 세션을 만듭니다.
+    TLS 인증서 검증은 aiohttp 기본값(검증함)을 사용합니다.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        if _session is not None and not _session.closed:
+            await _close_stale_session(_session)
+        connector = aiohttp.TCPConnector(
+            limit=POOL_LIMIT,
+            limit_per_host=POOL_LIMIT_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=DNS_CACHE_TTL
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+        _session_loop = loop
+        logger.info(f"HTTP 연결 풀 생성 (limit={POOL_LIMIT}, limit_per_host={POOL_LIMIT_PER_HOST})")
+    return _session
+
+
+async def _close_stale_session(session: aiohttp.ClientSession) -> None:
+    """이전 이벤트 루프에서 만든 세션의 연결 정리 (소켓 누수와 Unclosed client session 경고 방지)"""
+    try:
+        await session.close()
+    except Exception as e:
+        # 이전 루프가 이미 닫혀 전송 계층을 정리할 수 없는 경우 세션에서 연결만 분리
+        logger.debug(f"이전 HTTP 세션 종료 실패, 연결을 분리합니다: {e}")
+        session.detach()
+
+
+async def close_http_session() -> None:
+    """공용 세션 종료 (앱 종료 시 호출)"""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("HTTP 연결 풀 종료")
+    _session = None
+    _session_loop = None
@@ -0,0 +1,259 @@
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+# 호출별 구조화 로그 (한 줄에 JSON 하나, 수집기에서 필터링할 수 있도록 별도 로거)
+call_logger = logging.getLogger("app.llm_calls")
+
+# 모델별 가격 (USD / 100만 토큰, 입력·출력)
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "text-embedding-3-small": (0.02, 0.0),
+}
+
+# 히스토그램 구간 상한 (초, 토큰)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000)
+
+# 호출부 자동 판별 시 건너뛸 모듈 (클라이언트 내부와 래퍼)
+_INTERNAL_MODULES = (
+    "app.shared.infra.external.openai_client",
+    "app.shared.infra.external.llm_metrics",
+    "app.shared.infra.external.embedding_batcher",
+    "contextlib",
+    "asyncio",
+)
+
+
+@dataclass
+class LLMCallRecord:
+    """LLM API 호출 한 건의 측정값"""
+    call_site: str
+    model: str
+    kind: str = "chat"          # chat, stream, embedding
+    priority: str = ""
+    status: str = "ok"          # ok, error, cancelled
+    cached: bool = False
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    wall_time: float = 0.0      # 캐시 조회부터 응답 완료까지 (초)
+    queue_time: float = 0.0     # 스케줄러 슬롯 대기 (초)
+    retries: int = 0
+
+    def apply_usage(self, usage: Optional[Dict[str, Any]]) -> None:
+        """API 응답의 usage 반영"""
+        if not usage:
+            return
+        self.prompt_tokens = int(usage.get("prompt_tokens") or 0)
+        self.completion_tokens = int(usage.get("completion_tokens") or 0)
+
+    @property
+    def cost_usd(self) -> float:
+        input_price, output_price = MODEL_PRICES.get(self.model, (0.0, 0.0))
+        return (self.prompt_tokens * input_price + self.completion_tokens * output_price) / 1_000_000
+
+
+class Histogram:
+    """고정 구간 누적 히스토그램 (Prometheus 형식과 같은 le 구간)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        result, total = [], 0
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += count
+            result.append((str(bound), total))
+        return result
+
+    def quantile(self, ratio: float) -> float:
+        """구간 상한 기준 분위수 근사값"""
+        if not self.count:
+            return 0.0
+        target, total = ratio * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= target:
+                return float(bound)
+        return float(self.buckets[-1])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(self.cumulative())
+        }
+
+
+class _CallSiteMetrics:
+    """호출부·모델별 집계"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.cost_usd = 0.0
+        self.wall_time = Histogram(LATENCY_BUCKETS)
+        self.queue_time = Histogram(LATENCY_BUCKETS)
+        self.prompt_tokens = Histogram(TOKEN_BUCKETS)
+        self.completion_tokens = Histogram(TOKEN_BUCKETS)
+
+    def record(self, record: LLMCallRecord) -> None:
+        self.calls += 1
+        self.retries += record.retries
+        if record.status != "ok":
+            self.errors += 1
+        if record.cached:
+            # 캐시 적중은 API를 호출하지 않으므로 횟수만 집계
+            self.cache_hits += 1
+            return
+        self.cost_usd += record.cost_usd
+        self.wall_time.observe(record.wall_time)
+        self.queue_time.observe(record.queue_time)
+        if record.status == "ok":
+            self.prompt_tokens.observe(record.prompt_tokens)
+            self.completion_tokens.observe(record.completion_tokens)
+
+
+class LLMMetrics:
+    """프로세스 공용 LLM 호출 지표 (호출부·모델별 히스토그램과 구조화 로그)"""
+
+    def __init__(self):
+        self._sites: Dict[Tuple[str, str], _CallSiteMetrics] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(self, record: LLMCallRecord) -> None:
+        with self._lock:
+            self._sites.setdefault((record.call_site, record.model), _CallSiteMetrics()).record(record)
+        call_logger.info(json.dumps({
+            "event": "llm_call",
+            **asdict(record),
+            "wall_time": round(record.wall_time, 4),
+            "queue_time": round(record.queue_time, 4),
+            "cost_usd": round(record.cost_usd, 6)
+        }, ensure_ascii=False))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """호출부별 집계 (비용 합계가 큰 순서)"""
+        with self._lock:
+            sites = [
+                {
+                    "call_site": call_site,
+                    "model": model,
+                    "calls": metrics.calls,
+                    "errors": metrics.errors,
+                    "cache_hits": metrics.cache_hits,
+                    "retries": metrics.retries,
+                    "cost_usd": round(metrics.cost_usd, 6),
+                    "wall_time_seconds": metrics.wall_time.to_dict(),
+                    "queue_time_seconds": metrics.queue_time.to_dict(),
+                    "prompt_tokens": metrics.prompt_tokens.to_dict(),
+                    "completion_tokens": metrics.completion_tokens.to_dict()
+                }
+                for (call_site, model), metrics in self._sites.items()
+            ]
+        sites.sort(key=lambda site: (site["cost_usd"], site["wall_time_seconds"]["sum"]), reverse=True)
+        return {"since": self.started_at, "call_sites": sites}
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 형식"""
+        lines = []
+        with self._lock:
+            items = list(self._sites.items())
+        counters = (
+            ("llm_calls_total", "calls", "LLM API 호출 수 (캐시 적중 포함)"),
+            ("llm_call_errors_total", "errors", "실패한 LLM 호출 수"),
+            ("llm_cache_hits_total", "cache_hits", "응답 캐시 적중 수"),
+            ("llm_retries_total", "retries", "429/5xx 재시도 수"),
+            ("llm_cost_usd_total", "cost_usd", "추정 비용 (USD)"),
+        )
+        for metric, attribute, help_text in counters:
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            for (call_site, model), metrics in items:
+                lines.append(f"{metric}{{{_labels(call_site, model)}}} {getattr(metrics, attribute)}")
+        histograms = (
+            ("llm_call_duration_seconds", "wall_time", "LLM 호출 전체 시간 (초)"),
+            ("llm_queue_wait_seconds", "queue_time", "스케줄러 슬롯 대기 시간 (초)"),
+            ("llm_prompt_tokens", "prompt_tokens", "입력 토큰 수"),
+            ("llm_completion_tokens", "completion_tokens", "출력 토큰 수"),
+        )
+        for metric, attribute, help_text in histograms:
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+            for (call_site, model), metrics in items:
+                histogram = getattr(metrics, attribute)
+                labels = _labels(call_site, model)
+                for bound, count in histogram.cumulative():
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(call_site: str, model: str) -> str:
+    escape = lambda value: value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'call_site="{escape(call_site)}",model="{escape(model)}"'
+
+
+def infer_call_site() -> str:
+    """호출한 함수 이름 (클라이언트 내부 프레임을 건너뛴 첫 프레임의 Class.method)"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(_INTERNAL_MODULES):
+            code = frame.f_code
+            return getattr(code, "co_qualname", code.co_name)
+        frame = frame.f_back
+    return "unknown"
+
+
+@contextmanager
+def track_llm_call(call_site: Optional[str], model: str, kind: str = "chat", priority: str = ""):
+    """LLM 호출 측정 (블록 전체 시간과 성공 여부를 기록, 호출부를 생략하면 자동 판별)"""
+    record = LLMCallRecord(call_site=call_site or infer_call_site(), model=model, kind=kind, priority=priority)
+    start_time = time.monotonic()
+    try:
+        yield record
+    except (GeneratorExit, asyncio.CancelledError):
+        # 스트림을 끝까지 읽지 않았거나 요청이 취소된 경우
+        record.status = "cancelled"
+        raise
+    except BaseException:
+        record.status = "error"
+        raise
+    finally:
+        record.wall_time = time.monotonic() - start_time
+        try:
+            get_llm_metrics().record(record)
+        except Exception as e:
+            logger.warning(f"LLM 호출 지표 기록 실패: {e}")
+
+
+_llm_metrics: Optional[LLMMetrics] = None
+
+
+def get_llm_metrics() -> LLMMetrics:
+    """프로세스 공용 LLM 지표 반환 (첫 호출 시 생성)"""
+    global _llm_metrics
+    if _llm_metrics is None:
+        _llm_metrics = LLMMetrics()
+    return _llm_metrics
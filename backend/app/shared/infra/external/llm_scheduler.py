@@ -0,0 +1,193 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 클래스 (앞쪽일수록 빈 슬롯을 먼저 받음)
+PRIORITY_INTERACTIVE = "interactive"  # 사용자가 응답을 기다리는 대화형 호출 (모의 면접 답변 등)
+PRIORITY_STANDARD = "standard"        # 단일 분석 호출 (기본값)
+PRIORITY_BATCH = "batch"              # 여러 호출을 한꺼번에 보내는 무거운 분석 (CV 점수, 비교 분석, 팟캐스트)
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_STANDARD, PRIORITY_BATCH)
+
+# 전체 동시 호출 수와 클래스별 상한
+# standard와 batch 상한의 합을 전체보다 작게 두어 대화형 호출이 항상 바로 쓸 수 있는 슬롯을 남김
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+CLASS_CONCURRENCY = {
+    PRIORITY_INTERACTIVE: int(os.getenv("LLM_INTERACTIVE_CONCURRENCY", str(MAX_CONCURRENCY))),
+    PRIORITY_STANDARD: int(os.getenv("LLM_STANDARD_CONCURRENCY", "8")),
+    PRIORITY_BATCH: int(os.getenv("LLM_BATCH_CONCURRENCY", "6")),
+}
+# 이 시간(초) 이상 대기한 호출은 경고 로그
+SLOW_QUEUE_WARNING = float(os.getenv("LLM_QUEUE_WARNING_SECONDS", "5"))
+
+_current_priority: ContextVar[str] = ContextVar("llm_priority", default=PRIORITY_STANDARD)
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """블록 안에서 보내는 LLM 호출의 우선순위 클래스 지정
+
+    asyncio 태스크는 생성 시점의 컨텍스트를 복사하므로 블록 안에서 gather한 호출에도 적용됩니다.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"알 수 없는 우선순위: {priority}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> str:
+    return _current_priority.get()
+
+
+class _ClassStats:
+    """우선순위 클래스별 대기 시간 통계"""
+
+    def __init__(self):
+        self.admitted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits: Deque[float] = deque(maxlen=1000)
+
+    def record(self, wait: float) -> None:
+        self.admitted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.recent_waits.append(wait)
+
+    def percentile(self, ratio: float) -> float:
+        if not self.recent_waits:
+            return 0.0
+        waits = sorted(self.recent_waits)
+        return waits[min(len(waits) - 1, int(len(waits) * ratio))]
+
+
+class LLMScheduler:
+    """프로세스 공용 LLM 호출 스케줄러
+
+    전체 동시 호출 수와 우선순위 클래스별 동시 호출 수를 제한합니다.
+    슬롯이 비면 대기 중인 호출 중 우선순위가 가장 높은 클래스(같은 클래스는 먼저 온 순서)부터
+    클래스 상한에 걸리지 않는 호출에 슬롯을 넘기므로, 무거운 분석이 몰려도 대화형 호출이 밀리지 않습니다.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY,
+                 class_concurrency: Optional[Dict[str, int]] = None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.class_concurrency = dict(class_concurrency or CLASS_CONCURRENCY)
+        self._stats = {priority: _ClassStats() for priority in PRIORITIES}
+        self._sequence = itertools.count()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running = {priority: 0 for priority in PRIORITIES}
+        # (클래스 순위, 도착 순서, 클래스, future)
+        self._waiters: List[Tuple[int, int, str, asyncio.Future]] = []
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[str] = None):
+        """LLM 호출 슬롯 확보 (priority를 생략하면 현재 컨텍스트의 우선순위 사용)"""
+        priority = priority or current_priority()
+        if priority not in PRIORITIES:
+            raise ValueError(f"알 수 없는 우선순위: {priority}")
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 이벤트 루프가 바뀌면(예: Lambda 재시작) 이전 루프의 대기/실행 상태는 버림
+            self._reset()
+            self._loop = loop
+
+        start_time = time.monotonic()
+        if not self._waiters and self._can_admit(priority):
+            self._running[priority] += 1
+        else:
+            future = loop.create_future()
+            heapq.heappush(self._waiters, (PRIORITIES.index(priority), next(self._sequence), priority, future))
+            # 앞선 대기 호출이 클래스 상한에 걸려 있을 뿐 빈 슬롯이 있으면 바로 배정
+            self._dispatch()
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # 슬롯을 받은 직후 취소된 경우 슬롯 반환
+                    self._release(priority)
+                raise
+
+        wait = time.monotonic() - start_time
+        self._stats[priority].record(wait)
+        if wait >= SLOW_QUEUE_WARNING:
+            logger.warning(f"LLM 호출 대기 {wait:.1f}초 ({priority}, 대기 중 {len(self._waiters)}건)")
+        try:
+            yield wait
+        finally:
+            self._release(priority)
+
+    def _can_admit(self, priority: str) -> bool:
+        return (sum(self._running.values()) < self.max_concurrency
+                and self._running[priority] < self.class_concurrency.get(priority, self.max_concurrency))
+
+    def _release(self, priority: str) -> None:
+        self._running[priority] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """빈 슬롯을 우선순위가 높은 대기 호출부터 배정 (클래스 상한에 걸린 클래스는 건너뜀)"""
+        skipped = []
+        while self._waiters and sum(self._running.values()) < self.max_concurrency:
+            entry = heapq.heappop(self._waiters)
+            priority, future = entry[2], entry[3]
+            if future.done():  # 대기 중 취소된 호출
+                continue
+            if not self._can_admit(priority):
+                skipped.append(entry)
+                continue
+            self._running[priority] += 1
+            future.set_result(None)
+        for entry in skipped:
+            heapq.heappush(self._waiters, entry)
+
+    def stats(self) -> Dict[str, Any]:
+        """클래스별 실행/대기 수와 대기 시간 통계 (초)"""
+        queued = {priority: 0 for priority in PRIORITIES}
+        for _, _, priority, future in self._waiters:
+            if not future.done():
+                queued[priority] += 1
+        return {
+            "max_concurrency": self.max_concurrency,
+            "classes": {
+                priority: {
+                    "concurrency_limit": self.class_concurrency.get(priority, self.max_concurrency),
+                    "running": self._running[priority],
+                    "queued": queued[priority],
+                    "admitted": stats.admitted,
+                    "avg_wait": stats.total_wait / stats.admitted if stats.admitted else 0.0,
+                    "p50_wait": stats.percentile(0.5),
+                    "p95_wait": stats.percentile(0.95),
+                    "max_wait": stats.max_wait
+                }
+                for priority, stats in self._stats.items()
+            }
+        }
+
+
+_llm_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """프로세스 공용 LLM 스케줄러 반환 (첫 호출 시 생성)"""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        _llm_scheduler = LLMScheduler()
+    return _llm_scheduler
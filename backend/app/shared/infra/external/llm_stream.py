@@ -0,0 +1,54 @@
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 스트리밍 이벤트는 {"event": 이름, "data": 내용} 딕셔너리로 표현
+#   stage          비 LLM 단계 진행 (검색 등)
+#   section_start  LLM 섹션 시작
+#   token          섹션의 토큰 조각 (생성되는 즉시)
+#   section_error  섹션 실패 (대체 문구 사용)
+#   section_end    섹션 완료
+#   result         최종 결과 (API 계층에서 응답 모델로 변환)
+StreamEvent = Dict[str, Any]
+
+
+def stream_event(event: str, data: Any = None, **fields) -> StreamEvent:
+    """스트리밍 이벤트 생성 (data가 없으면 키워드 인자를 내용으로 사용)"""
+    return {"event": event, "data": data if data is not None else fields}
+
+
+class StreamedSection:
+    """스트리밍 LLM 섹션
+
+    프롬프트 하나의 응답을 토큰 이벤트로 내보내면서 전체 텍스트를 모읍니다.
+    fallback이 있으면 호출 실패 시 예외 대신 대체 문구를 결과로 사용합니다 (비스트리밍 경로와 동일).
+    """
+
+    def __init__(self, name: str, prompt: str, fallback: Optional[str] = None, **call_kwargs):
+        self.name = name
+        self.prompt = prompt
+        self.fallback = fallback
+        # 호출 지표의 호출부 이름 (지정하지 않으면 섹션 이름)
+        call_kwargs.setdefault("call_site", f"stream.{name}")
+        self.call_kwargs = call_kwargs
+        self.text = ""
+        self.failed = False
+
+    async def stream(self, openai_client) -> AsyncIterator[StreamEvent]:
+        """섹션 이벤트 스트림 (완료 후 self.text에 전체 응답 저장)"""
+        yield stream_event("section_start", section=self.name)
+        chunks = []
+        try:
+            async for token in openai_client.stream_chat_completion(self.prompt, **self.call_kwargs):
+                chunks.append(token)
+                yield stream_event("token", section=self.name, text=token)
+            self.text = "".join(chunks)
+        except Exception as e:
+            logger.error(f"{self.name} 섹션 스트리밍 실패: {e}")
+            if self.fallback is None:
+                raise
+            self.failed = True
+            self.text = self.fallback
+            yield stream_event("section_error", section=self.name, message=self.fallback)
+        yield stream_event("section_end", section=self.name, length=len(self.text))
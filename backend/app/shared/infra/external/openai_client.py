@@ -1,8 +1,21 @@
+import asyncio
+import json
 import os
-import aiohttp
 import logging
-from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Any, Optional
+import aiohttp
 from dotenv import load_dotenv
+from app.shared.infra.cache.embedding_cache import get_embedding_cache
+from app.shared.infra.cache.llm_response_cache import get_llm_response_cache, make_response_key
+from app.shared.infra.external.embedding_batcher import get_embedding_batcher
+from app.shared.infra.external.http_session import get_http_session
+from app.shared.infra.external.llm_metrics import LLMCallRecord, track_llm_call
+from app.shared.infra.external.llm_scheduler import current_priority, get_llm_scheduler
+from app.shared.infra.external.prompt_budget import PromptBlock, PromptBudget, count_tokens
+from app.shared.infra.external.rate_limiter import (
+    MAX_RETRIES, RETRYABLE_STATUSES, get_rate_limiter, parse_retry_after, retry_delay
+)
 
 load_dotenv()
 
@@ -11,6 +24,18 @@ logger = logging.getLogger(__name__)
 class OpenAIClient:
     """OpenAI API 클라이언트"""
     
+    DEFAULT_SYSTEM_PROMPT = "당신은 AI/ML 분야의 전문 연구자입니다."
+    DEFAULT_MAX_TOKENS = 2000
+    DEFAULT_TEMPERATURE = 0.7
+    
+    # LLM 응답 캐시 사용 여부 (호출부에서 cache_ttl을 지정한 경우에만 적용)
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    # 호출부별 캐시 유지 시간(초): 논문 내용은 바뀌지 않으므로 길게, 논문 묶음 요약은 하루
+    PAPER_CACHE_TTL = 7 * 24 * 3600
+    TREND_CACHE_TTL = 24 * 3600
+    # 트렌드 분석 프롬프트의 초록 목록 토큰 예산 (넘으면 초록을 고르게 줄임)
+    TREND_PROMPT_BUDGET = 8000
+    
     def __init__(self, api_key: Optional[str] = None):
         # 클라이언트에서 제공한 API key를 우선 사용, 없으면 환경변수 사용
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
@@ -22,39 +47,48 @@ class OpenAIClient:
             raise ValueError("API Key가 제공되지 않았습니다. 클라이언트에서 API Key를 전송하거나 OPENAI_API_KEY 환경변수를 설정해주세요.")
     
     async def generate_embedding(self, text: str) -> List[float]:
-        """텍스트 임베딩 생성"""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        """텍스트 임베딩 생성 (동일 텍스트는 임베딩 캐시에서 반환)"""
+        embedding_cache = get_embedding_cache()
+        cached_embedding = await embedding_cache.get(self.embedding_model, text)
+        if cached_embedding is not None:
+            logger.info("임베딩 캐시 적중")
+            return cached_embedding
         
+        # 동시 요청과 함께 배치로 전송
+        embedding = await get_embedding_batcher().embed(
+            self.api_key, self.embedding_model, text, self._request_embeddings
+        )
+        await embedding_cache.set(self.embedding_model, text, embedding)
+        return embedding
+    
+    async def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """임베딩 API 호출 (여러 입력을 한 번에 전송, 입력 순서대로 반환)"""
         data = {
-            "input": text,
+            "input": texts,
             "model": self.embedding_model
         }
         
-        connector = aiohttp.TCPConnector(ssl=False)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.post(
-                f"{self.base_url}/embeddings",
-                headers=headers,
-                json=data
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result["data"][0]["embedding"]
-                else:
-                    error_text = await response.text()
-                    logger.error(f"OpenAI API 오류: {response.status} - {error_text}")
-                    raise Exception(f"API 오류: {response.status}")
+        estimated_tokens = sum(count_tokens(text, self.embedding_model) for text in texts)
+        # 배치 전송 태스크에서 호출되므로 호출부는 고정 이름으로 기록
+        with track_llm_call("OpenAIClient.generate_embedding", self.embedding_model, kind="embedding") as record:
+            async with self._post("/embeddings", data, estimated_tokens, record) as response:
+                result = await response.json()
+            record.apply_usage(result.get("usage"))
+        items = sorted(result["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in items]
     
-    async def analyze_trends(self, abstracts: List[str], field: str, keywords: List[str]) -> str:
-        """트렌드 분석"""
-        prompt = f"""
+    def build_trend_prompt(self, abstracts: List[str], field: str, keywords: List[str]) -> str:
+        """트렌드 분석 프롬프트"""
+        budget = PromptBudget("trend.analyze_trends", self.TREND_PROMPT_BUDGET, self.model_name)
+        abstracts_text = budget.fit(abstracts=PromptBlock(
+            items=[f"{i+1}. {abstract}" for i, abstract in enumerate(abstracts[:20])],
+            separator=chr(10)
+        ))['abstracts']
+        return budget.finish(f"""
         다음은 {field} 분야의 논문 초록들입니다. 키워드: {', '.join(keywords)}
         
         논문 초록들:
-        {chr(10).join([f"{i+1}. {abstract}" for i, abstract in enumerate(abstracts[:20])])}
+        {abstracts_text}
         
         이 논문들을 분석하여 다음을 포함한 트렌드 요약을 작성해주세요:
         1. 주요 연구 동향
@@ -63,9 +97,14 @@ class OpenAIClient:
         4. 향후 전망
         
         한국어로 작성해주세요.
-        """
+        """)
+    
+    async def analyze_trends(self, abstracts: List[str], field: str, keywords: List[str]) -> str:
+        """트렌드 분석"""
+        prompt = self.build_trend_prompt(abstracts, field, keywords)
         
-        return await self._call_chat_completion(prompt)
+        # 같은 초록 묶음의 트렌드 요약은 하루 동안 재사용
+        return await self._call_chat_completion(prompt, cache_ttl=self.TREND_CACHE_TTL, cache_nondeterministic=True)
     
 
     
@@ -86,7 +125,7 @@ class OpenAIClient:
         각 항목을 명확히 구분하여 한국어로 작성해주세요.
         """
         
-        result = await self._call_chat_completion(prompt)
+        result = await self._call_chat_completion(prompt, cache_ttl=self.PAPER_CACHE_TTL, cache_nondeterministic=True)
         
         # 결과를 섹션별로 분리
         sections = result.split('\n\n')
@@ -98,37 +137,213 @@ class OpenAIClient:
             'research_significance': sections[4] if len(sections) > 4 else ''
         }
     
-    async def _call_chat_completion(self, prompt: str) -> str:
-        """ChatGPT API 호출"""
-        headers = {
+    async def _call_chat_completion(self, prompt: str, cache_ttl: Optional[float] = None,
+                                    cache_nondeterministic: bool = False,
+                                    system_prompt: Optional[str] = None,
+                                    max_tokens: Optional[int] = None,
+                                    temperature: Optional[float] = None,
+                                    response_format: Optional[Dict[str, Any]] = None,
+                                    priority: Optional[str] = None,
+                                    call_site: Optional[str] = None,
+                                    request_timeout: Optional[float] = None) -> str:
+        """ChatGPT API 호출
+        
+        cache_ttl(초)을 지정한 호출만 응답 캐시를 사용합니다 (모델, 시스템 프롬프트, 프롬프트,
+        temperature, max_tokens, 응답 형식이 모두 같은 요청). temperature가 0이 아니면 응답이 매번 달라질 수 있으므로
+        호출부가 cache_nondeterministic=True로 재사용을 허용한 경우에만 캐시합니다.
+        캐시에 없는 호출은 프로세스 공용 스케줄러에서 슬롯을 받은 뒤 전송합니다
+        (priority를 생략하면 llm_priority로 지정한 컨텍스트의 우선순위, 기본은 standard).
+        호출마다 호출부(call_site, 생략하면 호출한 함수 이름), 토큰 수, 시간, 대기 시간, 재시도 수를 기록합니다.
+        request_timeout(초)은 HTTP 요청에만 적용되며 슬롯 대기와 한도/재시도 대기는 포함하지 않습니다
+        (초과하면 재시도 없이 asyncio.TimeoutError 발생).
+        """
+        data = self._chat_request_data(prompt, system_prompt, max_tokens, temperature, response_format)
+        cache_key = self._response_cache_key(data, cache_ttl, cache_nondeterministic)
+        priority = priority or current_priority()
+        with track_llm_call(call_site, data["model"], priority=priority) as record:
+            if cache_key:
+                cached_response = await get_llm_response_cache().get(cache_key)
+                if cached_response is not None:
+                    logger.info("LLM 응답 캐시 적중")
+                    record.cached = True
+                    return cached_response
+            
+            async with get_llm_scheduler().slot(priority) as queue_time:
+                record.queue_time = queue_time
+                async with self._post("/chat/completions", data, self._estimate_request_tokens(data), record,
+                                      request_timeout=request_timeout) as response:
+                    result = await response.json()
+            record.apply_usage(result.get("usage"))
+        
+        content = result["choices"][0]["message"]["content"]
+        # 길이 제한으로 잘린 응답은 캐시하지 않음
+        if cache_key and result["choices"][0].get("finish_reason") != "length":
+            await get_llm_response_cache().set(cache_key, content, cache_ttl)
+        return content
+    
+    async def chat_completion_json(self, prompt: str, schema_name: str, schema: Dict[str, Any],
+                                   **call_kwargs) -> Dict[str, Any]:
+        """구조화 출력(JSON 스키마) ChatGPT API 호출
+        
+        strict 모드로 스키마를 지정하므로 모델은 스키마에 맞는 JSON 객체만 반환합니다.
+        응답이 JSON 객체가 아니면 ValueError를 발생시킵니다 (값 범위 검증은 호출부에서 수행).
+        """
+        response_format = {
+            "type": "json_schema",
+            "json_schema": {"name": schema_name, "strict": True, "schema": schema}
+        }
+        content = await self._call_chat_completion(prompt, response_format=response_format, **call_kwargs)
+        try:
+            result = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON 응답 파싱 실패: {e}")
+        if not isinstance(result, dict):
+            raise ValueError("JSON 응답이 객체가 아닙니다.")
+        return result
+    
+    async def stream_chat_completion(self, prompt: str, cache_ttl: Optional[float] = None,
+                                     cache_nondeterministic: bool = False,
+                                     system_prompt: Optional[str] = None,
+                                     max_tokens: Optional[int] = None,
+                                     temperature: Optional[float] = None,
+                                     priority: Optional[str] = None,
+                                     call_site: Optional[str] = None) -> AsyncIterator[str]:
+        """ChatGPT API 스트리밍 호출 (stream: true, 생성되는 토큰 조각을 순서대로 반환)
+        
+        캐시와 스케줄러 규칙은 _call_chat_completion과 같으며, 캐시에 있으면 전체 응답을 한 조각으로 반환합니다.
+        스케줄러 슬롯은 스트림이 끝날 때까지 유지합니다.
+        """
+        data = self._chat_request_data(prompt, system_prompt, max_tokens, temperature)
+        cache_key = self._response_cache_key(data, cache_ttl, cache_nondeterministic)
+        priority = priority or current_priority()
+        with track_llm_call(call_site, data["model"], kind="stream", priority=priority) as record:
+            if cache_key:
+                cached_response = await get_llm_response_cache().get(cache_key)
+                if cached_response is not None:
+                    logger.info("LLM 응답 캐시 적중")
+                    record.cached = True
+                    yield cached_response
+                    return
+            
+            data["stream"] = True
+            # 마지막 조각에 usage를 포함하도록 요청
+            data["stream_options"] = {"include_usage": True}
+            chunks = []
+            finish_reason = None
+            # 재시도는 응답을 받기 시작하기 전까지만 (토큰을 내보낸 뒤에는 재시도하지 않음)
+            async with get_llm_scheduler().slot(priority) as queue_time:
+                record.queue_time = queue_time
+                async with self._post("/chat/completions", data, self._estimate_request_tokens(data), record) as response:
+                    # SSE 형식: 한 줄에 "data: {json}" 하나, 마지막은 "data: [DONE]"
+                    async for raw_line in response.content:
+                        line = raw_line.decode("utf-8").strip()
+                        if not line.startswith("data:"):
+                            continue
+                        payload = line[len("data:"):].strip()
+                        if payload == "[DONE]":
+                            break
+                        chunk = json.loads(payload)
+                        record.apply_usage(chunk.get("usage"))
+                        choices = chunk.get("choices") or []
+                        if not choices:
+                            continue
+                        finish_reason = choices[0].get("finish_reason") or finish_reason
+                        token = (choices[0].get("delta") or {}).get("content")
+                        if token:
+                            chunks.append(token)
+                            yield token
+        
+        if cache_key and finish_reason != "length":
+            await get_llm_response_cache().set(cache_key, "".join(chunks), cache_ttl)
+    
+    @asynccontextmanager
+    async def _post(self, path: str, data: Dict[str, Any], estimated_tokens: int,
+                    record: Optional[LLMCallRecord] = None, request_timeout: Optional[float] = None):
+        """API POST 요청 (성공 응답을 반환하는 컨텍스트 매니저)
+        
+        API Key와 모델별 제한기에서 요청/토큰 한도를 예약한 뒤 전송하며, 429/5xx와 연결 오류는
+        지터를 더한 지수 백오프로 재시도합니다 (retry-after 헤더가 있으면 그 이상 대기).
+        429를 받으면 같은 키의 다른 호출도 대기 시간 동안 멈춥니다.
+        할당량 소진(insufficient_quota)이나 그 밖의 오류는 재시도하지 않습니다.
+        record를 넘기면 재시도 횟수를 기록합니다.
+        request_timeout(초)을 지정하면 각 요청(응답 본문 읽기 포함)에 적용하며, 초과하면 재시도하지 않습니다.
+        """
+        limiter = get_rate_limiter(self.api_key, data["model"])
+        session = await get_http_session()
+        timeout_kwargs = {"timeout": aiohttp.ClientTimeout(total=request_timeout)} if request_timeout else {}
+        for attempt in range(MAX_RETRIES + 1):
+            await limiter.acquire(estimated_tokens)
+            status, retry_after, yielded = None, None, False
+            try:
+                async with session.post(
+                    f"{self.base_url}{path}",
+                    headers=self._headers(),
+                    json=data,
+                    **timeout_kwargs
+                ) as response:
+                    limiter.update_from_headers(response.headers)
+                    if response.status == 200:
+                        yielded = True
+                        yield response
+                        return
+                    
+                    status = response.status
+                    error_text = await response.text()
+                    retry_after = parse_retry_after(response.headers)
+                    retryable = status in RETRYABLE_STATUSES and "insufficient_quota" not in error_text
+                    if not retryable or attempt == MAX_RETRIES:
+                        logger.error(f"OpenAI API 오류: {status} - {error_text}")
+                        raise Exception(f"API 오류: {status}")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if yielded or attempt == MAX_RETRIES or (request_timeout and isinstance(e, asyncio.TimeoutError)):
+                    raise
+                logger.warning(f"OpenAI API 연결 오류: {e}")
+            
+            if record is not None:
+                record.retries += 1
+            delay = retry_delay(attempt, retry_after)
+            if status == 429:
+                limiter.pause(delay)
+            logger.warning(f"OpenAI API 재시도 {attempt + 1}/{MAX_RETRIES}: {status or '연결 오류'}, {delay:.2f}초 후")
+            await asyncio.sleep(delay)
+    
+    def _estimate_request_tokens(self, data: Dict[str, Any]) -> int:
+        """채팅 요청의 한도 예약용 토큰 수 (입력 토큰 수 + max_tokens, 한도 계산 방식과 같음)"""
+        prompt_tokens = sum(count_tokens(message["content"], data["model"]) for message in data["messages"])
+        return prompt_tokens + data["max_tokens"]
+    
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
+    
+    def _chat_request_data(self, prompt: str, system_prompt: Optional[str], max_tokens: Optional[int],
+                           temperature: Optional[float],
+                           response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """채팅 완성 요청 본문 (지정하지 않은 값은 기본값 사용)"""
         data = {
             "model": self.model_name,
             "messages": [
-                {"role": "system", "content": "당신은 AI/ML 분야의 전문 연구자입니다."},
+                {"role": "system", "content": system_prompt if system_prompt is not None else self.DEFAULT_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
-            "max_tokens": 2000,
-            "temperature": 0.7
+            "max_tokens": max_tokens if max_tokens is not None else self.DEFAULT_MAX_TOKENS,
+            "temperature": temperature if temperature is not None else self.DEFAULT_TEMPERATURE
         }
-        
-        connector = aiohttp.TCPConnector(ssl=False)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=data
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result["choices"][0]["message"]["content"]
-                else:
-                    error_text = await response.text()
-                    logger.error(f"OpenAI API 오류: {response.status} - {error_text}")
-                    raise Exception(f"API 오류: {response.status}")
+        if response_format is not None:
+            data["response_format"] = response_format
+        return data
+    
+    def _response_cache_key(self, data: Dict[str, Any], cache_ttl: Optional[float],
+                            cache_nondeterministic: bool) -> Optional[str]:
+        """응답 캐시를 사용할 요청이면 캐시 키, 아니면 None"""
+        if not (self.LLM_CACHE_ENABLED and cache_ttl and (data["temperature"] == 0 or cache_nondeterministic)):
+            return None
+        return make_response_key(
+            data["model"], data["messages"][0]["content"], data["messages"][1]["content"],
+            data["temperature"], data["max_tokens"], data.get("response_format")
+        )
 
 # 팩토리 함수 - API key에 따라 클라이언트 인스턴스 생성
 def get_openai_client(api_key: Optional[str] = None) -> OpenAIClient:
@@ -0,0 +1,208 @@
+import logging
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken이 없으면 문자 수 기반 추정 사용
+    tiktoken = None
+
+DEFAULT_MODEL = "gpt-4o-mini"
+TRUNCATION_MARKER = " …(이하 생략)"
+# 목록 항목에 배정된 토큰이 이보다 적으면 잘라 넣지 않고 항목을 생략
+MIN_ITEM_TOKENS = 16
+
+
+@lru_cache(maxsize=8)
+def _get_encoder(model: str):
+    """모델의 tiktoken 인코더 (사용할 수 없으면 None, 결과는 캐시)
+
+    인코딩 파일은 처음 한 번 내려받으므로 네트워크가 없는 환경에서는
+    TIKTOKEN_CACHE_DIR에 미리 받아 두거나 문자 수 기반 추정을 사용합니다.
+    """
+    if tiktoken is None:
+        logger.warning("tiktoken이 설치되지 않아 문자 수 기반으로 토큰 수를 추정합니다.")
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken 인코더를 불러올 수 없어 문자 수 기반으로 추정합니다 ({model}): {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """텍스트 토큰 수 (인코더가 없으면 영문 약 4자, 한글 약 1~2자당 1토큰으로 보고 3자당 1토큰으로 추정)"""
+    if not text:
+        return 0
+    encoder = _get_encoder(model)
+    if encoder is None:
+        return len(text) // 3 + 1
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> str:
+    """max_tokens 이하로 자른 텍스트 (잘린 경우 끝에 생략 표시)"""
+    if max_tokens <= 0 or not text:
+        return ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    keep_tokens = max(1, max_tokens - count_tokens(TRUNCATION_MARKER, model))
+    encoder = _get_encoder(model)
+    if encoder is None:
+        return text[:keep_tokens * 3] + TRUNCATION_MARKER
+    return encoder.decode(encoder.encode(text, disallowed_special=())[:keep_tokens]) + TRUNCATION_MARKER
+
+
+def _water_fill(sizes: List[int], budget: int) -> List[int]:
+    """예산을 항목들에 고르게 배분 (작은 항목은 전부, 큰 항목은 같은 상한으로 잘림)"""
+    allotments = [0] * len(sizes)
+    remaining = max(0, budget)
+    pending = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    while pending:
+        share = remaining // len(pending)
+        index = pending[0]
+        if sizes[index] <= share:
+            allotments[index] = sizes[index]
+            remaining -= sizes[index]
+            pending.pop(0)
+        else:
+            for index in pending:
+                allotments[index] = share
+            break
+    return allotments
+
+
+@dataclass
+class PromptBlock:
+    """예산에 맞춰 줄일 수 있는 프롬프트 구간
+
+    priority가 높은 블록부터 예산을 배정하고, 같은 우선순위끼리는 고르게 나눕니다.
+    items를 지정하면 각 항목(예: 논문 초록)을 고르게 줄인 뒤 separator로 이어 붙이며,
+    예산이 부족해 빠진 항목 수를 끝에 표시합니다.
+    """
+    text: str = ""
+    priority: int = 0
+    items: Optional[List[str]] = None
+    separator: str = "\n\n"
+
+
+@dataclass
+class _PromptTokenStats:
+    calls: int = 0
+    total_tokens: int = 0
+    max_tokens: int = 0
+    trimmed_calls: int = 0
+    trimmed_tokens: int = 0
+
+
+_stats: Dict[str, _PromptTokenStats] = {}
+_stats_lock = threading.Lock()
+
+
+class PromptBudget:
+    """호출부별 프롬프트 토큰 예산
+
+    fit으로 가변 블록(CV 본문, 초록 목록, 이전 단계 결과 등)을 블록 예산 안으로 줄이고,
+    finish로 완성된 프롬프트의 토큰 수를 호출부 이름(label)별로 기록합니다.
+    고정 지시문은 예산에 포함하지 않으므로 블록 예산은 호출 전체 예산에서 지시문 길이를 뺀 값으로 정합니다.
+    """
+
+    def __init__(self, label: str, max_block_tokens: int, model: str = DEFAULT_MODEL):
+        self.label = label
+        self.max_block_tokens = max_block_tokens
+        self.model = model
+        self.trimmed_tokens = 0
+        self.trimmed_blocks: List[str] = []
+
+    def fit(self, **blocks: PromptBlock) -> Dict[str, str]:
+        """블록 이름 -> 예산에 맞춘 텍스트"""
+        sizes = {name: self._block_sizes(block) for name, block in blocks.items()}
+        totals = {name: sum(item_sizes) for name, item_sizes in sizes.items()}
+        if sum(totals.values()) <= self.max_block_tokens:
+            return {name: self._render(block, None) for name, block in blocks.items()}
+
+        # 우선순위가 높은 블록부터 배정, 같은 우선순위는 고르게 배분
+        allotments: Dict[str, int] = {}
+        remaining = self.max_block_tokens
+        for priority in sorted({block.priority for block in blocks.values()}, reverse=True):
+            names = [name for name, block in blocks.items() if block.priority == priority]
+            shares = _water_fill([totals[name] for name in names], remaining)
+            for name, share in zip(names, shares):
+                allotments[name] = share
+                remaining -= share
+
+        fitted = {}
+        for name, block in blocks.items():
+            if allotments[name] < totals[name]:
+                self.trimmed_blocks.append(name)
+                self.trimmed_tokens += totals[name] - allotments[name]
+                item_allotments = _water_fill(sizes[name], allotments[name])
+            else:
+                item_allotments = None
+            fitted[name] = self._render(block, item_allotments)
+        return fitted
+
+    def finish(self, prompt: str) -> str:
+        """완성된 프롬프트의 토큰 수 기록 후 프롬프트 반환"""
+        tokens = count_tokens(prompt, self.model)
+        with _stats_lock:
+            stats = _stats.setdefault(self.label, _PromptTokenStats())
+            stats.calls += 1
+            stats.total_tokens += tokens
+            stats.max_tokens = max(stats.max_tokens, tokens)
+            if self.trimmed_blocks:
+                stats.trimmed_calls += 1
+                stats.trimmed_tokens += self.trimmed_tokens
+        if self.trimmed_blocks:
+            logger.info(
+                f"프롬프트 토큰 예산 적용 ({self.label}): {tokens}토큰, "
+                f"{', '.join(self.trimmed_blocks)}에서 {self.trimmed_tokens}토큰 생략"
+            )
+        else:
+            logger.debug(f"프롬프트 토큰 ({self.label}): {tokens}토큰")
+        return prompt
+
+    def _block_sizes(self, block: PromptBlock) -> List[int]:
+        if block.items is not None:
+            return [count_tokens(item, self.model) for item in block.items]
+        return [count_tokens(block.text, self.model)]
+
+    def _render(self, block: PromptBlock, item_allotments: Optional[List[int]]) -> str:
+        if block.items is None:
+            if item_allotments is None:
+                return block.text
+            return truncate_to_tokens(block.text, item_allotments[0], self.model)
+
+        if item_allotments is None:
+            return block.separator.join(block.items)
+        items = [
+            truncate_to_tokens(item, allotment, self.model) if allotment >= MIN_ITEM_TOKENS else ""
+            for item, allotment in zip(block.items, item_allotments)
+        ]
+        kept = [item for item in items if item]
+        omitted = len(items) - len(kept)
+        if omitted:
+            kept.append(f"(외 {omitted}개 생략)")
+        return block.separator.join(kept)
+
+
+def get_prompt_token_stats() -> Dict[str, Dict[str, Any]]:
+    """호출부별 프롬프트 토큰 통계 (호출 수, 합계/평균/최대 토큰, 예산 적용 횟수와 생략 토큰)"""
+    with _stats_lock:
+        return {
+            label: {
+                "calls": stats.calls,
+                "total_tokens": stats.total_tokens,
+                "avg_tokens": stats.total_tokens / stats.calls if stats.calls else 0.0,
+                "max_tokens": stats.max_tokens,
+                "trimmed_calls": stats.trimmed_calls,
+                "trimmed_tokens": stats.trimmed_tokens
+            }
+            for label, stats in _stats.items()
+        }
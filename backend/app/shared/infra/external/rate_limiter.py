@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import time
+from typing import Dict, Mapping, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# 응답 헤더를 받기 전까지 사용할 기본 한도 (첫 응답의 x-ratelimit-* 헤더로 실제 한도에 맞춰짐)
+DEFAULT_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+DEFAULT_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+
+# 재시도 설정 (429와 5xx, 연결 오류)
+MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+RETRY_BASE_DELAY = float(os.getenv("OPENAI_RETRY_BASE_DELAY", "1.0"))  # 첫 재시도 최대 대기 (초)
+RETRY_MAX_DELAY = float(os.getenv("OPENAI_RETRY_MAX_DELAY", "60"))  # 재시도 대기 상한 (초)
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class _Bucket:
+    """분당 한도를 초 단위로 채우는 토큰 버킷"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(1, per_minute))
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60.0)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount만큼 쓸 수 있을 때까지 남은 시간 (초)"""
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60.0 / self.capacity
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def apply_headers(self, limit: Optional[float], remaining: Optional[float]) -> None:
+        """응답 헤더의 한도/잔여량 반영 (잔여량은 로컬 추정보다 작을 때만 반영)"""
+        if limit and limit > 0:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.level = min(self.level, float(remaining))
+
+
+class APIKeyRateLimiter:
+    """API Key(및 모델)별 요청 수/토큰 수 제한기
+
+    요청 전 acquire로 요청 1회와 예상 토큰 수를 예약하며, 버킷이 비어 있으면 채워질 때까지 기다립니다.
+    응답 헤더(x-ratelimit-*)로 실제 한도와 잔여량을 반영하고, 429를 받으면 pause로
+    같은 키의 모든 호출을 retry-after 동안 멈춥니다.
+    이벤트 루프 안에서 대기 없이 확인과 차감을 하므로 별도 락이 필요 없습니다.
+    """
+
+    def __init__(self, requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE):
+        self.requests = _Bucket(requests_per_minute)
+        self.tokens = _Bucket(tokens_per_minute)
+        self.blocked_until = 0.0
+
+    async def acquire(self, estimated_tokens: int = 0) -> float:
+        """요청 1회와 예상 토큰 수 예약, 대기한 시간(초) 반환"""
+        start_time = time.monotonic()
+        while True:
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            wait = max(
+                self.blocked_until - now,
+                self.requests.wait_time(1),
+                self.tokens.wait_time(estimated_tokens)
+            )
+            if wait <= 0:
+                self.requests.take(1)
+                self.tokens.take(estimated_tokens)
+                return time.monotonic() - start_time
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """x-ratelimit-limit/remaining-requests, x-ratelimit-limit/remaining-tokens 헤더 반영"""
+        self.requests.apply_headers(
+            _parse_number(headers.get("x-ratelimit-limit-requests")),
+            _parse_number(headers.get("x-ratelimit-remaining-requests"))
+        )
+        self.tokens.apply_headers(
+            _parse_number(headers.get("x-ratelimit-limit-tokens")),
+            _parse_number(headers.get("x-ratelimit-remaining-tokens"))
+        )
+
+    def pause(self, seconds: float) -> None:
+        """같은 키의 모든 호출을 seconds초 동안 멈춤"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+_limiters: Dict[Tuple[str, str], APIKeyRateLimiter] = {}
+
+
+def get_rate_limiter(api_key: str, model: str) -> APIKeyRateLimiter:
+    """API Key와 모델별 제한기 반환 (OpenAI 한도는 키와 모델 단위, 키 원문은 보관하지 않음)"""
+    key = (hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16], model)
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = _limiters[key] = APIKeyRateLimiter()
+    return limiter
+
+
+def retry_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """재시도 대기 시간 (지수 백오프 + full jitter, retry-after가 있으면 그 이상 대기)"""
+    if retry_after is not None:
+        return min(RETRY_MAX_DELAY, retry_after) + random.uniform(0, RETRY_BASE_DELAY)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """retry-after-ms 또는 retry-after(초) 헤더 값 (없거나 날짜 형식이면 None)"""
+    retry_after_ms = _parse_number(headers.get("retry-after-ms"))
+    if retry_after_ms is not None:
+        return retry_after_ms / 1000.0
+    return _parse_number(headers.get("retry-after"))
+
+
+def _parse_number(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
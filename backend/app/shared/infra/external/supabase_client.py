@@ -1,21 +1,87 @@
 import os
+import asyncio
 import logging
 import time
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from app.shared.infra.search.bm25_index import BM25Index, reciprocal_rank_fusion
+from app.shared.infra.search.embedding_index import EmbeddingIndex, SearchFilter
+from app.shared.infra.search.embedding_snapshot import load_snapshots
+from app.shared.infra.search.paper_catalogue import PaperCatalogue
+from app.shared.infra.search.paper_sampler import PaperSampler, PaperSelectionSessions
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+def _parse_timestamp(value: str) -> datetime:
+    """PostgREST 타임스탬프 문자열을 비교 가능한 datetime으로 변환"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    # timezone 없는 timestamp 컬럼은 UTC로 간주
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
 class SupabaseClient:
     """Supabase 클라이언트"""
     
+    EMBEDDING_INDEX_TTL = 300  # 임베딩 인덱스 유효 시간 (5분)
+    TEXT_INDEX_TTL = 600  # 제목/초록 BM25 색인 유효 시간 (10분)
+    HYBRID_CANDIDATES = 100  # 하이브리드 검색에서 BM25/벡터 각각 결합할 후보 수
+    # IVF 근사 검색 시 탐색할 목록 수 (클수록 재현율↑, 지연 시간↑ / IVF 인덱스가 있을 때만 적용)
+    ANN_NPROBE = int(os.getenv("EMBEDDING_ANN_NPROBE", "8"))
+    # supabase-py는 동기 클라이언트이므로 쿼리를 제한된 스레드 풀에서 실행
+    MAX_CONCURRENT_QUERIES = int(os.getenv("SUPABASE_MAX_CONCURRENT_QUERIES", "8"))
+    QUERY_TIMEOUT = float(os.getenv("SUPABASE_QUERY_TIMEOUT", "30"))  # 쿼리별 타임아웃 (초)
+    CATALOGUE_TTL = 600  # 카탈로그 집계 유효 시간 (10분)
+    # 임베딩 인덱스 증분 동기화 주기 (초, 0이면 비활성화 - papers.updated_at 컬럼 필요)
+    INDEX_SYNC_INTERVAL = float(os.getenv("EMBEDDING_SYNC_INTERVAL", "0"))
+    INDEX_SYNC_PAGE_SIZE = 500
+    # 워터마크보다 이 시간(초)만큼 앞부터 다시 조회 (워터마크가 지나간 뒤 커밋된 긴 트랜잭션의 행을 놓치지 않도록)
+    INDEX_SYNC_LOOKBACK = float(os.getenv("EMBEDDING_SYNC_LOOKBACK", "300"))
+    SAMPLER_TTL = 600  # 랜덤 샘플러 ID 목록 유효 시간 (10분)
+    # 미리보기/팟캐스트에 필요한 컬럼 (임베딩 제외)
+    PAPER_PREVIEW_COLUMNS = "id, title, abstract, authors, conference, year, field, url"
+    
     def __init__(self):
         self.supabase_url = os.getenv("SUPABASE_URL")
         self.supabase_key = os.getenv("SUPABASE_KEY")
         
+        # 분야별 임베딩 인덱스 (메모리 캐시)
+        self._embedding_indexes: Dict[str, EmbeddingIndex] = {}
+        self._embedding_index_locks: Dict[str, asyncio.Lock] = {}
+        
+        # 증분 동기화를 쓰지 않을 때 스냅샷 인덱스의 변경분 반영 작업 (분야별)
+        self._snapshot_refresh_tasks: Dict[str, asyncio.Task] = {}
+        
+        # 분야별 제목/초록 BM25 색인 (메모리 캐시)
+        self._text_indexes: Dict[str, BM25Index] = {}
+        self._text_index_locks: Dict[str, asyncio.Lock] = {}
+        
+        # 증분 동기화 상태 (sync_lag_seconds = 마지막 성공 동기화 시작 후 경과 시간)
+        self._sync_task: Optional[asyncio.Task] = None
+        self._sync_stats: Dict[str, Any] = {
+            "last_success_at": None, "last_duration": None, "last_error": None,
+            "syncs": 0, "rows_applied": 0,
+        }
+        
+        # (분야, 학회, 연도)별 논문 수 집계 (메모리 캐시)
+        self._paper_catalogue: Optional[PaperCatalogue] = None
+        self._catalogue_lock = asyncio.Lock()
+        
+        # (분야, 학회)별 논문 ID 배열 (랜덤 선택용)과 세션별 재선택 순서
+        self._paper_sampler: Optional[PaperSampler] = None
+        self._sampler_lock = asyncio.Lock()
+        self._selection_sessions = PaperSelectionSessions()
+        
+        # 쿼리 실행용 스레드 풀 (동시 실행 수 = 워커 수)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.MAX_CONCURRENT_QUERIES,
+            thread_name_prefix="supabase"
+        )
+        
         # 개발 단계에서는 Supabase 연결을 옵셔널로 처리
         self.client = None
         if self.supabase_url and self.supabase_key and self.supabase_url != "placeholder":
@@ -28,13 +94,34 @@ class SupabaseClient:
         else:
             print("⚠️  Supabase 환경변수 미설정 - 일부 기능 제한")
     
-    async def get_papers_by_field(self, field: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """분야별 논문 조회"""
+    async def run_query(self, query, timeout: float = None):
+        """PostgREST 쿼리를 스레드 풀에서 실행하여 이벤트 루프를 막지 않도록 함
+        
+        동시 실행 수는 스레드 풀 크기로 제한되며, 타임아웃 초과 시 asyncio.TimeoutError가 발생합니다.
+        (이미 시작된 쿼리는 스레드에서 끝까지 실행되고 결과만 버려집니다.)
+        """
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(self._executor, query.execute),
+            timeout=timeout or self.QUERY_TIMEOUT
+        )
+    
+    async def get_papers_by_field(self, field: str, limit: int = 100,
+                                  filters: Optional[SearchFilter] = None) -> List[Dict[str, Any]]:
+        """분야별 논문 조회 (filters의 학회/연도 조건은 쿼리 조건으로 적용)"""
         if not self.client:
             return []
         try:
-            logger.info(f"분야별 논문 조회 시작: {field}, limit: {limit}")
-            result = self.client.table("papers").select("*").eq("field", field).limit(limit).execute()
+            logger.info(f"분야별 논문 조회 시작: {field}, limit: {limit}, 필터: {filters}")
+            query = self.client.table("papers").select("*").eq("field", field)
+            if filters is not None:
+                if filters.conferences:
+                    query = query.in_("conference", list(filters.conferences))
+                if filters.year_from is not None:
+                    query = query.gte("year", filters.year_from)
+                if filters.year_to is not None:
+                    query = query.lte("year", filters.year_to)
+            result = await self.run_query(query.limit(limit))
             logger.info(f"분야별 논문 조회 결과: {len(result.data)}개 논문 발견")
             return result.data
         except Exception as e:
@@ -43,104 +130,407 @@ class SupabaseClient:
     
     async def search_papers_by_vector(self, query_embedding: List[float], 
                                     field: str = None, limit: int = 10, 
-                                    threshold: float = 0.7) -> List[Dict[str, Any]]:
-        """벡터 유사도 검색"""
+                                    threshold: float = 0.7,
+                                    nprobe: Optional[int] = None,
+                                    filters: Optional[SearchFilter] = None) -> List[Dict[str, Any]]:
+        """벡터 유사도 검색 (분야별 임베딩 인덱스 사용)"""
+        if not self.client:
+            return []
         try:
-            # 임베딩이 있는 논문만 필터링 (페이지네이션 적용)
-            query = self.client.table("papers").select("*").not_.is_("combined_embedding", "null")
-            
-            if field:
-                query = query.eq("field", field)
-            
-            # 페이지네이션으로 데이터 가져오기
-            page_size = 50  # 한 번에 가져올 데이터 수 제한
-            all_papers = []
-            page = 0
-            
-            while True:
-                try:
-                    result = query.range(page * page_size, (page + 1) * page_size - 1).execute()
-                    papers = result.data
-                    
-                    if not papers:
-                        break
-                    
-                    all_papers.extend(papers)
-                    
-                    # 충분한 데이터를 가져왔거나 타임아웃 방지를 위해 중단
-                    if len(all_papers) >= 200:  # 최대 200개 논문까지만 처리
-                        break
-                    
-                    page += 1
-                    
-                except Exception as e:
-                    logger.warning(f"페이지 {page} 로드 실패: {e}")
-                    break
-            
-            # 유사도 계산 및 필터링
-            similar_papers = []
-            logger.info(f"총 {len(all_papers)}개 논문에서 유사도 계산 시작")
-            
-            for i, paper in enumerate(all_papers):
-                embedding = paper.get('combined_embedding')
-                if embedding:
-                    try:
-                        # 임베딩 데이터 검증
-                        if isinstance(embedding, str):
-                            import json
-                            embedding = json.loads(embedding)
-                        
-                        if not isinstance(embedding, list) or len(embedding) == 0:
-                            logger.warning(f"논문 {paper.get('id')}: 유효하지 않은 임베딩 형식")
-                            continue
-                        
-                        similarity = self._calculate_cosine_similarity(
-                            query_embedding, embedding
-                        )
-                        
-                        if similarity >= threshold:
-                            paper['similarity_score'] = similarity
-                            similar_papers.append(paper)
-                            logger.info(f"유사한 논문 발견: ID {paper.get('id')}, 유사도: {similarity:.3f}")
-                        
-                    except Exception as e:
-                        logger.warning(f"유사도 계산 실패 (논문 ID: {paper.get('id', 'unknown')}): {e}")
-                        continue
+            index = await self.get_embedding_index(field)
+            hits = index.search(query_embedding, limit=limit, threshold=threshold,
+                                nprobe=self._resolve_nprobe(nprobe), filters=filters)
+            logger.info(f"유사도 계산 완료: 총 {index.size}개 논문 중 {len(hits)}개 논문 발견 (임계값: {threshold})")
             
-            logger.info(f"유사도 계산 완료: {len(similar_papers)}개 논문 발견 (임계값: {threshold})")
-            
-            # 유사도 순으로 정렬
-            similar_papers.sort(key=lambda x: x['similarity_score'], reverse=True)
-            return similar_papers[:limit]
+            return await self._get_papers_with_scores(hits)
             
         except Exception as e:
             logger.error(f"벡터 검색 실패: {e}")
             # 에러 발생 시 빈 리스트 반환
             return []
     
-    async def get_random_paper(self, field: str = None) -> Optional[Dict[str, Any]]:
-        """랜덤 논문 조회"""
+    async def get_embedding_index(self, field: str = None) -> EmbeddingIndex:
+        """분야별 임베딩 인덱스 조회 (없거나 만료된 경우 새로 생성)"""
+        key = field or ""
+        index = self._embedding_indexes.get(key)
+        if index is not None and not self._embedding_index_expired(index):
+            self._refresh_snapshot_index_if_stale(key, index)
+            return index
+        
+        # 동시 요청이 같은 분야를 중복 로드하지 않도록 분야별 잠금 사용
+        lock = self._embedding_index_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            index = self._embedding_indexes.get(key)
+            if index is not None and not self._embedding_index_expired(index):
+                return index
+            return await self._build_embedding_index(field)
+    
+    async def _build_embedding_index(self, field: str = None) -> EmbeddingIndex:
+        """Supabase에서 전체 행을 읽어 인덱스를 새로 만들고 캐시에 등록"""
+        start_time = time.time()
+        rows = await self._load_embedding_rows(field)
+        # 임베딩 파싱/정규화는 CPU 작업이므로 이벤트 루프 밖에서 수행
+        index = await asyncio.to_thread(EmbeddingIndex.from_rows, rows)
+        index.watermark = self.rows_watermark(rows)
+        if index.watermark is not None:
+            # 전체 로드에 이미 포함된 재조회 구간의 행은 첫 동기화에서 다시 반영하지 않음
+            window = _parse_timestamp(index.watermark[0]) - timedelta(seconds=self.INDEX_SYNC_LOOKBACK)
+            index.recent_updates = {row['id']: row['updated_at'] for row in rows
+                                    if row.get('updated_at') and _parse_timestamp(row['updated_at']) > window}
+        self._embedding_indexes[field or ""] = index
+        logger.info(f"임베딩 인덱스 생성 완료: {field or '전체'} 분야 {index.size}개 논문 ({time.time() - start_time:.2f}초)")
+        return index
+    
+    def _embedding_index_expired(self, index: EmbeddingIndex) -> bool:
+        """다시 로드해야 하는지 여부
+        
+        증분 동기화 중에는 워터마크가 있는 인덱스를 다시 로드하지 않으며, 스냅샷 인덱스는
+        전체를 다시 로드하지 않고 _refresh_snapshot_index_if_stale에서 변경분만 반영합니다.
+        """
+        if self.INDEX_SYNC_INTERVAL > 0 and index.watermark is not None:
+            return False
+        if index.snapshot_path is not None:
+            return False
+        return index.is_expired(self.EMBEDDING_INDEX_TTL)
+    
+    def _refresh_snapshot_index_if_stale(self, key: str, index: EmbeddingIndex):
+        """증분 동기화를 쓰지 않을 때 EMBEDDING_INDEX_TTL이 지난 스냅샷 인덱스의 변경분 반영을 백그라운드로 시작"""
+        if (self.INDEX_SYNC_INTERVAL > 0 or index.snapshot_path is None or not self.client
+                or not index.is_expired(self.EMBEDDING_INDEX_TTL)):
+            return
+        task = self._snapshot_refresh_tasks.get(key)
+        if task is None or task.done():
+            self._snapshot_refresh_tasks[key] = asyncio.get_running_loop().create_task(
+                self._refresh_snapshot_index(key)
+            )
+    
+    async def _refresh_snapshot_index(self, key: str):
+        """스냅샷 인덱스에 워터마크 이후 변경분 반영 (실패하면 Supabase에서 전체 재로드)"""
         try:
-            query = self.client.table("papers").select("*")
+            applied = await self.sync_embedding_indexes(keys=[key])
+            logger.info(f"스냅샷 인덱스 변경분 반영: {key or '전체'} 분야 {applied}개 행")
+        except Exception as e:
+            logger.warning(f"스냅샷 인덱스 변경분 반영 실패, Supabase에서 다시 로드합니다 ({key or '전체'}): {e}")
+            try:
+                async with self._embedding_index_locks.setdefault(key, asyncio.Lock()):
+                    await self._build_embedding_index(key or None)
+            except Exception as e:
+                logger.error(f"임베딩 인덱스 재로드 실패 ({key or '전체'}): {e}")
+        finally:
+            # 성공/실패와 관계없이 다음 확인은 TTL 이후
+            index = self._embedding_indexes.get(key)
+            if index is not None:
+                index.built_at = time.time()
+    
+    @staticmethod
+    def rows_watermark(rows: List[Dict[str, Any]]) -> Optional[Tuple[str, int]]:
+        """행 목록의 최대 (updated_at, id) (updated_at이 없으면 None)"""
+        stamped = [row for row in rows if row.get('updated_at')]
+        if not stamped:
+            return None
+        latest = max(stamped, key=lambda row: (_parse_timestamp(row['updated_at']), row['id']))
+        return latest['updated_at'], latest['id']
+    
+    def start_index_sync(self) -> bool:
+        """임베딩 인덱스 증분 동기화 백그라운드 작업 시작 (EMBEDDING_SYNC_INTERVAL 설정 시)"""
+        if self.INDEX_SYNC_INTERVAL <= 0 or not self.client:
+            return False
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.get_running_loop().create_task(self._index_sync_loop())
+            logger.info(f"임베딩 인덱스 증분 동기화 시작 (주기: {self.INDEX_SYNC_INTERVAL}초)")
+        return True
+    
+    async def stop_index_sync(self):
+        """증분 동기화 작업 중지"""
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+    
+    async def _index_sync_loop(self):
+        while True:
+            await asyncio.sleep(self.INDEX_SYNC_INTERVAL)
+            try:
+                await self.sync_embedding_indexes()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._sync_stats["last_error"] = str(e)
+                logger.warning(f"임베딩 인덱스 증분 동기화 실패: {e}")
+    
+    async def sync_embedding_indexes(self, keys: Optional[List[str]] = None) -> int:
+        """워터마크 이후 변경된 논문을 로드된 임베딩 인덱스(keys를 지정하면 해당 분야만)에 반영하고 반영한 행 수를 반환
+        
+        변경 행은 (updated_at, id) 키셋 페이지네이션으로 조회하며, 인덱스는 새 객체로 만든 뒤
+        교체하므로 검색 요청은 기다리지 않고 기존 인덱스를 계속 사용합니다.
+        updated_at은 커밋 전에 기록되므로 워터마크보다 INDEX_SYNC_LOOKBACK초 앞부터 다시 조회하고,
+        그 구간에서 이미 반영한 (id, updated_at)은 건너뜁니다 (다시 읽힌 행은 ID 기준으로 교체).
+        하드 삭제된 행은 감지하지 못하므로 전체 재로드(스냅샷 재생성) 시 정리됩니다.
+        """
+        started_at = time.time()
+        indexes = {key: index for key, index in self._embedding_indexes.items()
+                   if index.watermark is not None and (keys is None or key in keys)}
+        if not indexes:
+            self._record_sync(started_at, 0)
+            return 0
+        
+        lookback = timedelta(seconds=self.INDEX_SYNC_LOOKBACK)
+        windows = {key: _parse_timestamp(index.watermark[0]) - lookback for key, index in indexes.items()}
+        rows = await self._load_changed_rows((min(windows.values()).isoformat(), 0))
+        if not rows:
+            self._record_sync(started_at, 0)
+            return 0
+        
+        applied = 0
+        for key, index in indexes.items():
+            watermark = (_parse_timestamp(index.watermark[0]), index.watermark[1])
+            latest = max(self.rows_watermark(rows), index.watermark,
+                         key=lambda mark: (_parse_timestamp(mark[0]), mark[1]))
+            recent_updates = {
+                paper_id: updated_at for paper_id, updated_at in index.recent_updates.items()
+                if _parse_timestamp(updated_at) > _parse_timestamp(latest[0]) - lookback
+            }
+            changed = [
+                row for row in rows
+                if _parse_timestamp(row['updated_at']) > windows[key]
+                and index.recent_updates.get(row['id']) != row['updated_at']
+            ]
+            # 이 인덱스의 분야이거나 이미 인덱스에 있는 행만 대상 (다른 분야로 옮겨진 행 포함)
+            present = set(index.paper_ids[np.isin(index.paper_ids, [row['id'] for row in changed])].tolist())
+            changed = [row for row in changed if not key or row.get('field') == key or row['id'] in present]
+            if not changed:
+                index.watermark = latest
+                index.recent_updates = recent_updates
+                continue
+            
+            # 분야가 바뀌었거나 임베딩이 지워진 행은 제거만 되도록 추가 대상에서 제외
+            upserts = [
+                row for row in changed
+                if row.get('combined_embedding') is not None and (not key or row.get('field') == key)
+            ]
+            updated = await asyncio.to_thread(index.apply_delta, upserts, [row['id'] for row in changed])
+            updated.watermark = latest
+            updated.recent_updates = recent_updates
+            updated.recent_updates.update((row['id'], row['updated_at']) for row in changed)
+            
+            async with self._embedding_index_locks.setdefault(key, asyncio.Lock()):
+                # 동기화 중 인덱스가 다시 로드되었다면 새 인덱스를 유지
+                if self._embedding_indexes.get(key) is index:
+                    self._embedding_indexes[key] = updated
+                    applied += len(changed)
+                    late = sum(1 for row in changed if (_parse_timestamp(row['updated_at']), row['id']) <= watermark)
+                    if late:
+                        logger.info(f"워터마크 이전 시각으로 늦게 커밋된 {late}개 행 반영 ({key or '전체'})")
+        
+        if applied:
+            self.invalidate_paper_catalogue()
+            self.invalidate_paper_sampler()
+            logger.info(f"임베딩 인덱스 증분 동기화: {applied}개 행 반영 ({time.time() - started_at:.2f}초)")
+        self._record_sync(started_at, applied)
+        return applied
+    
+    async def _load_changed_rows(self, since: Tuple[str, int]) -> List[Dict[str, Any]]:
+        """(updated_at, id) > since인 행을 키셋 페이지네이션으로 모두 조회"""
+        all_rows = []
+        updated_at, paper_id = since
+        while True:
+            query = (
+                self.client.table("papers")
+                .select("id, conference, year, field, combined_embedding, updated_at")
+                .or_(f'updated_at.gt."{updated_at}",and(updated_at.eq."{updated_at}",id.gt.{paper_id})')
+                .order("updated_at")
+                .order("id")
+                .limit(self.INDEX_SYNC_PAGE_SIZE)
+            )
+            rows = (await self.run_query(query)).data
+            all_rows.extend(rows)
+            if len(rows) < self.INDEX_SYNC_PAGE_SIZE:
+                return all_rows
+            updated_at, paper_id = rows[-1]['updated_at'], rows[-1]['id']
+    
+    def _record_sync(self, started_at: float, applied: int):
+        self._sync_stats.update(
+            last_success_at=started_at,
+            last_duration=time.time() - started_at,
+            last_error=None,
+            syncs=self._sync_stats["syncs"] + 1,
+            rows_applied=self._sync_stats["rows_applied"] + applied,
+        )
+    
+    def get_sync_stats(self) -> Dict[str, Any]:
+        """증분 동기화 상태 (sync_lag_seconds: 검색 결과에 반영되지 않았을 수 있는 최대 기간)"""
+        last_success_at = self._sync_stats["last_success_at"]
+        return {
+            "enabled": self.INDEX_SYNC_INTERVAL > 0,
+            "interval": self.INDEX_SYNC_INTERVAL,
+            "sync_lag_seconds": None if last_success_at is None else time.time() - last_success_at,
+            "watermarks": {key or "전체": list(index.watermark) if index.watermark else None
+                           for key, index in self._embedding_indexes.items()},
+            **self._sync_stats,
+        }
+    
+    async def get_text_index(self, field: str = None) -> BM25Index:
+        """분야별 제목/초록 BM25 색인 조회 (없거나 만료된 경우 새로 생성)"""
+        key = field or ""
+        index = self._text_indexes.get(key)
+        if index is not None and not index.is_expired(self.TEXT_INDEX_TTL):
+            return index
+        
+        lock = self._text_index_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            index = self._text_indexes.get(key)
+            if index is not None and not index.is_expired(self.TEXT_INDEX_TTL):
+                return index
+            
+            start_time = time.time()
+            
+            def build_query():
+                query = self.client.table("papers").select("id, title, abstract")
+                if field:
+                    query = query.eq("field", field)
+                return query.order("id")
+            
+            rows = await self._fetch_all_pages(build_query)
+            index = await asyncio.to_thread(BM25Index.from_rows, rows)
+            self._text_indexes[key] = index
+            logger.info(f"BM25 색인 생성 완료: {field or '전체'} 분야 {index.size}개 논문, {len(index.vocabulary)}개 단어 ({time.time() - start_time:.2f}초)")
+            return index
+    
+    async def search_papers_hybrid(self, field: str, query: str, limit: int = 10,
+                                   query_embedding: Optional[List[float]] = None,
+                                   nprobe: Optional[int] = None,
+                                   filters: Optional[SearchFilter] = None) -> List[Dict[str, Any]]:
+        """BM25(제목/초록)와 벡터 유사도 순위를 RRF로 결합한 하이브리드 검색
+        
+        query_embedding이 없으면 BM25 순위만 사용합니다.
+        filters의 학회/연도 조건은 임베딩 인덱스의 메타데이터로 판단합니다.
+        """
+        if not self.client:
+            return []
+        
+        allowed_ids = None
+        if query_embedding is not None or filters is not None:
+            embedding_index = await self.get_embedding_index(field)
+            if filters is not None:
+                allowed_ids = np.sort(embedding_index.paper_ids[embedding_index.filter_rows(filters)])
+        
+        text_index = await self.get_text_index(field)
+        rankings = [[paper_id for paper_id, _ in text_index.search(query, self.HYBRID_CANDIDATES, allowed_ids=allowed_ids)]]
+        
+        if query_embedding is not None:
+            vector_hits = embedding_index.search(query_embedding, limit=self.HYBRID_CANDIDATES,
+                                                 nprobe=self._resolve_nprobe(nprobe), filters=filters)
+            rankings.append([paper_id for paper_id, _ in vector_hits])
+        
+        hits = reciprocal_rank_fusion(rankings)[:limit]
+        papers = await self._get_papers_with_scores(hits)
+        for paper in papers:
+            paper['relevance_score'] = paper.pop('similarity_score')
+        return papers
+    
+    def _resolve_nprobe(self, nprobe: Optional[int]) -> int:
+        """요청별 nprobe가 없으면 기본값 사용 (0이면 항상 전체 검색)"""
+        return self.ANN_NPROBE if nprobe is None else nprobe
+    
+    def load_embedding_snapshots(self, snapshot_dir: str = None) -> int:
+        """임베딩 스냅샷(.npy)을 메모리 매핑으로 로드하여 인덱스 캐시에 등록"""
+        snapshot_dir = snapshot_dir or os.getenv("EMBEDDING_SNAPSHOT_DIR")
+        if not snapshot_dir:
+            return 0
+        
+        indexes = load_snapshots(snapshot_dir)
+        self._embedding_indexes.update(indexes)
+        logger.info(f"임베딩 스냅샷 {len(indexes)}개 분야 로드 완료: {snapshot_dir}")
+        if indexes and self.INDEX_SYNC_INTERVAL <= 0:
+            logger.warning(
+                f"증분 동기화(EMBEDDING_SYNC_INTERVAL)가 꺼진 상태로 스냅샷을 로드했습니다. "
+                f"스냅샷 이후 추가/변경된 논문은 {self.EMBEDDING_INDEX_TTL}초마다 변경분을 확인할 때 반영됩니다."
+            )
+        return len(indexes)
+    
+    async def _load_embedding_rows(self, field: str = None) -> List[Dict[str, Any]]:
+        """임베딩 인덱스 생성을 위해 id, 필터용 메타데이터, combined_embedding 컬럼만 전체 조회
+        
+        증분 동기화를 사용하면 워터마크 계산을 위해 updated_at도 함께 조회합니다.
+        """
+        columns = "id, conference, year, field, combined_embedding"
+        if self.INDEX_SYNC_INTERVAL > 0:
+            columns += ", updated_at"
+        
+        def build_query():
+            query = self.client.table("papers").select(columns).not_.is_("combined_embedding", "null")
             if field:
                 query = query.eq("field", field)
+            return query.order("id")
+        
+        return await self._fetch_all_pages(build_query)
+    
+    async def _fetch_all_pages(self, build_query, page_size: int = 1000) -> List[Dict[str, Any]]:
+        """페이지네이션으로 모든 행 조회 (build_query는 정렬까지 지정된 새 쿼리를 반환)"""
+        all_rows = []
+        page = 0
+        
+        while True:
+            result = await self.run_query(build_query().range(page * page_size, (page + 1) * page_size - 1))
+            rows = result.data
             
-            result = query.execute()
-            papers = result.data
+            if not rows:
+                break
             
-            if papers:
-                import random
-                return random.choice(papers)
-            return None
+            all_rows.extend(rows)
+            if len(rows) < page_size:
+                break
+            page += 1
+        
+        return all_rows
+    
+    async def _get_papers_with_scores(self, hits: List[Tuple[int, float]]) -> List[Dict[str, Any]]:
+        """(논문 ID, 유사도) 목록에 해당하는 논문을 조회하여 유사도 순으로 반환"""
+        if not hits:
+            return []
+        
+        paper_ids = [paper_id for paper_id, _ in hits]
+        result = await self.run_query(self.client.table("papers").select("*").in_("id", paper_ids))
+        papers_by_id = {paper['id']: paper for paper in result.data}
+        
+        papers = []
+        for paper_id, similarity in hits:
+            paper = papers_by_id.get(paper_id)
+            if paper is None:
+                continue
+            paper['similarity_score'] = similarity
+            papers.append(paper)
+        return papers
+    
+    async def get_random_paper(self, field: str = None) -> Optional[Dict[str, Any]]:
+        """랜덤 논문 조회 (샘플러에서 ID를 뽑아 해당 논문만 조회)"""
+        try:
+            papers = await self.get_random_papers(field, limit=1)
+            return papers[0] if papers else None
             
         except Exception as e:
             logger.error(f"랜덤 논문 조회 실패: {e}")
             raise
     
-    async def get_paper_by_id(self, paper_id: int) -> Optional[Dict[str, Any]]:
+    async def get_random_papers(self, field: str = None, limit: int = 5,
+                                conference: str = None) -> List[Dict[str, Any]]:
+        """중복 없이 랜덤 논문 최대 limit개 조회 (미리보기 컬럼만)"""
+        sampler = await self.get_paper_sampler()
+        paper_ids = sampler.sample_many(field, conference, limit)
+        if not paper_ids:
+            return []
+        
+        result = await self.run_query(self.client.table("papers").select(self.PAPER_PREVIEW_COLUMNS).in_("id", paper_ids))
+        papers_by_id = {paper['id']: paper for paper in result.data}
+        return [papers_by_id[paper_id] for paper_id in paper_ids if paper_id in papers_by_id]
+    
+    async def get_paper_by_id(self, paper_id: int, columns: str = "*") -> Optional[Dict[str, Any]]:
         """ID로 논문 조회"""
         try:
-            result = self.client.table("papers").select("*").eq("id", paper_id).execute()
+            result = await self.run_query(self.client.table("papers").select(columns).eq("id", paper_id))
             return result.data[0] if result.data else None
         except Exception as e:
             logger.error(f"논문 조회 실패: {e}")
@@ -175,7 +565,7 @@ class SupabaseClient:
                 for field in known_fields:
                     try:
                         # 해당 field를 가진 논문이 있는지 확인 (limit=1로 빠르게)
-                        result = self.client.table("papers").select("id").eq("field", field).limit(1).execute()
+                        result = await self.run_query(self.client.table("papers").select("id").eq("field", field).limit(1))
                         if result.data:
                             existing_fields.append(field)
                             logger.info(f"Field 확인됨: {field}")
@@ -199,7 +589,7 @@ class SupabaseClient:
             # SQL이 실패하면 대안 방법 사용
             try:
                 # Supabase의 내장 함수를 사용한 방법
-                result = self.client.table("papers").select("field").execute()
+                result = await self.run_query(self.client.table("papers").select("field"))
                 
                 # Python에서 고유한 값들 추출
                 all_fields = set()
@@ -226,72 +616,10 @@ class SupabaseClient:
             raise
     
     async def get_conferences_by_field(self, field: str) -> List[Dict[str, Any]]:
-        """분야별 학회 목록 조회 (논문 수 통계 포함) - 모든 데이터 가져오기"""
+        """분야별 학회 목록 조회 (논문 수 통계 포함) - 카탈로그 집계에서 조회"""
         try:
-            # 페이지네이션을 사용하여 모든 데이터 가져오기
-            all_papers = []
-            page_size = 1000  # Supabase 기본 제한
-            page = 0
-            
-            while True:
-                try:
-                    # 해당 분야의 논문들을 페이지네이션으로 가져오기
-                    result = self.client.table("papers").select("conference, year").eq("field", field).range(page * page_size, (page + 1) * page_size - 1).execute()
-                    papers = result.data
-                    
-                    if not papers:
-                        break
-                    
-                    all_papers.extend(papers)
-                    logger.info(f"{field} 분야: {page + 1}페이지 로드 완료 ({len(papers)}개 논문)")
-                    
-                    # 다음 페이지로
-                    page += 1
-                    
-                    # 안전장치: 너무 많은 페이지를 로드하지 않도록 제한
-                    if page > 50:  # 최대 50페이지 (50,000개 논문)
-                        logger.warning(f"{field} 분야: 최대 페이지 수에 도달하여 중단")
-                        break
-                        
-                except Exception as e:
-                    logger.warning(f"{field} 분야 {page + 1}페이지 로드 실패: {e}")
-                    break
-            
-            logger.info(f"{field} 분야: 총 {len(all_papers)}개 논문 로드 완료")
-            
-            # 학회별 통계 계산
-            conference_stats = {}
-            for paper in all_papers:
-                conference = paper.get('conference')
-                year = paper.get('year')
-                
-                if conference:
-                    if conference not in conference_stats:
-                        conference_stats[conference] = {
-                            'name': conference,
-                            'paper_count': 0,
-                            'latest_year': 0,
-                            'years': set()
-                        }
-                    
-                    conference_stats[conference]['paper_count'] += 1
-                    if year and year > conference_stats[conference]['latest_year']:
-                        conference_stats[conference]['latest_year'] = year
-                    if year:
-                        conference_stats[conference]['years'].add(year)
-            
-            # 결과 정리 (논문 수 내림차순 정렬)
-            conferences = []
-            for conf_name, stats in conference_stats.items():
-                conferences.append({
-                    'name': conf_name,
-                    'paper_count': stats['paper_count'],
-                    'latest_year': stats['latest_year'],
-                    'year_range': f"{min(stats['years'])}-{max(stats['years'])}" if stats['years'] else "N/A"
-                })
-            
-            # 논문 수로 정렬 (내림차순)
-            conferences.sort(key=lambda x: x['paper_count'], reverse=True)
+            catalogue = await self.get_paper_catalogue()
+            conferences = catalogue.conferences(field)
             
             logger.info(f"{field} 분야에서 {len(conferences)}개 학회 발견")
             return conferences
@@ -300,121 +628,136 @@ class SupabaseClient:
             logger.error(f"분야별 학회 목록 조회 실패: {e}")
             raise
     
-    async def get_random_paper_by_field_and_conference(self, field: str, conference: str) -> Optional[Dict[str, Any]]:
-        """분야와 학회 조건에 맞는 랜덤 논문 조회 (최적화된 버전)"""
+    async def get_random_paper_by_field_and_conference(self, field: str, conference: str,
+                                                       session_id: str = None,
+                                                       exclude_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """분야와 학회 조건에 맞는 랜덤 논문 조회
+        
+        session_id가 있으면 세션별 순열에서 다음 논문을 꺼내므로 같은 세션에서는 논문이 반복되지 않습니다.
+        """
         try:
-            # 먼저 해당 조건의 논문 수를 확인
-            count_result = self.client.table("papers").select("id", count="exact").eq("field", field).eq("conference", conference).execute()
-            total_count = count_result.count if count_result.count is not None else 0
-            
-            if total_count == 0:
-                logger.warning(f"{field} 분야의 {conference} 학회에서 논문을 찾을 수 없습니다.")
-                return None
-            
-            # 랜덤 오프셋 계산
-            import random
-            random_offset = random.randint(0, max(0, total_count - 1))
-            
-            # 랜덤 오프셋으로 1개 논문 조회
-            result = self.client.table("papers").select("*").eq("field", field).eq("conference", conference).range(random_offset, random_offset).execute()
-            
-            if not result.data:
-                # 폴백: 첫 번째 논문 조회
-                result = self.client.table("papers").select("*").eq("field", field).eq("conference", conference).limit(1).execute()
-            
-            if not result.data:
-                logger.warning(f"{field} 분야의 {conference} 학회에서 논문을 찾을 수 없습니다.")
-                return None
+            for attempt in range(2):
+                sampler = await self.get_paper_sampler()
+                if session_id:
+                    paper_id = self._selection_sessions.next_id(session_id, sampler, field, conference, exclude_id)
+                else:
+                    paper_id = sampler.sample(field, conference, exclude_id=exclude_id)
+                
+                if paper_id is None:
+                    logger.warning(f"{field} 분야의 {conference} 학회에서 논문을 찾을 수 없습니다.")
+                    return None
+                
+                paper = await self.get_paper_by_id(paper_id, columns=self.PAPER_PREVIEW_COLUMNS)
+                if paper:
+                    logger.info(f"{field} 분야 {conference} 학회에서 논문 선택: {paper.get('title', 'N/A')[:50]}...")
+                    return paper
+                
+                # 샘플러 생성 이후 삭제된 논문: ID 목록을 다시 로드하고 한 번 더 선택
+                logger.warning(f"선택된 논문(ID: {paper_id})이 존재하지 않아 샘플러를 갱신합니다.")
+                self.invalidate_paper_sampler()
             
-            selected_paper = result.data[0]
-            logger.info(f"{field} 분야 {conference} 학회에서 논문 선택: {selected_paper.get('title', 'N/A')[:50]}...")
-            return selected_paper
+            return None
             
         except Exception as e:
             logger.error(f"분야별 학회 랜덤 논문 조회 실패: {e}")
             raise
     
+    def new_selection_session(self) -> str:
+        """재선택 순서를 유지할 새 세션 ID 발급"""
+        return self._selection_sessions.new_session_id()
+    
     async def get_papers_count_by_conference(self, field: str, conference: str) -> int:
-        """특정 분야와 학회의 논문 수 조회"""
+        """특정 분야와 학회의 논문 수 조회 (카탈로그 집계)"""
         try:
-            result = self.client.table("papers").select("id", count="exact").eq("field", field).eq("conference", conference).execute()
-            return result.count if result.count is not None else 0
+            catalogue = await self.get_paper_catalogue()
+            return catalogue.conference_count(field, conference)
         except Exception as e:
             logger.error(f"학회별 논문 수 조회 실패: {e}")
             raise
     
     async def get_field_statistics(self, field: str) -> Dict[str, Any]:
-        """분야별 통계 조회"""
+        """분야별 통계 조회 (카탈로그 집계)"""
         try:
-            # 전체 논문 수
-            total_result = self.client.table("papers").select("id", count="exact").execute()
-            total_papers = total_result.count if total_result.count is not None else 0
-            
-            # 해당 분야 논문 수
-            field_result = self.client.table("papers").select("id", count="exact").eq("field", field).execute()
-            field_papers = field_result.count if field_result.count is not None else 0
-            
-            # 연도별 분포
-            year_result = self.client.table("papers").select("year").eq("field", field).execute()
-            year_distribution = {}
-            for paper in year_result.data:
-                year = paper.get('year')
-                if year:
-                    year_distribution[str(year)] = year_distribution.get(str(year), 0) + 1
-            
-            # 컨퍼런스별 분포
-            conference_result = self.client.table("papers").select("conference").eq("field", field).execute()
-            conference_distribution = {}
-            for paper in conference_result.data:
-                conference = paper.get('conference')
-                if conference:
-                    conference_distribution[conference] = conference_distribution.get(conference, 0) + 1
-            
-            return {
-                "total_papers": total_papers,
-                "field_papers": field_papers,
-                "year_distribution": year_distribution,
-                "conference_distribution": conference_distribution
-            }
+            catalogue = await self.get_paper_catalogue()
+            return catalogue.field_statistics(field)
             
         except Exception as e:
             logger.error(f"분야 통계 조회 실패: {e}")
             raise
     
-    async def get_top_papers_by_keywords(self, field: str, keywords: List[str], top_k: int = 7) -> List[Dict[str, Any]]:
+    async def get_paper_catalogue(self) -> PaperCatalogue:
+        """(분야, 학회, 연도)별 논문 수 집계 조회 (없거나 만료된 경우 새로 로드)"""
+        catalogue = self._paper_catalogue
+        if catalogue is not None and catalogue.age() < self.CATALOGUE_TTL:
+            return catalogue
+        
+        async with self._catalogue_lock:
+            catalogue = self._paper_catalogue
+            if catalogue is not None and catalogue.age() < self.CATALOGUE_TTL:
+                return catalogue
+            
+            start_time = time.time()
+            catalogue = await self._load_paper_catalogue()
+            self._paper_catalogue = catalogue
+            logger.info(f"논문 카탈로그 집계 로드 완료: {catalogue.total_papers}개 논문, {len(catalogue.counts)}개 항목 ({time.time() - start_time:.2f}초)")
+            return catalogue
+    
+    def invalidate_paper_catalogue(self):
+        """카탈로그 집계 캐시 무효화 (논문 적재 후 호출)"""
+        self._paper_catalogue = None
+    
+    async def _load_paper_catalogue(self) -> PaperCatalogue:
+        """paper_catalogue_stats 집계 테이블에서 로드 (없으면 papers 테이블을 직접 집계)"""
+        try:
+            rows = await self._fetch_all_pages(
+                lambda: self.client.table("paper_catalogue_stats").select("field, conference, year, paper_count").order("field").order("conference").order("year")
+            )
+            if rows:
+                return PaperCatalogue.from_stats_rows(rows)
+            logger.warning("paper_catalogue_stats 테이블이 비어 있어 papers 테이블을 직접 집계합니다.")
+        except Exception as e:
+            logger.warning(f"paper_catalogue_stats 조회 실패, papers 테이블을 직접 집계합니다: {e}")
+        
+        rows = await self._fetch_all_pages(
+            lambda: self.client.table("papers").select("field, conference, year").order("id")
+        )
+        return PaperCatalogue.from_papers(rows)
+    
+    async def get_paper_sampler(self) -> PaperSampler:
+        """(분야, 학회)별 논문 ID 샘플러 조회 (없거나 만료된 경우 새로 로드)"""
+        sampler = self._paper_sampler
+        if sampler is not None and sampler.age() < self.SAMPLER_TTL:
+            return sampler
+        
+        async with self._sampler_lock:
+            sampler = self._paper_sampler
+            if sampler is not None and sampler.age() < self.SAMPLER_TTL:
+                return sampler
+            
+            start_time = time.time()
+            rows = await self._fetch_all_pages(
+                lambda: self.client.table("papers").select("id, field, conference").order("id")
+            )
+            sampler = PaperSampler.from_rows(rows)
+            self._paper_sampler = sampler
+            logger.info(f"랜덤 샘플러 로드 완료: {sampler.size}개 논문 ({time.time() - start_time:.2f}초)")
+            return sampler
+    
+    def invalidate_paper_sampler(self):
+        """랜덤 샘플러 캐시 무효화 (논문 적재 후 호출)"""
+        self._paper_sampler = None
+    
+    async def get_top_papers_by_keywords(self, field: str, keywords: List[str], top_k: int = 7,
+                                         nprobe: Optional[int] = None,
+                                         filters: Optional[SearchFilter] = None) -> List[Dict[str, Any]]:
         """키워드 기반으로 Top-K 논문 선택 (전체에서 선택)"""
         try:
             logger.info(f"키워드 기반 Top-{top_k} 논문 검색: {field}, 키워드: {keywords}")
             
-            # 1. 해당 분야의 모든 논문 조회 (임베딩이 있는 것만)
-            query = self.client.table("papers").select("*").eq("field", field).not_.is_("combined_embedding", "null")
+            # 1. 해당 분야의 임베딩 인덱스 조회
+            index = await self.get_embedding_index(field)
             
-            # 페이지네이션으로 데이터 가져오기
-            page_size = 100
-            all_papers = []
-            page = 0
-            
-            while True:
-                try:
-                    result = query.range(page * page_size, (page + 1) * page_size - 1).execute()
-                    papers = result.data
-                    
-                    if not papers:
-                        break
-                    
-                    all_papers.extend(papers)
-                    
-                    # 충분한 데이터를 가져왔거나 타임아웃 방지를 위해 중단
-                    if len(all_papers) >= 500:  # 최대 500개 논문까지만 처리
-                        break
-                    
-                    page += 1
-                    
-                except Exception as e:
-                    logger.warning(f"페이지 {page} 로드 실패: {e}")
-                    break
-            
-            if not all_papers:
+            if index.size == 0:
                 logger.warning(f"{field} 분야에서 임베딩이 있는 논문을 찾을 수 없습니다.")
                 return []
             
@@ -423,33 +766,8 @@ class SupabaseClient:
             query_embedding = await self._generate_embedding_for_keywords(query_text)
             
             # 3. 유사도 계산 및 Top-K 선택
-            similar_papers = []
-            for paper in all_papers:
-                embedding = paper.get('combined_embedding')
-                if embedding:
-                    try:
-                        # 임베딩 데이터 검증 및 파싱
-                        if isinstance(embedding, str):
-                            import json
-                            embedding = json.loads(embedding)
-                        
-                        if not isinstance(embedding, list) or len(embedding) == 0:
-                            continue
-                        
-                        similarity = self._calculate_cosine_similarity(
-                            query_embedding, embedding
-                        )
-                        
-                        paper['similarity_score'] = similarity
-                        similar_papers.append(paper)
-                        
-                    except Exception as e:
-                        logger.warning(f"유사도 계산 실패 (논문 ID: {paper.get('id', 'unknown')}): {e}")
-                        continue
-            
-            # 4. 유사도 순으로 정렬하고 Top-K 선택
-            similar_papers.sort(key=lambda x: x['similarity_score'], reverse=True)
-            top_papers = similar_papers[:top_k]
+            hits = index.search(query_embedding, limit=top_k, nprobe=self._resolve_nprobe(nprobe), filters=filters)
+            top_papers = await self._get_papers_with_scores(hits)
             
             logger.info(f"Top-{top_k} 논문 선택 완료: {len(top_papers)}개 논문")
             for i, paper in enumerate(top_papers):
@@ -461,45 +779,17 @@ class SupabaseClient:
             logger.error(f"키워드 기반 Top-K 논문 검색 실패: {e}")
             return []
     
-    async def get_top_papers_by_conference(self, field: str, keywords: List[str], top_per_conference: int = 3) -> List[Dict[str, Any]]:
+    async def get_top_papers_by_conference(self, field: str, keywords: List[str], top_per_conference: int = 3,
+                                           nprobe: Optional[int] = None,
+                                           filters: Optional[SearchFilter] = None) -> List[Dict[str, Any]]:
         """학회별로 Top-K 논문 선택"""
         try:
             logger.info(f"학회별 Top-{top_per_conference} 논문 검색: {field}, 키워드: {keywords}")
             
-            # 1. 해당 분야의 모든 논문 조회 (임베딩이 있는 것만) - 제한 없음
-            query = self.client.table("papers").select("*").eq("field", field).not_.is_("combined_embedding", "null")
-            
-            # 페이지네이션으로 데이터 가져오기 (최대 1000개로 제한)
-            page_size = 100
-            max_papers = 1000  # 최대 논문 수 제한
-            all_papers = []
-            page = 0
+            # 1. 해당 분야의 임베딩 인덱스 조회 (학회별 구간으로 정렬됨)
+            index = await self.get_embedding_index(field)
             
-            while len(all_papers) < max_papers:
-                try:
-                    result = query.range(page * page_size, (page + 1) * page_size - 1).execute()
-                    papers = result.data
-                    
-                    if not papers:
-                        break
-                    
-                    all_papers.extend(papers)
-                    page += 1
-                    
-                    # 진행상황 로깅 (5페이지마다)
-                    if page % 5 == 0:
-                        logger.info(f"페이지 {page} 완료, 총 {len(all_papers)}개 논문 로드됨")
-                    
-                    # 최대 10페이지까지만 로드 (안전 장치)
-                    if page >= 10:
-                        logger.info(f"최대 페이지 수에 도달. 총 {len(all_papers)}개 논문으로 분석 진행")
-                        break
-                    
-                except Exception as e:
-                    logger.warning(f"페이지 {page} 로드 실패: {e}")
-                    break
-            
-            if not all_papers:
+            if index.size == 0:
                 logger.warning(f"{field} 분야에서 임베딩이 있는 논문을 찾을 수 없습니다.")
                 return []
             
@@ -507,52 +797,17 @@ class SupabaseClient:
             query_text = " ".join(keywords)
             query_embedding = await self._generate_embedding_for_keywords(query_text)
             
-            # 3. 학회별로 논문 분류
-            conference_papers = {}
-            for paper in all_papers:
-                conference = paper.get('conference', 'Unknown')
-                if conference not in conference_papers:
-                    conference_papers[conference] = []
-                conference_papers[conference].append(paper)
-            
-            # 4. 각 학회별로 유사도 계산 및 Top-K 선택
-            all_top_papers = []
-            for conference, papers in conference_papers.items():
-                logger.info(f"학회 '{conference}'에서 {len(papers)}개 논문 처리 중...")
-                
-                similar_papers = []
-                for paper in papers:
-                    embedding = paper.get('combined_embedding')
-                    if embedding:
-                        try:
-                            # 임베딩 데이터 검증 및 파싱
-                            if isinstance(embedding, str):
-                                import json
-                                embedding = json.loads(embedding)
-                            
-                            if not isinstance(embedding, list) or len(embedding) == 0:
-                                continue
-                            
-                            similarity = self._calculate_cosine_similarity(
-                                query_embedding, embedding
-                            )
-                            
-                            paper['similarity_score'] = similarity
-                            similar_papers.append(paper)
-                            
-                        except Exception as e:
-                            logger.warning(f"유사도 계산 실패 (논문 ID: {paper.get('id', 'unknown')}): {e}")
-                            continue
-                
-                # 유사도 순으로 정렬하고 Top-K 선택
-                similar_papers.sort(key=lambda x: x['similarity_score'], reverse=True)
-                top_papers = similar_papers[:top_per_conference]
-                
-                logger.info(f"학회 '{conference}'에서 Top-{len(top_papers)} 논문 선택 완료")
-                for i, paper in enumerate(top_papers):
-                    logger.info(f"  {i+1}. ID: {paper.get('id')}, 제목: {paper.get('title', 'N/A')[:50]}..., 유사도: {paper.get('similarity_score', 0):.3f}")
-                
-                all_top_papers.extend(top_papers)
+            # 3. 유사도 1회 계산 후 학회별 Top-K 선택
+            hits_by_conference = index.search_by_conference(query_embedding, top_per_conference,
+                                                            nprobe=self._resolve_nprobe(nprobe),
+                                                            filters=filters)
+            
+            # 4. 선택된 논문만 한 번에 조회
+            hits = [hit for conference_hits in hits_by_conference.values() for hit in conference_hits]
+            all_top_papers = await self._get_papers_with_scores(hits)
+            
+            for conference, conference_hits in hits_by_conference.items():
+                logger.info(f"학회 '{conference}'에서 Top-{len(conference_hits)} 논문 선택 완료")
             
             logger.info(f"전체 학회에서 총 {len(all_top_papers)}개 논문 선택 완료")
             return all_top_papers
@@ -570,46 +825,6 @@ class SupabaseClient:
         except Exception as e:
             logger.error(f"키워드 임베딩 생성 실패: {e}")
             raise
-    
-    def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """코사인 유사도 계산"""
-        import numpy as np
-        import json
-        
-        try:
-            # vec2가 문자열인 경우 JSON 파싱
-            if isinstance(vec2, str):
-                vec2 = json.loads(vec2)
-            elif isinstance(vec2, list) and len(vec2) > 0 and isinstance(vec2[0], str):
-                # 리스트의 첫 번째 요소가 문자열인 경우 (잘못된 형식)
-                return 0.0
-            
-            # vec1도 동일하게 처리
-            if isinstance(vec1, str):
-                vec1 = json.loads(vec1)
-            elif isinstance(vec1, list) and len(vec1) > 0 and isinstance(vec1[0], str):
-                return 0.0
-            
-            # numpy 배열로 변환
-            vec1 = np.array(vec1, dtype=float)
-            vec2 = np.array(vec2, dtype=float)
-            
-            # 차원 확인
-            if vec1.shape != vec2.shape:
-                return 0.0
-            
-            dot_product = np.dot(vec1, vec2)
-            norm1 = np.linalg.norm(vec1)
-            norm2 = np.linalg.norm(vec2)
-            
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
-            
-            return float(dot_product / (norm1 * norm2))
-            
-        except (ValueError, TypeError, json.JSONDecodeError) as e:
-            logger.warning(f"유사도 계산 실패: {e}")
-            return 0.0
 
 # 싱글톤 인스턴스
 supabase_client = SupabaseClient() 
\ No newline at end of file
@@ -0,0 +1 @@
+# Shared in-memory search indexes 
\ No newline at end of file
@@ -0,0 +1,136 @@
+import logging
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.shared.infra.search.embedding_index import top_k_indices
+
+logger = logging.getLogger(__name__)
+
+# 영문/숫자 토큰과 한글 토큰
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[가-힣]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to was were with "
+    "we our via using based towards".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """소문자 변환 후 영문/숫자/한글 토큰으로 분리 (불용어, 1글자 영문 토큰 제외)"""
+    return [
+        token for token in _TOKEN_PATTERN.findall((text or "").lower())
+        if token not in STOPWORDS and (len(token) > 1 or token.isdigit())
+    ]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = 60,
+                           weights: Optional[Sequence[float]] = None) -> List[Tuple[int, float]]:
+    """여러 순위 목록(논문 ID 리스트)을 RRF 점수로 결합하여 내림차순 반환"""
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[int, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, paper_id in enumerate(ranking):
+            scores[paper_id] = scores.get(paper_id, 0.0) + weight / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """제목/초록 BM25 역색인
+
+    단어별 게시 목록(posting)을 CSR 형태의 연속 배열로 보관하고,
+    문서 길이 정규화까지 적용한 BM25 가중치를 미리 계산해 둡니다.
+    질의 시에는 질의 단어의 게시 목록만 누적하므로 전체 문서를 다시 훑지 않습니다.
+    """
+
+    def __init__(self, paper_ids: np.ndarray, vocabulary: Dict[str, int],
+                 posting_offsets: np.ndarray, posting_docs: np.ndarray,
+                 posting_weights: np.ndarray):
+        self.paper_ids = np.asarray(paper_ids, dtype=np.int64)
+        self.vocabulary = vocabulary
+        self.posting_offsets = posting_offsets
+        self.posting_docs = posting_docs
+        self.posting_weights = posting_weights
+        self.built_at = time.time()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]], k1: float = 1.2, b: float = 0.75,
+                  title_boost: int = 2) -> 'BM25Index':
+        """`id`, `title`, `abstract` 컬럼을 가진 행 목록으로 색인 생성 (제목은 title_boost배 가중)"""
+        paper_ids: List[int] = []
+        vocabulary: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        doc_lengths: List[int] = []
+
+        for row in rows:
+            if row.get('id') is None:
+                continue
+            tokens = tokenize(row.get('title') or '') * title_boost + tokenize(row.get('abstract') or '')
+            doc = len(paper_ids)
+            paper_ids.append(row['id'])
+            doc_lengths.append(len(tokens))
+            term_ids.extend([vocabulary.setdefault(token, len(vocabulary)) for token in tokens])
+            doc_ids.extend([doc] * len(tokens))
+
+        n_docs = len(paper_ids)
+        if not term_ids:
+            return cls(np.asarray(paper_ids, dtype=np.int64), vocabulary,
+                       np.zeros(len(vocabulary) + 1, dtype=np.int64),
+                       np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32))
+
+        # (단어, 문서) 쌍별 빈도 계산 후 단어 순으로 정렬
+        n_terms = len(vocabulary)
+        pairs = np.asarray(term_ids, dtype=np.int64) * n_docs + np.asarray(doc_ids, dtype=np.int64)
+        unique_pairs, tf = np.unique(pairs, return_counts=True)
+        terms = unique_pairs // n_docs
+        docs = (unique_pairs % n_docs).astype(np.int32)
+
+        lengths = np.asarray(doc_lengths, dtype=np.float32)
+        avg_length = float(lengths.mean()) or 1.0
+        df = np.bincount(terms, minlength=n_terms)
+        idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        tf = tf.astype(np.float32)
+        norm = k1 * (1.0 - b + b * lengths[docs] / avg_length)
+        weights = idf[terms] * tf * (k1 + 1.0) / (tf + norm)
+
+        offsets = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+        return cls(np.asarray(paper_ids, dtype=np.int64), vocabulary, offsets,
+                   docs, weights.astype(np.float32))
+
+    @property
+    def size(self) -> int:
+        return int(self.paper_ids.shape[0])
+
+    def age(self) -> float:
+        """색인 생성 후 경과 시간(초)"""
+        return time.time() - self.built_at
+
+    def is_expired(self, ttl: float) -> bool:
+        return self.age() > ttl
+
+    def scores(self, query: str) -> np.ndarray:
+        """질의에 대한 문서별 BM25 점수 (색인 행 순서)"""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for token in set(tokenize(query)):
+            term = self.vocabulary.get(token)
+            if term is None:
+                continue
+            start, end = self.posting_offsets[term], self.posting_offsets[term + 1]
+            # 게시 목록 안에서 문서는 중복되지 않으므로 인덱스 덧셈으로 누적 가능
+            scores[self.posting_docs[start:end]] += self.posting_weights[start:end]
+        return scores
+
+    def search(self, query: str, limit: int = 10,
+               allowed_ids: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """BM25 점수 상위 limit개 (논문 ID, 점수) 반환 (점수 0인 문서 제외)
+
+        allowed_ids(정렬된 논문 ID 배열)가 있으면 해당 논문만 대상으로 합니다.
+        """
+        scores = self.scores(query)
+        if allowed_ids is not None:
+            scores[~np.isin(self.paper_ids, allowed_ids, assume_unique=True)] = 0
+        top = top_k_indices(scores, limit)
+        return [(int(self.paper_ids[i]), float(scores[i])) for i in top if scores[i] > 0]
@@ -0,0 +1,422 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.shared.infra.search.vector_codec import decode_embedding_rows
+
+logger = logging.getLogger(__name__)
+
+# 저정밀도(float16/int8) 행렬은 이 행 수 단위로 float32로 변환하며 유사도 계산
+SCORE_CHUNK_ROWS = 8192
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 배열에서 상위 k개 인덱스를 내림차순으로 반환 (argpartition 사용)"""
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= scores.size:
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (영벡터는 그대로 0으로 유지)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+@dataclass(frozen=True)
+class SearchFilter:
+    """검색 전 적용할 메타데이터 필터 (None인 조건은 적용하지 않음)"""
+    conferences: Optional[Tuple[str, ...]] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    fields: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def create(cls, conferences: Optional[Iterable[str]] = None, year_from: Optional[int] = None,
+               year_to: Optional[int] = None, fields: Optional[Iterable[str]] = None) -> Optional['SearchFilter']:
+        """조건이 하나도 없으면 None 반환"""
+        conferences = tuple(conferences) if conferences else None
+        fields = tuple(fields) if fields else None
+        if conferences is None and fields is None and year_from is None and year_to is None:
+            return None
+        return cls(conferences, year_from, year_to, fields)
+
+
+class EmbeddingIndex:
+    """논문 임베딩 행렬 인덱스
+
+    combined_embedding 벡터를 정규화된 float32 연속 행렬로 보관하고,
+    같은 순서의 논문 ID 배열을 함께 유지합니다.
+    유사도 검색은 행렬-벡터 곱 한 번과 argpartition으로 처리합니다.
+
+    행은 학회 순으로 정렬되어 있어 학회별 구간(segment)이
+    `conference_offsets[g]:conference_offsets[g + 1]`로 연속됩니다.
+
+    스냅샷에서 로드한 경우 행렬은 메모리 매핑된 float16 배열이거나,
+    행별 스케일(`scales`)을 가진 int8 양자화 배열일 수 있습니다.
+
+    행별 연도/분야 메타데이터를 함께 보관하며, 학회·연도·분야 필터는
+    값별 불리언 비트맵의 교집합으로 후보 행을 먼저 좁힌 뒤 그 행만 유사도를 계산합니다.
+    """
+
+    def __init__(self, paper_ids: np.ndarray, matrix: np.ndarray,
+                 conferences: Optional[List[str]] = None,
+                 conference_offsets: Optional[np.ndarray] = None,
+                 scales: Optional[np.ndarray] = None,
+                 snapshot_path: Optional[str] = None,
+                 years: Optional[np.ndarray] = None,
+                 fields: Optional[List[str]] = None,
+                 field_codes: Optional[np.ndarray] = None):
+        if matrix.ndim != 2 or matrix.shape[0] != paper_ids.shape[0]:
+            raise ValueError("임베딩 행렬과 논문 ID 배열의 크기가 일치하지 않습니다.")
+        if matrix.dtype == np.int8 and scales is None:
+            raise ValueError("int8 임베딩 행렬에는 행별 스케일이 필요합니다.")
+        self.paper_ids = np.asarray(paper_ids, dtype=np.int64)
+        # float16/int8 행렬은 메모리 매핑 상태를 유지하기 위해 복사하지 않음
+        if matrix.dtype in (np.float16, np.int8):
+            self.matrix = matrix
+        else:
+            self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        self.scales = None if scales is None else np.asarray(scales, dtype=np.float32)
+        self.snapshot_path = snapshot_path
+        # 선택적 근사 최근접 이웃 인덱스 (IVFIndex, 스냅샷 로드 시 연결)
+        self.ann = None
+
+        # 학회 구간 정보가 없으면 전체를 하나의 구간으로 취급
+        if conferences is None or conference_offsets is None:
+            conferences = ['Unknown'] if self.paper_ids.size else []
+            conference_offsets = np.array([0, self.paper_ids.size] if self.paper_ids.size else [0], dtype=np.int64)
+        self.conferences = list(conferences)
+        self.conference_offsets = np.asarray(conference_offsets, dtype=np.int64)
+        self.conference_codes = np.repeat(
+            np.arange(len(self.conferences), dtype=np.int64),
+            np.diff(self.conference_offsets)
+        )
+        self._conference_lookup = {name: code for code, name in enumerate(self.conferences)}
+
+        # 행별 연도(미상은 0)와 분야 코드 (정보가 없으면 연도 미상, 단일 분야로 취급)
+        self.years = (np.zeros(self.paper_ids.size, dtype=np.int16) if years is None
+                      else np.asarray(years, dtype=np.int16))
+        if fields is None or field_codes is None:
+            fields = ['']
+            field_codes = np.zeros(self.paper_ids.size, dtype=np.int16)
+        self.fields = list(fields)
+        self.field_codes = np.asarray(field_codes, dtype=np.int16)
+        if self.years.shape[0] != self.size or self.field_codes.shape[0] != self.size:
+            raise ValueError("메타데이터 배열과 임베딩 행렬의 크기가 일치하지 않습니다.")
+        # (종류, 값)별 불리언 비트맵 캐시 (처음 사용할 때 생성)
+        self._bitmaps: Dict[Tuple[str, int], np.ndarray] = {}
+        # 증분 동기화 기준점 (updated_at, id) - 이 시점 이후 변경된 행은 아직 반영되지 않음
+        self.watermark: Optional[Tuple[str, int]] = None
+        # 워터마크 직전 재조회 구간(lookback)에서 이미 반영한 행의 updated_at (같은 행을 매번 다시 반영하지 않도록)
+        self.recent_updates: Dict[int, str] = {}
+        self.built_at = time.time()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> 'EmbeddingIndex':
+        """`id`, `combined_embedding`, `conference`, `year`, `field` 컬럼을 가진 행 목록으로 인덱스 생성"""
+        rows = rows if isinstance(rows, list) else list(rows)
+        # 페이지 단위 일괄 파싱 (차원은 첫 번째 유효 벡터 기준으로 배치마다 검증)
+        vectors, valid = decode_embedding_rows(rows)
+
+        skipped = len(rows) - int(valid.sum())
+        if skipped:
+            logger.warning(f"임베딩 인덱스 생성 중 {skipped}개 행 제외")
+
+        if vectors.shape[0] == 0:
+            return cls.empty()
+
+        valid_rows = [row for row, ok in zip(rows, valid) if ok]
+        ids = [row['id'] for row in valid_rows]
+        conferences = [row.get('conference') or 'Unknown' for row in valid_rows]
+        years = np.asarray([row.get('year') or 0 for row in valid_rows], dtype=np.int16)
+        field_labels, field_codes = np.unique(
+            np.asarray([row.get('field') or '' for row in valid_rows], dtype=object), return_inverse=True
+        )
+
+        # 학회별 구간이 연속되도록 행 정렬 (학회 내부는 기존 순서 유지)
+        labels, codes = np.unique(np.asarray(conferences, dtype=object), return_inverse=True)
+        order = np.argsort(codes, kind="stable")
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(labels)))))
+
+        matrix = normalize_rows(vectors[order])
+        return cls(np.asarray(ids, dtype=np.int64)[order], matrix,
+                   conferences=[str(label) for label in labels],
+                   conference_offsets=offsets,
+                   years=years[order],
+                   fields=[str(label) for label in field_labels],
+                   field_codes=field_codes[order])
+
+    @classmethod
+    def empty(cls, dim: int = 0) -> 'EmbeddingIndex':
+        """빈 인덱스 생성"""
+        return cls(np.empty(0, dtype=np.int64), np.empty((0, dim), dtype=np.float32))
+
+    def apply_delta(self, rows: List[Dict[str, Any]], changed_ids: Iterable[int]) -> 'EmbeddingIndex':
+        """변경된 행을 반영한 새 인덱스 반환 (기존 인덱스는 그대로 두는 copy-on-write)
+
+        `changed_ids`에 해당하는 기존 행을 제거한 뒤 `rows`(임베딩이 있는 변경 행)를 추가하고
+        학회 순으로 다시 정렬합니다. 읽는 쪽은 교체 전까지 기존 인덱스를 계속 사용합니다.
+        저장 dtype(float32/float16/int8)과 IVF 목록은 유지되며, 새 행은 가장 가까운 목록에 배정됩니다.
+        """
+        changed = np.unique(np.asarray(list(changed_ids), dtype=np.int64))
+        keep = np.flatnonzero(~np.isin(self.paper_ids, changed))
+        added = EmbeddingIndex.from_rows(rows) if rows else EmbeddingIndex.empty(self.dim)
+        if added.size and self.size and added.dim != self.dim:
+            raise ValueError(f"추가된 임베딩 차원이 인덱스와 다릅니다: {added.dim} != {self.dim}")
+        if self.size == 0:
+            return self._from_empty(added)
+
+        # 학회/분야 라벨을 합치고 기존 행과 새 행의 코드를 새 라벨 기준으로 변환
+        conferences = sorted(set(self.conferences[code] for code in np.unique(self.conference_codes[keep]))
+                             | set(added.conferences))
+        fields = sorted(set(self.fields) | set(added.fields))
+        conference_lookup = {name: code for code, name in enumerate(conferences)}
+        field_lookup = {name: code for code, name in enumerate(fields)}
+
+        def remap(codes: np.ndarray, labels: List[str], lookup: Dict[str, int]) -> np.ndarray:
+            table = np.asarray([lookup.get(label, -1) for label in labels], dtype=np.int64)
+            return table[codes] if codes.size else codes.astype(np.int64)
+
+        conference_codes = np.concatenate((remap(self.conference_codes[keep], self.conferences, conference_lookup),
+                                           remap(added.conference_codes, added.conferences, conference_lookup)))
+        field_codes = np.concatenate((remap(self.field_codes[keep].astype(np.int64), self.fields, field_lookup),
+                                      remap(added.field_codes.astype(np.int64), added.fields, field_lookup)))
+        order = np.argsort(conference_codes, kind="stable")
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(conference_codes, minlength=len(conferences)))))
+
+        # 새 행을 기존 저장 형식으로 변환
+        added_matrix, added_scales = self._to_storage_dtype(added.matrix)
+
+        matrix = np.concatenate((np.asarray(self.matrix[keep]), added_matrix))[order]
+        scales = None
+        if self.scales is not None:
+            scales = np.concatenate((self.scales[keep], added_scales))[order]
+
+        index = EmbeddingIndex(
+            np.concatenate((self.paper_ids[keep], added.paper_ids))[order],
+            matrix,
+            conferences=conferences,
+            conference_offsets=offsets,
+            scales=scales,
+            snapshot_path=self.snapshot_path,
+            years=np.concatenate((self.years[keep], added.years))[order],
+            fields=fields,
+            field_codes=field_codes[order]
+        )
+
+        if self.ann is not None:
+            # 기존 행 번호 -> 새 행 번호 (제거된 행은 -1)
+            new_positions = np.empty(order.size, dtype=np.int64)
+            new_positions[order] = np.arange(order.size)
+            old_to_new = np.full(self.size, -1, dtype=np.int64)
+            old_to_new[keep] = new_positions[:keep.size]
+            index.ann = self.ann.remap_rows(old_to_new, new_positions[keep.size:], added.matrix)
+        return index
+
+    def _from_empty(self, added: 'EmbeddingIndex') -> 'EmbeddingIndex':
+        """빈 인덱스(예: 비어 있는 스냅샷 샤드)에 행을 추가한 인덱스 (스냅샷 경로, 저장 dtype, IVF 목록 유지)"""
+        matrix, scales = self._to_storage_dtype(added.matrix)
+        index = EmbeddingIndex(
+            added.paper_ids,
+            matrix,
+            conferences=added.conferences,
+            conference_offsets=added.conference_offsets,
+            scales=scales,
+            snapshot_path=self.snapshot_path,
+            years=added.years,
+            fields=added.fields,
+            field_codes=added.field_codes
+        )
+        if self.ann is not None and (not added.size or self.ann.centroids.shape[1] == added.dim):
+            index.ann = self.ann.remap_rows(np.empty(0, dtype=np.int64),
+                                            np.arange(added.size, dtype=np.int64), added.matrix)
+        return index
+
+    def _to_storage_dtype(self, matrix: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """float32 행렬을 이 인덱스의 저장 dtype으로 변환 (int8이면 행별 스케일도 반환)"""
+        if self.matrix.dtype == np.int8:
+            from app.shared.infra.search.embedding_snapshot import quantize_int8
+            return quantize_int8(matrix)
+        return matrix.astype(self.matrix.dtype), None
+
+    @property
+    def size(self) -> int:
+        return int(self.matrix.shape[0])
+
+    @property
+    def dim(self) -> int:
+        return int(self.matrix.shape[1])
+
+    def age(self) -> float:
+        """인덱스 생성 후 경과 시간(초)"""
+        return time.time() - self.built_at
+
+    def is_expired(self, ttl: float) -> bool:
+        """생성 후 ttl초가 지났는지 여부 (스냅샷 인덱스는 다시 로드하지 않고 변경분만 반영하므로 호출부에서 구분)"""
+        return self.age() >= ttl
+
+    def _prepare_query(self, query_embedding: Any) -> Optional[np.ndarray]:
+        """쿼리 벡터를 정규화된 float32 배열로 변환"""
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        if query.shape[0] != self.dim:
+            logger.warning(f"쿼리 차원 불일치: {query.shape[0]} != {self.dim}")
+            return None
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+        return query / norm
+
+    def _candidate_rows(self, query: np.ndarray, nprobe: Optional[int]) -> Optional[np.ndarray]:
+        """ANN 인덱스 후보 행 번호 (ANN 미사용 시 None = 전체 검색)"""
+        if self.ann is None or not nprobe or nprobe >= self.ann.n_lists:
+            return None
+        return self.ann.candidate_rows(query, nprobe)
+
+    def _bitmap(self, kind: str, value: int) -> np.ndarray:
+        """연도/분야 값별 불리언 비트맵 (캐시)"""
+        key = (kind, value)
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            values = self.years if kind == 'year' else self.field_codes
+            bitmap = values == value
+            self._bitmaps[key] = bitmap
+        return bitmap
+
+    def filter_rows(self, filters: Optional[SearchFilter]) -> Optional[np.ndarray]:
+        """필터 조건을 만족하는 행 번호 (정렬됨, 필터가 없으면 None = 전체)"""
+        if filters is None:
+            return None
+
+        mask = np.ones(self.size, dtype=bool)
+        if filters.conferences is not None:
+            # 학회는 연속 구간이므로 구간 단위로 표시
+            conference_mask = np.zeros(self.size, dtype=bool)
+            for name in filters.conferences:
+                code = self._conference_lookup.get(name)
+                if code is not None:
+                    conference_mask[self.conference_offsets[code]:self.conference_offsets[code + 1]] = True
+            mask &= conference_mask
+
+        if filters.year_from is not None or filters.year_to is not None:
+            year_from = filters.year_from if filters.year_from is not None else 1
+            year_to = filters.year_to if filters.year_to is not None else np.iinfo(np.int16).max
+            year_mask = np.zeros(self.size, dtype=bool)
+            for year in np.unique(self.years):
+                if year_from <= year <= year_to:
+                    year_mask |= self._bitmap('year', int(year))
+            mask &= year_mask
+
+        if filters.fields is not None:
+            field_mask = np.zeros(self.size, dtype=bool)
+            for name in filters.fields:
+                if name in self.fields:
+                    field_mask |= self._bitmap('field', self.fields.index(name))
+            mask &= field_mask
+
+        return np.flatnonzero(mask)
+
+    def _search_rows(self, query: np.ndarray, nprobe: Optional[int],
+                     filters: Optional[SearchFilter]) -> Optional[np.ndarray]:
+        """유사도를 계산할 행 번호 (필터 결과와 ANN 후보 중 작은 쪽을 기준으로 결정)"""
+        allowed = self.filter_rows(filters)
+        candidates = self._candidate_rows(query, nprobe)
+        if allowed is None:
+            return candidates
+        # 필터로 좁혀진 행이 ANN 후보보다 적으면 그 행만 정확히 계산
+        if candidates is None or allowed.size <= candidates.size:
+            return allowed
+        return np.intersect1d(candidates, allowed, assume_unique=True)
+
+    def _score(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """정규화된 쿼리와 지정한 행(None이면 전체)의 코사인 유사도"""
+        if rows is None and self.matrix.dtype == np.float32:
+            return self.matrix @ query
+
+        # 저정밀도 행렬이나 후보 행은 블록 단위로 변환하여 임시 메모리 사용량을 제한
+        count = self.size if rows is None else rows.size
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, SCORE_CHUNK_ROWS):
+            end = min(start + SCORE_CHUNK_ROWS, count)
+            block_rows = slice(start, end) if rows is None else rows[start:end]
+            block = np.asarray(self.matrix[block_rows], dtype=np.float32)
+            scores[start:end] = block @ query
+            if self.scales is not None:
+                scores[start:end] *= self.scales[block_rows]
+        return scores
+
+    def similarities(self, query_embedding: Any) -> np.ndarray:
+        """모든 논문에 대한 코사인 유사도 배열"""
+        if self.size == 0:
+            return np.empty(0, dtype=np.float32)
+        query = self._prepare_query(query_embedding)
+        if query is None:
+            return np.zeros(self.size, dtype=np.float32)
+        return self._score(query)
+
+    def search(self, query_embedding: Any, limit: int = 10,
+               threshold: Optional[float] = None,
+               nprobe: Optional[int] = None,
+               filters: Optional[SearchFilter] = None) -> List[Tuple[int, float]]:
+        """상위 limit개의 (논문 ID, 유사도) 목록을 유사도 내림차순으로 반환
+
+        ANN 인덱스가 연결되어 있으면 `nprobe`개 목록의 후보만 검색하고,
+        `filters`가 있으면 조건을 만족하는 행만 검색합니다.
+        """
+        if self.size == 0 or limit <= 0:
+            return []
+        query = self._prepare_query(query_embedding)
+        if query is None:
+            return []
+
+        rows = self._search_rows(query, nprobe, filters)
+        scores = self._score(query, rows)
+
+        if threshold is not None:
+            candidates = np.flatnonzero(scores >= threshold)
+            order = candidates[top_k_indices(scores[candidates], limit)]
+        else:
+            order = top_k_indices(scores, limit)
+
+        matrix_rows = order if rows is None else rows[order]
+        return [(int(self.paper_ids[row]), float(score)) for row, score in zip(matrix_rows, scores[order])]
+
+    def search_by_conference(self, query_embedding: Any,
+                             top_per_conference: int = 3,
+                             nprobe: Optional[int] = None,
+                             filters: Optional[SearchFilter] = None) -> Dict[str, List[Tuple[int, float]]]:
+        """학회별 상위 top_per_conference개의 (논문 ID, 유사도) 목록 반환
+
+        유사도는 한 번만 계산하고, (학회, -유사도) 기준 정렬 후
+        학회 구간 시작 위치와의 차이로 학회 내 순위를 구해 선택합니다.
+        """
+        if self.size == 0 or top_per_conference <= 0:
+            return {}
+        query = self._prepare_query(query_embedding)
+        if query is None:
+            return {}
+
+        rows = self._search_rows(query, nprobe, filters)
+        scores = self._score(query, rows)
+        codes = self.conference_codes if rows is None else self.conference_codes[rows]
+
+        order = np.lexsort((-scores, codes))
+        sorted_codes = codes[order]
+        if rows is None:
+            starts = self.conference_offsets[sorted_codes]
+        else:
+            starts = np.searchsorted(sorted_codes, sorted_codes, side='left')
+        selected = order[np.arange(order.size) - starts < top_per_conference]
+
+        matrix_rows = selected if rows is None else rows[selected]
+        results: Dict[str, List[Tuple[int, float]]] = {}
+        for code, row, score in zip(codes[selected], matrix_rows, scores[selected]):
+            results.setdefault(self.conferences[code], []).append((int(self.paper_ids[row]), float(score)))
+        return results
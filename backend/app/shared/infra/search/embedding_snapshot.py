@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, Tuple
+
+import numpy as np
+
+from app.shared.infra.search.embedding_index import EmbeddingIndex
+from app.shared.infra.search.ivf_index import IVFIndex
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷 디렉토리 구조
+#   <snapshot_dir>/<field_slug>/
+#       meta.json        분야, 차원, 저장 dtype, 학회 구간 정보
+#       ids.npy          논문 ID (int64, 행렬과 같은 순서)
+#       embeddings.npy   정규화된 임베딩 (float16 또는 int8)
+#       scales.npy       int8 저장 시 행별 스케일 (float32)
+#       years.npy        행별 연도 (int16, 미상은 0)
+#       field_codes.npy  행별 분야 코드 (int16, meta.json의 fields 인덱스)
+#       ivf.json, ivf-*/ 선택적 IVF 근사 검색 인덱스 (build_ivf_index.py로 생성)
+META_FILE = "meta.json"
+IDS_FILE = "ids.npy"
+EMBEDDINGS_FILE = "embeddings.npy"
+SCALES_FILE = "scales.npy"
+YEARS_FILE = "years.npy"
+FIELD_CODES_FILE = "field_codes.npy"
+
+SNAPSHOT_DTYPES = ("float16", "int8")
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def field_slug(field: str) -> str:
+    """분야 이름을 디렉토리 이름으로 변환"""
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', field).strip('_').lower()
+    return slug or "all"
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """행별 대칭 스칼라 양자화 (x ≈ scale * q, q ∈ [-127, 127])"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def _save_array(path: str, array: np.ndarray) -> None:
+    """임시 파일에 저장한 뒤 교체하여 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 함"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def write_snapshot(index: EmbeddingIndex, field: str, snapshot_dir: str,
+                   dtype: str = "float16") -> str:
+    """인덱스를 분야별 스냅샷 샤드로 저장하고 샤드 경로를 반환"""
+    if dtype not in SNAPSHOT_DTYPES:
+        raise ValueError(f"지원하지 않는 스냅샷 dtype입니다: {dtype} (지원: {', '.join(SNAPSHOT_DTYPES)})")
+
+    shard_dir = os.path.join(snapshot_dir, field_slug(field))
+    os.makedirs(shard_dir, exist_ok=True)
+
+    matrix = np.asarray(index.matrix, dtype=np.float32)
+    if index.scales is not None:
+        matrix = matrix * index.scales[:, None]
+
+    scales_path = os.path.join(shard_dir, SCALES_FILE)
+    if dtype == "int8":
+        quantized, scales = quantize_int8(matrix)
+        _save_array(os.path.join(shard_dir, EMBEDDINGS_FILE), quantized)
+        _save_array(scales_path, scales)
+    else:
+        _save_array(os.path.join(shard_dir, EMBEDDINGS_FILE), matrix.astype(np.float16))
+        if os.path.exists(scales_path):
+            os.remove(scales_path)
+
+    _save_array(os.path.join(shard_dir, IDS_FILE), index.paper_ids)
+    _save_array(os.path.join(shard_dir, YEARS_FILE), index.years)
+    _save_array(os.path.join(shard_dir, FIELD_CODES_FILE), index.field_codes)
+
+    # 행 순서가 바뀌었을 수 있으므로 이전 IVF 인덱스는 제거 (build_ivf_index.py로 재생성)
+    IVFIndex.remove(shard_dir)
+
+    # meta.json은 마지막에 기록 (샤드 완성 표시)
+    meta = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "field": field,
+        "count": index.size,
+        "dim": index.dim,
+        "dtype": dtype,
+        "conferences": index.conferences,
+        "conference_offsets": index.conference_offsets.tolist(),
+        "fields": index.fields,
+        # 증분 동기화 시작점 ([updated_at, id], 없으면 created_at 기준)
+        "watermark": list(index.watermark) if index.watermark else None,
+        "created_at": time.time(),
+    }
+    meta_path = os.path.join(shard_dir, META_FILE)
+    with open(f"{meta_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(f"{meta_path}.tmp", meta_path)
+
+    logger.info(f"임베딩 스냅샷 저장 완료: {field} ({index.size}개, {dtype}) -> {shard_dir}")
+    return shard_dir
+
+
+def load_snapshot(shard_dir: str) -> Tuple[str, EmbeddingIndex]:
+    """샤드 디렉토리를 메모리 매핑으로 로드하여 (분야, 인덱스) 반환"""
+    with open(os.path.join(shard_dir, META_FILE), encoding="utf-8") as f:
+        meta = json.load(f)
+
+    if meta.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 스냅샷 버전입니다: {meta.get('format_version')}")
+
+    matrix = np.load(os.path.join(shard_dir, EMBEDDINGS_FILE), mmap_mode='r')
+    paper_ids = np.load(os.path.join(shard_dir, IDS_FILE), mmap_mode='r')
+    scales = None
+    if meta["dtype"] == "int8":
+        scales = np.load(os.path.join(shard_dir, SCALES_FILE))
+
+    if matrix.shape != (meta["count"], meta["dim"]):
+        raise ValueError(f"스냅샷 크기가 메타데이터와 일치하지 않습니다: {shard_dir}")
+
+    # 연도/분야 메타데이터가 없는 이전 샤드는 연도 미상, 단일 분야로 로드
+    years = field_codes = None
+    years_path = os.path.join(shard_dir, YEARS_FILE)
+    field_codes_path = os.path.join(shard_dir, FIELD_CODES_FILE)
+    if os.path.exists(years_path) and os.path.exists(field_codes_path) and "fields" in meta:
+        years = np.load(years_path)
+        field_codes = np.load(field_codes_path)
+    else:
+        logger.warning(f"연도/분야 메타데이터가 없는 스냅샷입니다. 필터 검색을 위해 다시 내보내세요: {shard_dir}")
+
+    index = EmbeddingIndex(
+        paper_ids,
+        matrix,
+        conferences=meta["conferences"],
+        conference_offsets=np.asarray(meta["conference_offsets"], dtype=np.int64),
+        scales=scales,
+        snapshot_path=shard_dir,
+        years=years,
+        fields=meta.get("fields") if years is not None else None,
+        field_codes=field_codes
+    )
+    index.ann = IVFIndex.load(shard_dir)
+    if meta.get("watermark"):
+        index.watermark = (meta["watermark"][0], int(meta["watermark"][1]))
+    else:
+        # 워터마크가 없으면 내보낸 시각 이후 변경분부터 동기화
+        created_at = datetime.fromtimestamp(meta.get("created_at", 0), tz=timezone.utc)
+        index.watermark = (created_at.isoformat(), 0)
+    return meta["field"], index
+
+
+def load_snapshots(snapshot_dir: str) -> Dict[str, EmbeddingIndex]:
+    """스냅샷 디렉토리의 모든 분야 샤드를 로드"""
+    indexes: Dict[str, EmbeddingIndex] = {}
+    if not os.path.isdir(snapshot_dir):
+        logger.warning(f"임베딩 스냅샷 디렉토리가 없습니다: {snapshot_dir}")
+        return indexes
+
+    for name in sorted(os.listdir(snapshot_dir)):
+        shard_dir = os.path.join(snapshot_dir, name)
+        if not os.path.isfile(os.path.join(shard_dir, META_FILE)):
+            continue
+        try:
+            field, index = load_snapshot(shard_dir)
+            indexes[field] = index
+            ann_info = f", IVF {index.ann.n_lists}개 목록" if index.ann is not None else ""
+            logger.info(f"임베딩 스냅샷 로드: {field} ({index.size}개, {index.matrix.dtype}{ann_info})")
+        except Exception as e:
+            logger.warning(f"임베딩 스냅샷 로드 실패 ({shard_dir}): {e}")
+
+    return indexes
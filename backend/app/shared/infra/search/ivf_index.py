@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Optional
+
+import numpy as np
+
+from app.shared.infra.search.embedding_index import EmbeddingIndex, SCORE_CHUNK_ROWS, normalize_rows, top_k_indices
+
+logger = logging.getLogger(__name__)
+
+# 샤드 디렉토리에 함께 저장되는 IVF 파일
+#   ivf.json      현재 빌드 디렉토리 이름 (새 빌드를 다 쓴 뒤 원자적으로 교체)
+#   ivf-<id>/     빌드별 중심/목록 파일
+# (이전 형식은 세 파일을 샤드 디렉토리에 바로 저장 - 읽기만 지원)
+IVF_CENTROIDS_FILE = "ivf_centroids.npy"
+IVF_LIST_ROWS_FILE = "ivf_list_rows.npy"
+IVF_LIST_OFFSETS_FILE = "ivf_list_offsets.npy"
+IVF_FILES = (IVF_CENTROIDS_FILE, IVF_LIST_ROWS_FILE, IVF_LIST_OFFSETS_FILE)
+IVF_POINTER_FILE = "ivf.json"
+IVF_BUILD_PREFIX = "ivf-"
+
+
+def _as_float32_rows(index: EmbeddingIndex, rows: np.ndarray) -> np.ndarray:
+    """인덱스 행렬의 일부 행을 float32 (스케일 적용) 배열로 변환"""
+    block = np.asarray(index.matrix[rows], dtype=np.float32)
+    if index.scales is not None:
+        block = block * index.scales[rows][:, None]
+    return block
+
+
+def assign_clusters(index: EmbeddingIndex, centroids: np.ndarray) -> np.ndarray:
+    """각 행을 가장 가까운(코사인 유사도가 가장 높은) 중심에 할당"""
+    assignments = np.empty(index.size, dtype=np.int64)
+    for start in range(0, index.size, SCORE_CHUNK_ROWS):
+        rows = np.arange(start, min(start + SCORE_CHUNK_ROWS, index.size))
+        assignments[start:start + rows.size] = np.argmax(_as_float32_rows(index, rows) @ centroids.T, axis=1)
+    return assignments
+
+
+def spherical_kmeans(vectors: np.ndarray, n_clusters: int, n_iter: int = 20,
+                     seed: int = 0) -> np.ndarray:
+    """정규화된 벡터에 대한 구면 k-means (정규화된 중심 반환)"""
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, vectors.shape[0])
+    centroids = vectors[rng.choice(vectors.shape[0], n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        labels = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        counts = np.bincount(labels, minlength=n_clusters)
+
+        # 빈 클러스터는 임의의 벡터로 재초기화
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            sums[empty] = vectors[rng.choice(vectors.shape[0], empty.size, replace=False)]
+
+        new_centroids = normalize_rows(sums)
+        if np.allclose(new_centroids, centroids, atol=1e-6):
+            centroids = new_centroids
+            break
+        centroids = new_centroids
+
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """IVF(Inverted File) 근사 최근접 이웃 인덱스
+
+    k-means 중심(coarse quantizer)별로 임베딩 인덱스의 행 번호 목록을 보관합니다.
+    검색 시 쿼리와 가장 가까운 `nprobe`개 목록의 행만 후보로 사용하며,
+    `nprobe`가 클수록 재현율이 높아지고 지연 시간도 늘어납니다.
+    """
+
+    def __init__(self, centroids: np.ndarray, list_rows: np.ndarray, list_offsets: np.ndarray):
+        if list_offsets.shape[0] != centroids.shape[0] + 1:
+            raise ValueError("IVF 목록 오프셋과 중심 수가 일치하지 않습니다.")
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.list_rows = np.asarray(list_rows, dtype=np.int64)
+        self.list_offsets = np.asarray(list_offsets, dtype=np.int64)
+
+    @property
+    def n_lists(self) -> int:
+        return int(self.centroids.shape[0])
+
+    @classmethod
+    def build(cls, index: EmbeddingIndex, n_lists: Optional[int] = None, n_iter: int = 20,
+              train_size: Optional[int] = None, seed: int = 0) -> 'IVFIndex':
+        """임베딩 인덱스로부터 IVF 인덱스 생성 (오프라인 작업)"""
+        if index.size == 0:
+            raise ValueError("빈 인덱스로는 IVF 인덱스를 만들 수 없습니다.")
+
+        n_lists = n_lists or max(1, int(np.sqrt(index.size)))
+        n_lists = min(n_lists, index.size)
+
+        # 학습은 표본으로 수행 (목록당 최대 256개)
+        train_size = min(index.size, train_size or n_lists * 256)
+        rng = np.random.default_rng(seed)
+        train_rows = np.sort(rng.choice(index.size, train_size, replace=False))
+        training_vectors = normalize_rows(_as_float32_rows(index, train_rows))
+
+        centroids = spherical_kmeans(training_vectors, n_lists, n_iter=n_iter, seed=seed)
+        assignments = assign_clusters(index, centroids)
+
+        # 목록 번호 순으로 정렬하여 목록별 행이 연속되도록 저장 (목록 내부는 행 번호 순)
+        list_rows = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=centroids.shape[0])
+        list_offsets = np.concatenate(([0], np.cumsum(counts)))
+
+        logger.info(f"IVF 인덱스 생성 완료: {index.size}개 벡터, {centroids.shape[0]}개 목록")
+        return cls(centroids, list_rows, list_offsets)
+
+    def candidate_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """정규화된 쿼리와 가까운 nprobe개 목록의 행 번호 (오름차순)"""
+        probes = top_k_indices(self.centroids @ query, max(1, nprobe))
+        rows = np.concatenate([
+            self.list_rows[self.list_offsets[probe]:self.list_offsets[probe + 1]] for probe in probes
+        ])
+        # 행 번호 순으로 정렬하여 메모리 매핑 행렬을 순차적으로 읽도록 함
+        return np.sort(rows)
+
+    def remap_rows(self, old_to_new: np.ndarray, added_rows: np.ndarray,
+                   added_vectors: np.ndarray) -> 'IVFIndex':
+        """행 번호가 바뀐 인덱스에 맞춘 새 IVF 인덱스 (중심은 유지, 추가 행은 가장 가까운 목록에 배정)
+
+        old_to_new는 기존 행 번호 -> 새 행 번호 (제거된 행은 -1) 배열입니다.
+        """
+        counts = np.diff(self.list_offsets)
+        lists = np.repeat(np.arange(self.n_lists, dtype=np.int64), counts)
+        rows = old_to_new[np.asarray(self.list_rows)]
+        kept = rows >= 0
+
+        added_lists = np.empty(0, dtype=np.int64)
+        if added_rows.size:
+            added_lists = np.argmax(normalize_rows(np.asarray(added_vectors, dtype=np.float32)) @ self.centroids.T, axis=1)
+
+        lists = np.concatenate((lists[kept], added_lists))
+        rows = np.concatenate((rows[kept], added_rows))
+        order = np.lexsort((rows, lists))
+        list_offsets = np.concatenate(([0], np.cumsum(np.bincount(lists, minlength=self.n_lists))))
+        return IVFIndex(self.centroids, rows[order], list_offsets)
+
+    def save(self, shard_dir: str) -> None:
+        """스냅샷 샤드 디렉토리에 IVF 파일 저장
+
+        새 빌드 디렉토리에 세 파일을 모두 쓴 뒤 ivf.json을 교체하므로, 동시에 로드하는 쪽은
+        항상 한 빌드의 중심과 목록을 함께 읽습니다. 이전 빌드는 교체 후 제거합니다.
+        """
+        tmp_dir = tempfile.mkdtemp(dir=shard_dir, prefix=".ivf-tmp-")
+        build_name = f"{IVF_BUILD_PREFIX}{uuid.uuid4().hex[:12]}"
+        try:
+            np.save(os.path.join(tmp_dir, IVF_CENTROIDS_FILE), self.centroids)
+            np.save(os.path.join(tmp_dir, IVF_LIST_ROWS_FILE), self.list_rows)
+            np.save(os.path.join(tmp_dir, IVF_LIST_OFFSETS_FILE), self.list_offsets)
+            os.rename(tmp_dir, os.path.join(shard_dir, build_name))
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        pointer_path = os.path.join(shard_dir, IVF_POINTER_FILE)
+        with open(f"{pointer_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"build": build_name}, f)
+        os.replace(f"{pointer_path}.tmp", pointer_path)
+        _remove_builds(shard_dir, keep=build_name)
+
+    @classmethod
+    def load(cls, shard_dir: str) -> Optional['IVFIndex']:
+        """샤드 디렉토리에서 IVF 파일 로드 (없으면 None)"""
+        # 읽는 도중 새 빌드로 교체되어 이전 빌드가 지워졌다면 한 번 더 시도
+        for _ in range(2):
+            build_dir = _current_build_dir(shard_dir)
+            if build_dir is None:
+                return None
+            try:
+                return cls(
+                    np.load(os.path.join(build_dir, IVF_CENTROIDS_FILE)),
+                    np.load(os.path.join(build_dir, IVF_LIST_ROWS_FILE), mmap_mode='r'),
+                    np.load(os.path.join(build_dir, IVF_LIST_OFFSETS_FILE))
+                )
+            except FileNotFoundError:
+                continue
+        return None
+
+    @staticmethod
+    def remove(shard_dir: str) -> None:
+        """샤드 디렉토리의 IVF 파일 모두 제거 (스냅샷을 다시 내보낼 때)"""
+        pointer_path = os.path.join(shard_dir, IVF_POINTER_FILE)
+        if os.path.exists(pointer_path):
+            os.remove(pointer_path)
+        _remove_builds(shard_dir, keep=None)
+
+
+def _current_build_dir(shard_dir: str) -> Optional[str]:
+    """ivf.json이 가리키는 빌드 디렉토리 (이전 형식이면 샤드 디렉토리, IVF가 없으면 None)"""
+    pointer_path = os.path.join(shard_dir, IVF_POINTER_FILE)
+    try:
+        with open(pointer_path, encoding="utf-8") as f:
+            return os.path.join(shard_dir, json.load(f)["build"])
+    except FileNotFoundError:
+        pass
+    if os.path.exists(os.path.join(shard_dir, IVF_CENTROIDS_FILE)):
+        return shard_dir
+    return None
+
+
+def _remove_builds(shard_dir: str, keep: Optional[str]) -> None:
+    """keep 이외의 IVF 빌드 디렉토리와 이전 형식 파일 제거"""
+    for name in os.listdir(shard_dir):
+        if name.startswith(IVF_BUILD_PREFIX) and name != keep:
+            shutil.rmtree(os.path.join(shard_dir, name), ignore_errors=True)
+    for name in IVF_FILES:
+        path = os.path.join(shard_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
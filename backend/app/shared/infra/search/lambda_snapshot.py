@@ -0,0 +1,106 @@
+import gzip
+import json
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 번들 구조 (tar.gz)
+#   embeddings/      분야별 임베딩 스냅샷 샤드 (embedding_snapshot.write_snapshot 형식)
+#   labs.json.gz     professors 테이블 전체 행 (연구실 카탈로그)
+EMBEDDINGS_DIR = "embeddings"
+LAB_CATALOGUE_FILE = "labs.json.gz"
+SOURCE_FILE = ".source"
+
+BUNDLE_NAME = "lambda_snapshot.tar.gz"
+DEFAULT_EXTRACT_DIR = os.path.join(tempfile.gettempdir(), "cvpilot_snapshot")
+
+
+def default_bundle_path() -> str:
+    """번들 경로 (LAMBDA_SNAPSHOT_BUNDLE, 없으면 Lambda 작업 디렉토리의 lambda_snapshot.tar.gz)"""
+    path = os.getenv("LAMBDA_SNAPSHOT_BUNDLE")
+    if path:
+        return path
+    task_root = os.getenv("LAMBDA_TASK_ROOT") or os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+    return os.path.join(task_root, BUNDLE_NAME)
+
+
+def write_bundle(output_path: str, embeddings_dir: str, professors: List[Dict[str, Any]]) -> str:
+    """임베딩 스냅샷 디렉토리와 교수 행 목록을 하나의 tar.gz 번들로 저장"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        catalogue_path = os.path.join(tmp_dir, LAB_CATALOGUE_FILE)
+        with gzip.open(catalogue_path, "wt", encoding="utf-8") as f:
+            json.dump(professors, f, ensure_ascii=False)
+
+        tmp_path = f"{output_path}.tmp"
+        with tarfile.open(tmp_path, "w:gz") as tar:
+            if embeddings_dir and os.path.isdir(embeddings_dir):
+                tar.add(embeddings_dir, arcname=EMBEDDINGS_DIR)
+            tar.add(catalogue_path, arcname=LAB_CATALOGUE_FILE)
+        os.replace(tmp_path, output_path)
+    return output_path
+
+
+def _bundle_signature(bundle_path: str) -> str:
+    """번들 파일 식별 값 (크기와 수정 시각)"""
+    stat = os.stat(bundle_path)
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def extract_bundle(bundle_path: str = None, target_dir: str = None) -> Optional[str]:
+    """번들을 /tmp에 압축 해제하고 디렉토리 경로 반환 (번들이 없으면 None)
+
+    같은 번들이 이미 풀려 있으면 다시 풀지 않으므로 웜 인보케이션에서는 비용이 없습니다.
+    임시 디렉토리에 푼 뒤 교체하여 읽는 쪽이 반쯤 풀린 파일을 보지 않도록 합니다.
+    """
+    bundle_path = bundle_path or default_bundle_path()
+    target_dir = target_dir or DEFAULT_EXTRACT_DIR
+    if not os.path.isfile(bundle_path):
+        return None
+
+    signature = _bundle_signature(bundle_path)
+    source_path = os.path.join(target_dir, SOURCE_FILE)
+    if os.path.isfile(source_path):
+        with open(source_path) as f:
+            if f.read().strip() == signature:
+                return target_dir
+
+    start_time = time.time()
+    parent_dir = os.path.dirname(os.path.abspath(target_dir))
+    os.makedirs(parent_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent_dir, prefix=".snapshot-")
+    try:
+        with tarfile.open(bundle_path, "r:gz") as tar:
+            for member in tar.getmembers():
+                # 번들 밖 경로로 풀리는 항목 차단
+                member_path = os.path.abspath(os.path.join(tmp_dir, member.name))
+                if not member_path.startswith(os.path.abspath(tmp_dir) + os.sep):
+                    raise ValueError(f"잘못된 번들 경로: {member.name}")
+            tar.extractall(tmp_dir)
+        with open(os.path.join(tmp_dir, SOURCE_FILE), "w") as f:
+            f.write(signature)
+
+        if os.path.isdir(target_dir):
+            shutil.rmtree(target_dir)
+        os.replace(tmp_dir, target_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    logger.info(f"스냅샷 번들 압축 해제 완료: {bundle_path} -> {target_dir} ({time.time() - start_time:.2f}초)")
+    return target_dir
+
+
+def load_lab_catalogue(snapshot_dir: str) -> Optional[List[Dict[str, Any]]]:
+    """압축 해제된 번들의 교수 행 목록 (없으면 None)"""
+    path = os.path.join(snapshot_dir, LAB_CATALOGUE_FILE)
+    if not os.path.isfile(path):
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
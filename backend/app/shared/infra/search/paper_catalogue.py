@@ -0,0 +1,92 @@
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+# (분야, 학회, 연도) 키. 값이 없는 학회는 '', 연도는 0으로 저장
+CatalogueKey = Tuple[str, str, int]
+
+
+class PaperCatalogue:
+    """논문 카탈로그 집계 저장소
+
+    (분야, 학회, 연도)별 논문 수로부터 분야별 학회 목록, 연도/학회 분포,
+    학회별 논문 수를 미리 계산해 두고 메모리에서 바로 반환합니다.
+    """
+
+    def __init__(self, counts: Dict[CatalogueKey, int]):
+        self.counts = {key: count for key, count in counts.items() if count > 0}
+        self.built_at = time.time()
+
+        self.total_papers = sum(self.counts.values())
+        self._field_papers: Counter = Counter()
+        self._conference_counts: Dict[str, Counter] = {}
+        self._year_counts: Dict[str, Counter] = {}
+        self._conference_years: Dict[Tuple[str, str], set] = {}
+
+        for (field, conference, year), count in self.counts.items():
+            self._field_papers[field] += count
+            if conference:
+                self._conference_counts.setdefault(field, Counter())[conference] += count
+                if year:
+                    self._conference_years.setdefault((field, conference), set()).add(year)
+            if year:
+                self._year_counts.setdefault(field, Counter())[str(year)] += count
+
+        self._conferences = {field: self._summarize_conferences(field) for field in self._field_papers}
+
+    @classmethod
+    def from_stats_rows(cls, rows: Iterable[Dict[str, Any]]) -> 'PaperCatalogue':
+        """paper_catalogue_stats 테이블 행 (field, conference, year, paper_count)으로 생성"""
+        counts: Dict[CatalogueKey, int] = {}
+        for row in rows:
+            key = (row.get('field') or '', row.get('conference') or '', row.get('year') or 0)
+            counts[key] = counts.get(key, 0) + (row.get('paper_count') or 0)
+        return cls(counts)
+
+    @classmethod
+    def from_papers(cls, rows: Iterable[Dict[str, Any]]) -> 'PaperCatalogue':
+        """papers 테이블 행 (field, conference, year)을 직접 집계하여 생성"""
+        counts = Counter(
+            (row.get('field') or '', row.get('conference') or '', row.get('year') or 0)
+            for row in rows
+        )
+        return cls(dict(counts))
+
+    def age(self) -> float:
+        """집계 생성 후 경과 시간(초)"""
+        return time.time() - self.built_at
+
+    def _summarize_conferences(self, field: str) -> List[Dict[str, Any]]:
+        """분야별 학회 목록 (논문 수 내림차순)"""
+        conferences = []
+        for conference, paper_count in self._conference_counts.get(field, Counter()).items():
+            years = self._conference_years.get((field, conference), set())
+            conferences.append({
+                'name': conference,
+                'paper_count': paper_count,
+                'latest_year': max(years) if years else 0,
+                'year_range': f"{min(years)}-{max(years)}" if years else "N/A"
+            })
+        conferences.sort(key=lambda x: x['paper_count'], reverse=True)
+        return conferences
+
+    def fields(self) -> List[str]:
+        """논문이 있는 분야 목록"""
+        return sorted(field for field in self._field_papers if field)
+
+    def conferences(self, field: str) -> List[Dict[str, Any]]:
+        """분야별 학회 목록 (이름, 논문 수, 최신 연도, 연도 범위)"""
+        return [dict(conference) for conference in self._conferences.get(field, [])]
+
+    def conference_count(self, field: str, conference: str) -> int:
+        """분야와 학회의 논문 수"""
+        return self._conference_counts.get(field, Counter()).get(conference, 0)
+
+    def field_statistics(self, field: str) -> Dict[str, Any]:
+        """분야별 통계 (전체/분야 논문 수, 연도별/학회별 분포)"""
+        return {
+            "total_papers": self.total_papers,
+            "field_papers": self._field_papers.get(field, 0),
+            "year_distribution": dict(self._year_counts.get(field, {})),
+            "conference_distribution": dict(self._conference_counts.get(field, {}))
+        }
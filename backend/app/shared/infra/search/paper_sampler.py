@@ -0,0 +1,163 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# (분야, 학회) 키. 값이 없는 학회는 ''로 저장
+SamplerKey = Tuple[str, str]
+
+
+class PaperSampler:
+    """논문 랜덤 샘플러
+
+    (분야, 학회)별 논문 ID를 정렬된 int64 배열로 보관하여
+    전체 행을 조회하지 않고 O(1)에 ID를 뽑습니다.
+    """
+
+    def __init__(self, ids_by_key: Dict[SamplerKey, np.ndarray], seed: Optional[int] = None):
+        self._ids = {
+            key: np.sort(np.asarray(ids, dtype=np.int64))
+            for key, ids in ids_by_key.items() if len(ids) > 0
+        }
+        fields: Dict[str, List[np.ndarray]] = {}
+        for (field, _), ids in self._ids.items():
+            fields.setdefault(field, []).append(ids)
+        self._field_ids = {field: np.sort(np.concatenate(arrays)) for field, arrays in fields.items()}
+        self._all_ids = (np.sort(np.concatenate(list(self._ids.values())))
+                         if self._ids else np.empty(0, dtype=np.int64))
+        self._rng = np.random.default_rng(seed)
+        self.built_at = time.time()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]], seed: Optional[int] = None) -> 'PaperSampler':
+        """papers 테이블 행 (id, field, conference)으로 생성"""
+        grouped: Dict[SamplerKey, List[int]] = {}
+        for row in rows:
+            if row.get('id') is None:
+                continue
+            key = (row.get('field') or '', row.get('conference') or '')
+            grouped.setdefault(key, []).append(row['id'])
+        return cls({key: np.asarray(ids, dtype=np.int64) for key, ids in grouped.items()}, seed=seed)
+
+    @property
+    def size(self) -> int:
+        return len(self._all_ids)
+
+    def age(self) -> float:
+        """샘플러 생성 후 경과 시간(초)"""
+        return time.time() - self.built_at
+
+    def ids(self, field: str = None, conference: str = None) -> np.ndarray:
+        """조건에 맞는 논문 ID 배열 (정렬됨)"""
+        if conference is not None:
+            return self._ids.get((field or '', conference), np.empty(0, dtype=np.int64))
+        if field:
+            return self._field_ids.get(field, np.empty(0, dtype=np.int64))
+        return self._all_ids
+
+    def count(self, field: str = None, conference: str = None) -> int:
+        return len(self.ids(field, conference))
+
+    def sample(self, field: str = None, conference: str = None, exclude_id: Optional[int] = None) -> Optional[int]:
+        """조건에 맞는 논문 ID 하나를 균등하게 선택 (exclude_id는 제외, 재시도 없음)"""
+        ids = self.ids(field, conference)
+        n = len(ids)
+        excluded = self._position(ids, exclude_id)
+        if excluded is None:
+            return int(ids[self._rng.integers(n)]) if n else None
+        if n < 2:
+            return None
+
+        # 제외할 위치를 건너뛰도록 n-1개 중에서 뽑은 뒤 위치를 보정
+        position = int(self._rng.integers(n - 1))
+        if position >= excluded:
+            position += 1
+        return int(ids[position])
+
+    def sample_many(self, field: str = None, conference: str = None, limit: int = 1) -> List[int]:
+        """조건에 맞는 논문 ID를 중복 없이 최대 limit개 선택"""
+        ids = self.ids(field, conference)
+        if len(ids) == 0 or limit <= 0:
+            return []
+        positions = self._rng.choice(len(ids), size=min(limit, len(ids)), replace=False)
+        return [int(paper_id) for paper_id in ids[positions]]
+
+    def shuffle(self, field: str = None, conference: str = None) -> np.ndarray:
+        """조건에 맞는 논문 ID의 무작위 순열"""
+        return self._rng.permutation(self.ids(field, conference))
+
+    @staticmethod
+    def _position(ids: np.ndarray, paper_id: Optional[int]) -> Optional[int]:
+        """정렬된 ID 배열에서 paper_id의 위치 (없으면 None)"""
+        if paper_id is None or len(ids) == 0:
+            return None
+        position = int(np.searchsorted(ids, paper_id))
+        if position < len(ids) and ids[position] == paper_id:
+            return position
+        return None
+
+
+class _SelectionSession:
+    """세션별 비복원 추출 상태 (순열과 현재 위치)"""
+
+    def __init__(self, order: np.ndarray):
+        self.order = order
+        self.cursor = 0
+        self.last_used = time.time()
+
+
+class PaperSelectionSessions:
+    """세션별 비복원 논문 선택
+
+    세션마다 (분야, 학회) 논문 ID의 순열을 만들어 두고 차례로 꺼내므로
+    재선택 시 순열을 모두 소진하기 전까지 같은 논문이 다시 나오지 않습니다.
+    소진되면 새 순열로 다시 시작하며, 오래 사용되지 않은 세션부터 제거합니다.
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl: float = 3600):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: "OrderedDict[Tuple[str, str, str], _SelectionSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_session_id() -> str:
+        return uuid.uuid4().hex
+
+    def next_id(self, session_id: str, sampler: PaperSampler, field: str, conference: str,
+                current_id: Optional[int] = None) -> Optional[int]:
+        """세션 순열에서 다음 논문 ID 반환 (current_id와 같으면 건너뜀)"""
+        key = (session_id, field or '', conference or '')
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(key)
+            if session is None:
+                session = _SelectionSession(sampler.shuffle(field, conference))
+                self._sessions[key] = session
+            self._sessions.move_to_end(key)
+            session.last_used = time.time()
+
+            # 순열 길이 + 1번 안에 반드시 다른 논문을 찾거나 후보가 없음을 확인
+            for _ in range(len(session.order) + 1):
+                if session.cursor >= len(session.order):
+                    session.order = sampler.shuffle(field, conference)
+                    session.cursor = 0
+                    if len(session.order) == 0:
+                        return None
+                paper_id = int(session.order[session.cursor])
+                session.cursor += 1
+                if paper_id != current_id:
+                    return paper_id
+            return None
+
+    def _expire(self) -> None:
+        """TTL이 지났거나 최대 세션 수를 넘은 세션 제거"""
+        now = time.time()
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - session.last_used < self.ttl:
+                break
+            del self._sessions[key]
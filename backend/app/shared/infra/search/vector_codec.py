@@ -0,0 +1,137 @@
+import json
+import logging
+import warnings
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_text(body: str) -> np.ndarray:
+    """쉼표로 구분된 숫자 텍스트를 float32 배열로 파싱 (중간에 멈추면 짧은 배열 반환)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return np.fromstring(body, dtype=np.float32, sep=',')
+
+
+def decode_vector(value: Any) -> Optional[np.ndarray]:
+    """pgvector 값(`[..]` 텍스트, JSON 문자열 또는 리스트)을 float32 배열로 변환 (실패 시 None)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        text = value.strip()
+        if not (text.startswith('[') and text.endswith(']')):
+            return None
+        body = text[1:-1]
+        if not body.strip():
+            return None
+        vector = _parse_text(body)
+        # 숫자가 아닌 값이 섞이면 fromstring이 중간에서 멈추므로 원소 수로 검증
+        if vector.size != body.count(',') + 1:
+            try:
+                vector = np.asarray(json.loads(text), dtype=np.float32)
+            except (ValueError, TypeError):
+                return None
+        return vector if vector.ndim == 1 and vector.size else None
+    try:
+        vector = np.asarray(value, dtype=np.float32)
+    except (ValueError, TypeError):
+        return None
+    return vector if vector.ndim == 1 and vector.size else None
+
+
+def _text_length(value: Any) -> int:
+    """`[..]` 텍스트의 원소 수 (쉼표 개수로 계산, 형식이 다르면 -1)"""
+    text = value.strip()
+    if not (text.startswith('[') and text.endswith(']')) or len(text) == 2:
+        return -1
+    return text.count(',') + 1
+
+
+def decode_vectors(values: Sequence[Any], dim: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """pgvector 값 배치를 (n_valid, dim) float32 행렬과 유효 행 마스크로 일괄 변환
+
+    차원은 배치당 한 번 검증합니다. `dim`이 없으면 첫 번째 유효 벡터의 차원을 사용하며,
+    차원이 다르거나 파싱할 수 없는 행은 마스크에서 제외됩니다.
+    텍스트 값은 유효 행을 하나의 문자열로 이어 `np.fromstring` 한 번으로 파싱합니다.
+    """
+    n = len(values)
+    is_text = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=n)
+    lengths = np.full(n, -1, dtype=np.int64)
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        if is_text[i]:
+            lengths[i] = _text_length(value)
+        elif isinstance(value, (list, tuple, np.ndarray)):
+            lengths[i] = len(value)
+
+    if dim is None:
+        valid_lengths = lengths[lengths > 0]
+        if valid_lengths.size == 0:
+            return np.empty((0, 0), dtype=np.float32), np.zeros(n, dtype=bool)
+        dim = int(valid_lengths[0])
+
+    mask = lengths == dim
+    matrix = np.empty((int(mask.sum()), dim), dtype=np.float32)
+
+    text_rows = np.flatnonzero(mask & is_text)
+    list_rows = np.flatnonzero(mask & ~is_text)
+    positions = np.cumsum(mask) - 1
+
+    if text_rows.size:
+        body = ",".join(values[i].strip()[1:-1] for i in text_rows)
+        flat = _parse_text(body)
+        if flat.size == text_rows.size * dim:
+            matrix[positions[text_rows]] = flat.reshape(-1, dim)
+        else:
+            # 잘못된 값이 섞인 배치: 행 단위로 다시 파싱하여 문제 행만 제외
+            for i in text_rows:
+                vector = decode_vector(values[i])
+                if vector is None or vector.size != dim:
+                    mask[i] = False
+                else:
+                    matrix[positions[i]] = vector
+
+    if list_rows.size:
+        try:
+            matrix[positions[list_rows]] = np.asarray([values[i] for i in list_rows], dtype=np.float32)
+        except (ValueError, TypeError):
+            for i in list_rows:
+                vector = decode_vector(values[i])
+                if vector is None or vector.size != dim:
+                    mask[i] = False
+                else:
+                    matrix[positions[i]] = vector
+
+    # 행 단위 재파싱에서 제외된 행이 있으면 해당 위치를 제거
+    kept = mask[np.flatnonzero(lengths == dim)]
+    if not kept.all():
+        matrix = matrix[kept]
+    return matrix, mask
+
+
+def decode_embedding_rows(rows: Sequence[dict], column: str = 'combined_embedding',
+                          dim: Optional[int] = None,
+                          batch_size: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+    """행 목록의 임베딩 컬럼을 페이지(batch_size) 단위로 일괄 변환
+
+    첫 배치에서 정한 차원을 이후 배치에도 적용하며,
+    (float32 행렬, 원래 행 순서 기준 유효 행 마스크)를 반환합니다.
+    """
+    matrices: List[np.ndarray] = []
+    masks: List[np.ndarray] = []
+    for start in range(0, len(rows), batch_size):
+        batch = [row.get(column) for row in rows[start:start + batch_size]]
+        matrix, mask = decode_vectors(batch, dim)
+        if dim is None and matrix.shape[0]:
+            dim = matrix.shape[1]
+        matrices.append(matrix)
+        masks.append(mask)
+
+    if not masks:
+        return np.empty((0, dim or 0), dtype=np.float32), np.zeros(0, dtype=bool)
+    dim = dim or 0
+    matrices = [matrix if matrix.shape[0] else np.empty((0, dim), dtype=np.float32) for matrix in matrices]
+    return np.concatenate(matrices), np.concatenate(masks)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+IVF 근사 검색 재현율/지연 시간 벤치마크
+스냅샷의 각 분야에 대해 전체 검색(brute-force) 대비 nprobe별 recall@k와 평균 지연 시간을 측정합니다.
+쿼리는 코퍼스 벡터에 가우시안 잡음을 더해 생성합니다.
+
+사용 예:
+    python benchmark_ann_recall.py --snapshot ./embedding_snapshot --k 10 --nprobe 1 2 4 8 16 32
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(__file__))
+
+from app.shared.infra.search.embedding_snapshot import load_snapshots
+
+
+def make_queries(index, count: int, noise: float, seed: int) -> np.ndarray:
+    """코퍼스 벡터에 잡음을 더한 쿼리 생성"""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(index.size, min(count, index.size), replace=False)
+    vectors = np.asarray(index.matrix[np.sort(rows)], dtype=np.float32)
+    if index.scales is not None:
+        vectors = vectors * index.scales[np.sort(rows)][:, None]
+    return vectors + rng.normal(scale=noise / np.sqrt(index.dim), size=vectors.shape).astype(np.float32)
+
+
+def run_benchmark(index, queries: np.ndarray, k: int, nprobe: int):
+    """(평균 지연 시간 ms, 검색 결과 목록) 반환"""
+    results = []
+    start_time = time.perf_counter()
+    for query in queries:
+        results.append([paper_id for paper_id, _ in index.search(query, limit=k, nprobe=nprobe)])
+    elapsed_ms = (time.perf_counter() - start_time) * 1000 / len(queries)
+    return elapsed_ms, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF recall@k 벤치마크")
+    parser.add_argument("--snapshot", required=True, help="임베딩 스냅샷 디렉토리")
+    parser.add_argument("--k", type=int, default=10, help="recall@k의 k")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32], help="측정할 nprobe 값들")
+    parser.add_argument("--queries", type=int, default=200, help="쿼리 수")
+    parser.add_argument("--noise", type=float, default=0.5, help="쿼리 잡음 크기 (L2 기준)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    args = parser.parse_args()
+
+    indexes = load_snapshots(args.snapshot)
+    for field, index in indexes.items():
+        if index.ann is None:
+            print(f"⚠️  {field}: IVF 인덱스가 없습니다. build_ivf_index.py를 먼저 실행해주세요.")
+            continue
+
+        queries = make_queries(index, args.queries, args.noise, args.seed)
+        exact_ms, exact_results = run_benchmark(index, queries, args.k, nprobe=0)
+
+        print(f"\n📊 {field}: {index.size}개 논문, {index.ann.n_lists}개 목록, {len(queries)}개 쿼리")
+        print(f"{'nprobe':>8} {'recall@' + str(args.k):>10} {'latency(ms)':>12} {'speedup':>8}")
+        print(f"{'exact':>8} {1.0:>10.3f} {exact_ms:>12.2f} {1.0:>8.1f}")
+
+        for nprobe in args.nprobe:
+            ann_ms, ann_results = run_benchmark(index, queries, args.k, nprobe=nprobe)
+            hits = sum(len(set(exact) & set(ann)) for exact, ann in zip(exact_results, ann_results))
+            recall = hits / max(1, sum(len(exact) for exact in exact_results))
+            print(f"{nprobe:>8} {recall:>10.3f} {ann_ms:>12.2f} {exact_ms / ann_ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
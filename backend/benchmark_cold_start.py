@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Lambda 콜드 스타트 벤치마크 스크립트
+새 프로세스에서 lambda_handler를 import하여 초기화 시간, 첫 요청 시간, 웜 요청 시간을 측정합니다.
+라우터 즉시/지연 import와 스냅샷 번들 사용 여부를 조합하여 비교합니다.
+
+사용 예:
+    python benchmark_cold_start.py
+    python benchmark_cold_start.py --runs 5 --path /api/v1/labs/health --bundle lambda_snapshot.tar.gz
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# 자식 프로세스에서 실행할 측정 코드 (결과는 마지막 줄에 JSON으로 출력)
+CHILD_CODE = r"""
+import json, sys, time
+start = time.time()
+import lambda_handler
+init_seconds = time.time() - start
+
+def http_event(path):
+    return {
+        "version": "2.0", "routeKey": "$default", "rawPath": path, "rawQueryString": "",
+        "headers": {"host": "localhost"},
+        "requestContext": {"http": {"method": "GET", "path": path, "sourceIp": "127.0.0.1", "protocol": "HTTP/1.1"},
+                           "stage": "$default"},
+        "isBase64Encoded": False,
+    }
+
+path = sys.argv[1]
+start = time.time()
+response = lambda_handler.handler(http_event(path), None)
+first_seconds = time.time() - start
+start = time.time()
+lambda_handler.handler(http_event(path), None)
+warm_seconds = time.time() - start
+start = time.time()
+lambda_handler.handler({"warmup": True}, None)
+warmup_seconds = time.time() - start
+print(json.dumps({"init": init_seconds, "first": first_seconds, "warm": warm_seconds,
+                  "warmup": warmup_seconds, "status": response.get("statusCode")}))
+"""
+
+
+def run_once(path: str, lazy: bool, bundle: str) -> dict:
+    """새 프로세스에서 한 번 측정"""
+    env = dict(os.environ)
+    env["AWS_LAMBDA_FUNCTION_NAME"] = env.get("AWS_LAMBDA_FUNCTION_NAME", "cvpilot-benchmark")
+    env["LAZY_ROUTER_IMPORTS"] = "true" if lazy else "false"
+    # 매번 새로 압축 해제하도록 별도 /tmp 경로 사용
+    env["TMPDIR"] = tempfile.mkdtemp(prefix="cold-start-")
+    if bundle:
+        env["LAMBDA_SNAPSHOT_BUNDLE"] = os.path.abspath(bundle)
+    else:
+        env["LAMBDA_SNAPSHOT_BUNDLE"] = os.path.join(env["TMPDIR"], "missing.tar.gz")
+
+    result = subprocess.run([sys.executable, "-c", CHILD_CODE, path], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lambda 콜드 스타트 벤치마크")
+    parser.add_argument("--runs", type=int, default=3, help="설정별 반복 횟수")
+    parser.add_argument("--path", default="/health", help="첫 요청 경로")
+    parser.add_argument("--bundle", default=None, help="스냅샷 번들 경로 (지정 시 번들 사용 설정도 측정)")
+    args = parser.parse_args()
+
+    configs = [("즉시 import", False, None), ("지연 import", True, None)]
+    if args.bundle:
+        configs += [("즉시 import + 번들", False, args.bundle), ("지연 import + 번들", True, args.bundle)]
+
+    print(f"🚀 콜드 스타트 벤치마크: {args.path}, {args.runs}회 반복 (중앙값, 초)")
+    print(f"{'설정':<20} {'초기화':>8} {'첫 요청':>8} {'웜 요청':>8} {'웜업 핑':>8}")
+    for name, lazy, bundle in configs:
+        results = [run_once(args.path, lazy, bundle) for _ in range(args.runs)]
+        median = {key: statistics.median(r[key] for r in results) for key in ("init", "first", "warm", "warmup")}
+        print(f"{name:<20} {median['init']:>8.3f} {median['first']:>8.3f} {median['warm']:>8.4f} {median['warmup']:>8.3f}"
+              f"  (status {results[-1]['status']})")
+
+
+if __name__ == "__main__":
+    main()
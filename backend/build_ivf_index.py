@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+IVF 근사 최근접 이웃 인덱스 생성 스크립트
+export_embedding_snapshot.py로 만든 스냅샷의 각 분야 샤드에 IVF 파일을 추가합니다.
+검색 시 탐색 목록 수는 EMBEDDING_ANN_NPROBE 환경변수로 조정합니다.
+
+사용 예:
+    python build_ivf_index.py --snapshot ./embedding_snapshot
+    python build_ivf_index.py --snapshot ./embedding_snapshot --lists 1024 --iter 25
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(__file__))
+
+from app.shared.infra.search.embedding_snapshot import load_snapshots
+from app.shared.infra.search.ivf_index import IVFIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF 근사 검색 인덱스 생성")
+    parser.add_argument("--snapshot", required=True, help="임베딩 스냅샷 디렉토리")
+    parser.add_argument("--lists", type=int, default=None, help="IVF 목록 수 (기본값: sqrt(논문 수))")
+    parser.add_argument("--iter", type=int, default=20, help="k-means 반복 횟수")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    args = parser.parse_args()
+
+    indexes = load_snapshots(args.snapshot)
+    if not indexes:
+        print(f"❌ 스냅샷을 찾을 수 없습니다: {args.snapshot}")
+        sys.exit(1)
+
+    for field, index in indexes.items():
+        start_time = time.time()
+        ivf = IVFIndex.build(index, n_lists=args.lists, n_iter=args.iter, seed=args.seed)
+        ivf.save(index.snapshot_path)
+        print(f"✅ {field}: {index.size}개 논문, {ivf.n_lists}개 목록 ({time.time() - start_time:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Lambda 스냅샷 번들 생성 스크립트
+분야별 임베딩 스냅샷과 professors 테이블(연구실 카탈로그)을 하나의 tar.gz로 묶습니다.
+Dockerfile.lambda가 번들을 이미지에 포함하면 lambda_handler가 콜드 스타트 시 /tmp에 풀어
+Supabase 전체 조회 없이 임베딩 인덱스와 연구실 데이터를 사용합니다.
+
+사용 예:
+    python build_lambda_snapshot.py
+    python build_lambda_snapshot.py --output lambda_snapshot.tar.gz --dtype int8
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(__file__))
+
+from app.shared.infra.external.supabase_client import supabase_client
+from app.shared.infra.search.embedding_snapshot import SNAPSHOT_DTYPES
+from app.shared.infra.search.lambda_snapshot import BUNDLE_NAME, write_bundle
+from export_embedding_snapshot import export_snapshots
+
+
+async def build_bundle(output_path: str, fields, dtype: str):
+    """임베딩 스냅샷과 연구실 카탈로그를 번들로 저장"""
+    start_time = time.time()
+    with tempfile.TemporaryDirectory() as embeddings_dir:
+        await export_snapshots(embeddings_dir, fields, dtype)
+
+        # LabSearchService와 같은 조회 (professors 전체 행)
+        result = await supabase_client.run_query(supabase_client.client.table("professors").select("*"))
+        professors = result.data
+        print(f"✅ 연구실 카탈로그: {len(professors)}명의 교수")
+
+        write_bundle(output_path, embeddings_dir, professors)
+
+    size_mb = os.path.getsize(output_path) / (1024 * 1024)
+    print(f"📦 번들 생성 완료: {output_path} ({size_mb:.1f}MB, {time.time() - start_time:.1f}초)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lambda 스냅샷 번들 생성")
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), BUNDLE_NAME),
+                        help="번들 파일 경로")
+    parser.add_argument("--field", action="append", default=[], help="포함할 분야 (여러 번 지정 가능, 기본값: 전체 분야)")
+    parser.add_argument("--dtype", choices=SNAPSHOT_DTYPES, default="float16", help="임베딩 저장 형식")
+    args = parser.parse_args()
+
+    asyncio.run(build_bundle(args.output, args.field, args.dtype))
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,16 @@ fi
 echo "📦 ECR 리포지토리 확인/생성 중..."
 aws ecr create-repository --repository-name $ECR_REPO --region $AWS_REGION 2>/dev/null || echo "✅ ECR 리포지토리가 이미 존재합니다."
 
+# 2-1. 스냅샷 번들 생성 (선택, BUILD_LAMBDA_SNAPSHOT=1)
+if [ "$BUILD_LAMBDA_SNAPSHOT" = "1" ]; then
+    echo "📦 Lambda 스냅샷 번들 생성 중..."
+    python build_lambda_snapshot.py --output lambda_snapshot.tar.gz
+    if [ $? -ne 0 ]; then
+        echo "❌ 스냅샷 번들 생성 실패"
+        exit 1
+    fi
+fi
+
 # 3. Docker 이미지 빌드 (x86_64 아키텍처 강제 지정)
 echo "🐳 Docker 이미지 빌드 중..."
 docker buildx create --use --name cvpilot-builder || docker buildx use cvpilot-builder
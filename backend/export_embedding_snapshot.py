@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+논문 임베딩 스냅샷 내보내기 스크립트
+Supabase papers 테이블의 combined_embedding을 분야별 .npy 샤드로 저장합니다.
+백엔드는 EMBEDDING_SNAPSHOT_DIR 환경변수로 지정된 디렉토리를 시작 시 메모리 매핑합니다.
+
+사용 예:
+    python export_embedding_snapshot.py --output ./embedding_snapshot
+    python export_embedding_snapshot.py --output ./embedding_snapshot --dtype int8 --field "Computer Vision (CV)"
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(__file__))
+
+from app.shared.infra.external.supabase_client import supabase_client
+from app.shared.infra.search.embedding_index import EmbeddingIndex
+from app.shared.infra.search.embedding_snapshot import SNAPSHOT_DTYPES, write_snapshot
+
+
+async def export_snapshots(output_dir: str, fields, dtype: str):
+    """분야별 임베딩 스냅샷 내보내기"""
+    if not supabase_client.client:
+        print("❌ Supabase 연결이 없습니다. SUPABASE_URL과 SUPABASE_KEY를 설정해주세요.")
+        sys.exit(1)
+
+    if not fields:
+        fields = await supabase_client.get_available_fields()
+
+    print(f"📦 임베딩 스냅샷 내보내기: {len(fields)}개 분야, dtype={dtype}")
+    for field in fields:
+        start_time = time.time()
+        rows = await supabase_client._load_embedding_rows(field)
+        index = EmbeddingIndex.from_rows(rows)
+        # 증분 동기화(EMBEDDING_SYNC_INTERVAL)는 이 워터마크 이후 변경분부터 반영
+        index.watermark = supabase_client.rows_watermark(rows)
+        if index.size == 0:
+            print(f"⚠️  {field}: 임베딩이 있는 논문이 없어 건너뜁니다.")
+            continue
+
+        shard_dir = write_snapshot(index, field, output_dir, dtype=dtype)
+        print(f"✅ {field}: {index.size}개 논문 ({index.dim}차원) -> {shard_dir} ({time.time() - start_time:.1f}초)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="논문 임베딩 스냅샷 내보내기")
+    parser.add_argument("--output", required=True, help="스냅샷을 저장할 디렉토리")
+    parser.add_argument("--field", action="append", default=[], help="내보낼 분야 (여러 번 지정 가능, 기본값: 전체 분야)")
+    parser.add_argument("--dtype", choices=SNAPSHOT_DTYPES, default="float16", help="임베딩 저장 형식")
+    args = parser.parse_args()
+
+    asyncio.run(export_snapshots(args.output, args.field, args.dtype))
+
+
+if __name__ == "__main__":
+    main()
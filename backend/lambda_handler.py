@@ -1,15 +1,94 @@
+import asyncio
+import logging
 import os
+import time
+
+_init_start = time.time()
+
 from mangum import Mangum
-from app.main import app
+from app.shared.infra.search.lambda_snapshot import EMBEDDINGS_DIR, extract_bundle
+
+logger = logging.getLogger(__name__)
+
+# 콜드 스타트 시 한 번만 실행 (웜 인보케이션에서는 모듈 상태와 /tmp를 재사용)
+# 스냅샷 번들을 /tmp에 풀고 임베딩 스냅샷/연구실 카탈로그 경로를 지정
+try:
+    snapshot_dir = extract_bundle()
+except Exception as e:
+    logger.error(f"스냅샷 번들 압축 해제 실패: {e}")
+    snapshot_dir = None
+
+if snapshot_dir:
+    os.environ["LAMBDA_SNAPSHOT_DIR"] = snapshot_dir
+    embeddings_dir = os.path.join(snapshot_dir, EMBEDDINGS_DIR)
+    if os.path.isdir(embeddings_dir):
+        os.environ.setdefault("EMBEDDING_SNAPSHOT_DIR", embeddings_dir)
+
+from app.main import app, register_all_routers
+from app.shared.infra.external.supabase_client import supabase_client
+
+try:
+    supabase_client.load_embedding_snapshots()
+except Exception as e:
+    logger.error(f"임베딩 스냅샷 로드 실패: {e}")
+
+# Mangum과 웜업이 함께 사용할 이벤트 루프 (Mangum은 현재 스레드에 설정된 루프에서 요청을 실행)
+# 핸들러는 실행 중인 이벤트 루프 밖에서 호출되어야 함 (Lambda 런타임은 동기 호출)
+event_loop = asyncio.new_event_loop()
+asyncio.set_event_loop(event_loop)
+
+# Mangum 어댑터는 모듈 수준에서 한 번만 생성
+# lifespan을 끄면 인보케이션마다 startup/shutdown 이벤트가 돌지 않아 HTTP 연결 풀이 유지됨
+# (스냅샷 로드는 위에서 직접 수행, 증분 동기화 태스크는 인보케이션 사이에 멈추므로 사용하지 않음)
+asgi_handler = Mangum(app, lifespan="off")
+
+INIT_DURATION = time.time() - _init_start
+logger.info(f"Lambda 초기화 완료: {INIT_DURATION:.2f}초 (스냅샷 번들: {snapshot_dir or '없음'})")
+
+_warmed = False
+
+
+def is_warmup_event(event) -> bool:
+    """웜업 핑 이벤트 여부 ({"warmup": true}, EventBridge 스케줄 이벤트, serverless-plugin-warmup)"""
+    if not isinstance(event, dict):
+        return False
+    return bool(event.get("warmup")) or event.get("source") in ("aws.events", "serverless-plugin-warmup")
+
+
+def warm_up():
+    """모든 라우터 등록과 연구실 카탈로그 로드를 미리 수행 (성공할 때까지 핑마다 재시도)
+
+    연구실 데이터를 불러오지 못하면 503을 반환하여 실패한 웜업이 드러나도록 합니다.
+    """
+    global _warmed
+    start_time = time.time()
+    if not _warmed:
+        register_all_routers()
+        from app.shared.api.routes.lab_search_routes import lab_search_service
+        if not lab_search_service.labs_data:
+            lab_search_service.labs_data = event_loop.run_until_complete(lab_search_service._load_labs_data())
+        _warmed = bool(lab_search_service.labs_data)
+        if not _warmed:
+            logger.warning("웜업 중 연구실 데이터를 불러오지 못했습니다 (다음 웜업 핑에서 다시 시도)")
+    return {
+        "statusCode": 200 if _warmed else 503,
+        "body": "warm" if _warmed else "warm-up incomplete",
+        "init_seconds": round(INIT_DURATION, 3),
+        "warmup_seconds": round(time.time() - start_time, 3),
+        "embedding_indexes": len(supabase_client._embedding_indexes),
+        "snapshot_dir": snapshot_dir
+    }
+
 
 # Lambda 핸들러 (CORS 헤더 추가)
 def handler(event, context):
-    # Mangum을 통해 FastAPI 앱을 Lambda 호환으로 변환
-    asgi_handler = Mangum(app)
-    
+    # 웜업 핑은 앱을 거치지 않고 바로 응답
+    if is_warmup_event(event):
+        return warm_up()
+
     # Lambda 이벤트 처리
     response = asgi_handler(event, context)
-    
+
     # CORS 헤더 추가
     if isinstance(response, dict) and 'headers' in response:
         response['headers'].update({
@@ -23,5 +102,5 @@ def handler(event, context):
             'Access-Control-Allow-Methods': ['GET, POST, PUT, DELETE, OPTIONS'],
             'Access-Control-Allow-Headers': ['Content-Type', 'Authorization', 'X-API-Key'],
         })
-    
-    return response 
\ No newline at end of file
+
+    return response
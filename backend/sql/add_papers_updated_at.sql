@@ -0,0 +1,28 @@
+-- papers 테이블 증분 동기화용 updated_at 컬럼
+-- 백엔드는 EMBEDDING_SYNC_INTERVAL 설정 시 (updated_at, id) 워터마크 이후 변경된 행만 주기적으로 조회합니다.
+-- NOW()는 트랜잭션 시작 시각이라 긴 트랜잭션의 행이 워터마크보다 과거 시각으로 커밋될 수 있으므로
+-- 실제 기록 시각(clock_timestamp)을 사용하고, 백엔드는 워터마크에서 EMBEDDING_SYNC_LOOKBACK만큼 앞부터 다시 조회합니다.
+
+ALTER TABLE papers ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT clock_timestamp();
+ALTER TABLE papers ALTER COLUMN updated_at SET DEFAULT clock_timestamp();
+UPDATE papers SET updated_at = clock_timestamp() WHERE updated_at IS NULL;
+ALTER TABLE papers ALTER COLUMN updated_at SET NOT NULL;
+
+-- 워터마크 키셋 페이지네이션용 인덱스
+CREATE INDEX IF NOT EXISTS idx_papers_updated_at_id ON papers(updated_at, id);
+
+-- updated_at 자동 업데이트를 위한 트리거 함수 (podcast_analyses의 NOW() 기반 함수와 분리)
+CREATE OR REPLACE FUNCTION update_papers_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = clock_timestamp();
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- 임베딩 생성 등으로 행이 수정될 때마다 updated_at 갱신
+DROP TRIGGER IF EXISTS update_papers_updated_at ON papers;
+CREATE TRIGGER update_papers_updated_at
+    BEFORE UPDATE ON papers
+    FOR EACH ROW
+    EXECUTE FUNCTION update_papers_updated_at_column();
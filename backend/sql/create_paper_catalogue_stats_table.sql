@@ -0,0 +1,66 @@
+-- 논문 카탈로그 집계 테이블 생성
+-- (분야, 학회, 연도)별 논문 수를 미리 집계하여 학회 목록/분야 통계 조회에 사용
+CREATE TABLE IF NOT EXISTS paper_catalogue_stats (
+    field TEXT NOT NULL DEFAULT '',
+    conference TEXT NOT NULL DEFAULT '',
+    year INTEGER NOT NULL DEFAULT 0,
+    paper_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (field, conference, year)
+);
+
+-- RLS (Row Level Security) 활성화
+ALTER TABLE paper_catalogue_stats ENABLE ROW LEVEL SECURITY;
+
+-- 모든 사용자가 읽기 가능하도록 정책 설정 (쓰기는 아래 트리거/함수로만 수행)
+DROP POLICY IF EXISTS "Enable read access for all users" ON paper_catalogue_stats;
+CREATE POLICY "Enable read access for all users" ON paper_catalogue_stats
+    FOR SELECT USING (true);
+
+-- 전체 재집계 함수 (최초 생성 시 또는 대량 적재 후 호출)
+CREATE OR REPLACE FUNCTION refresh_paper_catalogue_stats()
+RETURNS void AS $$
+BEGIN
+    DELETE FROM paper_catalogue_stats;
+    INSERT INTO paper_catalogue_stats (field, conference, year, paper_count)
+    SELECT COALESCE(field, ''), COALESCE(conference, ''), COALESCE(year, 0), COUNT(*)
+    FROM papers
+    GROUP BY 1, 2, 3;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 증분 반영 함수
+CREATE OR REPLACE FUNCTION apply_paper_catalogue_delta(p_field TEXT, p_conference TEXT, p_year INTEGER, p_delta INTEGER)
+RETURNS void AS $$
+BEGIN
+    INSERT INTO paper_catalogue_stats (field, conference, year, paper_count)
+    VALUES (COALESCE(p_field, ''), COALESCE(p_conference, ''), COALESCE(p_year, 0), GREATEST(p_delta, 0))
+    ON CONFLICT (field, conference, year) DO UPDATE
+        SET paper_count = GREATEST(paper_catalogue_stats.paper_count + p_delta, 0),
+            updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- papers 변경 시 집계를 증분 갱신하는 트리거 함수
+CREATE OR REPLACE FUNCTION track_paper_catalogue_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_paper_catalogue_delta(NEW.field, NEW.conference, NEW.year, 1);
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        PERFORM apply_paper_catalogue_delta(OLD.field, OLD.conference, OLD.year, -1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 트리거 생성
+DROP TRIGGER IF EXISTS track_papers_catalogue_stats ON papers;
+CREATE TRIGGER track_papers_catalogue_stats
+    AFTER INSERT OR DELETE OR UPDATE OF field, conference, year ON papers
+    FOR EACH ROW
+    EXECUTE FUNCTION track_paper_catalogue_stats();
+
+-- 초기 집계
+SELECT refresh_paper_catalogue_stats();
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+BM25 색인 / RRF 결합 테스트
+"""
+
+import math
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+
+sys.path.append(os.path.dirname(__file__))
+
+from app.shared.infra.search.bm25_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+ROWS = [
+    {"id": 10, "title": "Vision Transformer for image classification", "abstract": "We train transformer models on images."},
+    {"id": 11, "title": "Diffusion models", "abstract": "Image generation with diffusion and transformer backbones."},
+    {"id": 12, "title": "Graph neural networks", "abstract": "Message passing for molecules."},
+    {"id": 13, "title": "Efficient transformer inference", "abstract": "Quantization of large language models."},
+    {"id": 14, "title": "강화학습 기반 로봇 제어", "abstract": "로봇 제어를 위한 강화학습 정책"},
+]
+
+
+def brute_force_bm25(rows, query, k1=1.2, b=0.75, title_boost=2):
+    """문서마다 BM25 식을 그대로 계산한 기준값"""
+    docs = [tokenize(row["title"]) * title_boost + tokenize(row["abstract"]) for row in rows]
+    avg_length = sum(len(doc) for doc in docs) / len(docs)
+    df = Counter(token for doc in docs for token in set(doc))
+    scores = []
+    for doc in docs:
+        tf = Counter(doc)
+        score = 0.0
+        for token in set(tokenize(query)):
+            if token not in tf:
+                continue
+            idf = math.log(1.0 + (len(docs) - df[token] + 0.5) / (df[token] + 0.5))
+            norm = k1 * (1.0 - b + b * len(doc) / avg_length)
+            score += idf * tf[token] * (k1 + 1.0) / (tf[token] + norm)
+        scores.append(score)
+    return scores
+
+
+def test_scores_match_brute_force():
+    """게시 목록 누적 점수가 문서별 BM25 식과 같은지 확인"""
+    index = BM25Index.from_rows(ROWS)
+    for query in ["transformer image", "diffusion", "강화학습 로봇", "unknown words"]:
+        np.testing.assert_allclose(index.scores(query), brute_force_bm25(ROWS, query), rtol=1e-5)
+
+
+def test_search_ranks_by_score_and_skips_zero():
+    """점수 내림차순으로 반환하고 점수 0인 문서는 제외"""
+    index = BM25Index.from_rows(ROWS)
+    results = index.search("transformer", limit=10)
+    expected = sorted(
+        ((row["id"], score) for row, score in zip(ROWS, brute_force_bm25(ROWS, "transformer")) if score > 0),
+        key=lambda item: item[1], reverse=True
+    )
+    assert [paper_id for paper_id, _ in results] == [paper_id for paper_id, _ in expected]
+
+
+def test_allowed_ids_matches_post_filter():
+    """allowed_ids 제한 검색 결과가 전체 검색 후 걸러낸 결과와 같은지 확인"""
+    index = BM25Index.from_rows(ROWS)
+    allowed = np.array([11, 13], dtype=np.int64)
+    unrestricted = index.search("transformer image", limit=10)
+    restricted = index.search("transformer image", limit=10, allowed_ids=allowed)
+    assert restricted == [(paper_id, score) for paper_id, score in unrestricted if paper_id in allowed]
+
+
+def test_reciprocal_rank_fusion_prefers_agreement():
+    """두 목록 모두 상위에 있는 문서가 한쪽에만 1위인 문서보다 앞서는지 확인"""
+    fused = reciprocal_rank_fusion([[1, 2, 3], [2, 4, 1]])
+    assert [paper_id for paper_id, _ in fused][:2] == [2, 1]
+    assert {paper_id for paper_id, _ in fused} == {1, 2, 3, 4}
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+임베딩 인덱스 증분 동기화(apply_delta) 테스트
+"""
+
+import asyncio
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(__file__))
+
+from app.shared.infra.search.embedding_index import EmbeddingIndex
+from app.shared.infra.search.ivf_index import IVFIndex
+
+DIM = 16
+
+
+def make_rows(ids, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "id": paper_id,
+            "conference": ["CVPR", "ICML", "ACL"][paper_id % 3],
+            "year": 2020 + paper_id % 5,
+            "field": ["Computer Vision", "NLP"][paper_id % 2],
+            "combined_embedding": rng.standard_normal(DIM).tolist(),
+        }
+        for paper_id in ids
+    ]
+
+
+def snapshot_index(rows, dtype=np.float16, n_lists=4):
+    """스냅샷에서 로드한 것과 같은 형태 (저정밀도 행렬, 스냅샷 경로, IVF 목록)"""
+    built = EmbeddingIndex.from_rows(rows)
+    index = EmbeddingIndex(built.paper_ids, built.matrix.astype(dtype),
+                           conferences=built.conferences, conference_offsets=built.conference_offsets,
+                           snapshot_path="/snapshots/shard-0", years=built.years,
+                           fields=built.fields, field_codes=built.field_codes)
+    index.ann = IVFIndex.build(built, n_lists=n_lists)
+    return index
+
+
+def assert_ann_covers_all_rows(index):
+    assert index.ann is not None
+    assert sorted(index.ann.list_rows.tolist()) == list(range(index.size))
+    assert index.ann.list_offsets[-1] == index.size
+
+
+def assert_matches_rebuild(index, rows):
+    """변경분을 반영한 인덱스가 같은 행으로 새로 만든 인덱스와 같은 결과를 내는지 확인"""
+    expected = EmbeddingIndex.from_rows(rows)
+    assert sorted(index.paper_ids.tolist()) == sorted(expected.paper_ids.tolist())
+    query = np.random.default_rng(9).standard_normal(DIM)
+    results = index.search(query, limit=5, nprobe=index.ann.n_lists)
+    reference = expected.search(query, limit=5)
+    assert [paper_id for paper_id, _ in results] == [paper_id for paper_id, _ in reference]
+    np.testing.assert_allclose([s for _, s in results], [s for _, s in reference], atol=1e-2)
+
+
+def test_apply_delta_replaces_changed_rows():
+    """변경 행은 교체, 삭제 행은 제거, 새 행은 추가되고 dtype/IVF 목록/스냅샷 경로가 유지되는지 확인"""
+    rows = make_rows(range(1, 41))
+    index = snapshot_index(rows)
+
+    updated = make_rows([3, 50, 51], seed=1)
+    delta = index.apply_delta(updated, changed_ids=[3, 7, 50, 51])
+
+    current = [row for row in rows if row["id"] not in (3, 7)] + updated
+    assert delta.matrix.dtype == np.float16
+    assert delta.snapshot_path == index.snapshot_path
+    assert_ann_covers_all_rows(delta)
+    assert_matches_rebuild(delta, current)
+    # 기존 인덱스는 그대로 (copy-on-write)
+    assert index.size == 40 and 7 in index.paper_ids
+
+
+def test_apply_delta_on_empty_index_keeps_snapshot_and_ann():
+    """모든 행이 삭제된 뒤 다시 추가되어도 스냅샷 경로, 저장 dtype, IVF 목록이 유지되는지 확인"""
+    rows = make_rows(range(1, 21))
+    emptied = snapshot_index(rows).apply_delta([], changed_ids=range(1, 21))
+    assert emptied.size == 0
+    assert emptied.ann is not None
+
+    added = make_rows([100, 101, 102, 103], seed=2)
+    index = emptied.apply_delta(added, changed_ids=[100, 101, 102, 103])
+
+    assert index.snapshot_path == "/snapshots/shard-0"
+    assert index.matrix.dtype == np.float16
+    assert_ann_covers_all_rows(index)
+    assert_matches_rebuild(index, added)
+
+
+def test_apply_delta_on_empty_int8_index_quantizes_rows():
+    """int8 스냅샷의 빈 인덱스에 추가한 행도 행별 스케일과 함께 양자화되는지 확인"""
+    rows = make_rows(range(1, 21))
+    built = EmbeddingIndex.from_rows(rows)
+    from app.shared.infra.search.embedding_snapshot import quantize_int8
+    matrix, scales = quantize_int8(built.matrix)
+    index = EmbeddingIndex(built.paper_ids, matrix, scales=scales, snapshot_path="/snapshots/shard-1")
+    emptied = index.apply_delta([], changed_ids=range(1, 21))
+
+    added = make_rows([200, 201], seed=3)
+    result = emptied.apply_delta(added, changed_ids=[200, 201])
+    assert result.matrix.dtype == np.int8
+    assert result.scales is not None and result.scales.shape == (2,)
+    assert result.snapshot_path == "/snapshots/shard-1"
+
+
+def test_sync_applies_row_committed_below_watermark_within_lookback(monkeypatch):
+    """워터마크가 지나간 뒤 더 이른 updated_at으로 커밋된 행도 재조회 구간 안이면 반영되는지 확인"""
+    from datetime import datetime, timedelta, timezone
+    from app.shared.infra.external.supabase_client import SupabaseClient, _parse_timestamp
+
+    start = datetime(2026, 10, 17, 9, 0, tzinfo=timezone.utc)
+
+    def stamped(rows, seconds):
+        for row, offset in zip(rows, seconds):
+            row["updated_at"] = (start + timedelta(seconds=offset)).isoformat()
+        return rows
+
+    table = stamped(make_rows(range(1, 11)), range(1, 11))
+    reads = []
+
+    async def load_changed_rows(since):
+        """(updated_at, id) > since인 행을 순서대로 반환하는 가짜 키셋 조회"""
+        reads.append(since)
+        mark = (_parse_timestamp(since[0]), since[1])
+        return sorted((row for row in table if (_parse_timestamp(row["updated_at"]), row["id"]) > mark),
+                      key=lambda row: (_parse_timestamp(row["updated_at"]), row["id"]))
+
+    monkeypatch.setattr(SupabaseClient, "INDEX_SYNC_LOOKBACK", 300.0)
+    client = SupabaseClient()
+    client._load_changed_rows = load_changed_rows
+
+    async def load_embedding_rows(field):
+        return list(table)
+
+    client._load_embedding_rows = load_embedding_rows
+
+    async def scenario():
+        await client._build_embedding_index()
+        # 전체 로드에 포함된 행은 다시 반영하지 않음
+        assert await client.sync_embedding_indexes() == 0
+
+        # 빠른 트랜잭션의 행이 먼저 커밋되어 워터마크가 20초로 이동
+        table.extend(stamped(make_rows([11], seed=4), [20]))
+        assert await client.sync_embedding_indexes() == 1
+        assert client._embedding_indexes[""].watermark == (table[-1]["updated_at"], 11)
+
+        # 15초에 시작한 긴 트랜잭션이 그 뒤에 커밋됨 (워터마크 아래, 재조회 구간 안)
+        table.extend(stamped(make_rows([12], seed=5), [15]))
+        assert await client.sync_embedding_indexes() == 1
+        # 이미 반영한 행은 다시 반영하지 않음
+        assert await client.sync_embedding_indexes() == 0
+
+    asyncio.run(scenario())
+    synced = client._embedding_indexes[""]
+    assert 12 in synced.paper_ids.tolist() and synced.size == 12
+    assert synced.watermark[1] == 11
+    assert _parse_timestamp(reads[-1][0]) == start + timedelta(seconds=20 - 300)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+LLM 호출 우선순위 스케줄러 테스트
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+
+from app.shared.infra.external.llm_scheduler import (
+    PRIORITY_BATCH, PRIORITY_INTERACTIVE, PRIORITY_STANDARD, LLMScheduler, llm_priority
+)
+
+
+async def hold(scheduler, priority, release, admitted=None):
+    """슬롯을 받은 뒤 release 이벤트까지 유지"""
+    async with scheduler.slot(priority):
+        if admitted is not None:
+            admitted.append(priority)
+        await release.wait()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def class_stats(scheduler, priority):
+    return scheduler.stats()["classes"][priority]
+
+
+def test_interactive_gets_slot_while_batch_at_cap():
+    """batch 클래스가 상한에 걸려 대기 중이어도 대화형 호출은 바로 슬롯을 받는지 확인"""
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=4, class_concurrency={
+            PRIORITY_INTERACTIVE: 4, PRIORITY_STANDARD: 2, PRIORITY_BATCH: 2
+        })
+        release = asyncio.Event()
+        batch_tasks = [asyncio.create_task(hold(scheduler, PRIORITY_BATCH, release)) for _ in range(5)]
+        await settle()
+        assert class_stats(scheduler, PRIORITY_BATCH)["running"] == 2
+        assert class_stats(scheduler, PRIORITY_BATCH)["queued"] == 3
+
+        async with scheduler.slot(PRIORITY_INTERACTIVE) as wait:
+            assert wait < 0.05
+            assert class_stats(scheduler, PRIORITY_INTERACTIVE)["running"] == 1
+            # 대화형 호출이 빈 슬롯을 썼다고 batch 대기 호출이 상한을 넘어 배정되지는 않음
+            assert class_stats(scheduler, PRIORITY_BATCH)["running"] == 2
+
+        release.set()
+        await asyncio.wait_for(asyncio.gather(*batch_tasks), timeout=1)
+        stats = class_stats(scheduler, PRIORITY_BATCH)
+        assert stats["running"] == 0 and stats["queued"] == 0 and stats["admitted"] == 5
+
+    asyncio.run(scenario())
+
+
+def test_freed_slot_goes_to_highest_priority_waiter():
+    """빈 슬롯은 먼저 온 standard 호출보다 나중에 온 대화형 호출에 먼저 배정되는지 확인"""
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=1, class_concurrency={
+            PRIORITY_INTERACTIVE: 1, PRIORITY_STANDARD: 1, PRIORITY_BATCH: 1
+        })
+        first, rest = asyncio.Event(), asyncio.Event()
+        admitted = []
+        holder = asyncio.create_task(hold(scheduler, PRIORITY_BATCH, first))
+        await settle()
+        waiters = [asyncio.create_task(hold(scheduler, PRIORITY_STANDARD, rest, admitted))]
+        await settle()
+        waiters.append(asyncio.create_task(hold(scheduler, PRIORITY_INTERACTIVE, rest, admitted)))
+        await settle()
+
+        first.set()
+        await holder
+        await settle()
+        assert admitted == [PRIORITY_INTERACTIVE]
+
+        rest.set()
+        await asyncio.wait_for(asyncio.gather(*waiters), timeout=1)
+        assert admitted == [PRIORITY_INTERACTIVE, PRIORITY_STANDARD]
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_leak_slot():
+    """대기 중 취소된 호출이 슬롯을 차지하지 않는지 확인"""
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=1, class_concurrency={
+            PRIORITY_INTERACTIVE: 1, PRIORITY_STANDARD: 1, PRIORITY_BATCH: 1
+        })
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(scheduler, PRIORITY_STANDARD, release))
+        await settle()
+        waiter = asyncio.create_task(hold(scheduler, PRIORITY_STANDARD, asyncio.Event()))
+        await settle()
+        waiter.cancel()
+        await settle()
+
+        release.set()
+        await holder
+        async with scheduler.slot(PRIORITY_STANDARD) as wait:
+            assert wait < 0.05
+        assert class_stats(scheduler, PRIORITY_STANDARD)["running"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_uses_context_priority():
+    """priority를 생략하면 llm_priority 블록의 우선순위를 사용하는지 확인"""
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=2)
+        with llm_priority(PRIORITY_BATCH):
+            async with scheduler.slot():
+                assert class_stats(scheduler, PRIORITY_BATCH)["running"] == 1
+        assert class_stats(scheduler, PRIORITY_BATCH)["admitted"] == 1
+
+    asyncio.run(scenario())
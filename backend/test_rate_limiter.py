@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+OpenAI 호출 재시도 / 요청 한도 테스트 (로컬 가짜 API 서버 사용)
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+from aiohttp import web
+
+sys.path.append(os.path.dirname(__file__))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from app.shared.infra.external import rate_limiter
+from app.shared.infra.external.http_session import close_http_session
+from app.shared.infra.external.llm_metrics import LLMCallRecord
+from app.shared.infra.external.openai_client import OpenAIClient
+
+CHAT_RESPONSE = {
+    "choices": [{"message": {"content": "ok"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 5, "completion_tokens": 1},
+}
+
+
+async def run_with_server(responses, scenario):
+    """응답 목록을 차례로 돌려주는 가짜 API 서버를 띄우고 scenario(client, hits) 실행"""
+    hits = []
+
+    async def handler(request):
+        hits.append(time.monotonic())
+        status, headers, body = responses[min(len(hits), len(responses)) - 1]
+        return web.json_response(body, status=status, headers=headers)
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        # 테스트마다 다른 API Key를 써서 키별 제한기 상태가 섞이지 않도록 함
+        client = OpenAIClient(api_key=f"test-key-{id(responses)}")
+        client.base_url = f"http://127.0.0.1:{port}/v1"
+        return await scenario(client, hits)
+    finally:
+        await close_http_session()
+        await runner.cleanup()
+
+
+def chat_data(client):
+    return {"model": client.model_name, "messages": [{"role": "user", "content": "hi"}], "max_tokens": 10}
+
+
+@pytest.fixture(autouse=True)
+def short_backoff(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "RETRY_BASE_DELAY", 0.01)
+
+
+def test_parse_retry_after_prefers_milliseconds():
+    assert rate_limiter.parse_retry_after({"retry-after-ms": "250", "retry-after": "3"}) == 0.25
+    assert rate_limiter.parse_retry_after({"retry-after": "2"}) == 2.0
+    assert rate_limiter.parse_retry_after({"retry-after": "Wed, 21 Oct 2026 07:28:00 GMT"}) is None
+    assert rate_limiter.parse_retry_after({}) is None
+
+
+def test_retry_delay_waits_at_least_retry_after():
+    for attempt in range(4):
+        assert rate_limiter.retry_delay(attempt, retry_after=0.2) >= 0.2
+        assert 0 <= rate_limiter.retry_delay(attempt) <= rate_limiter.RETRY_BASE_DELAY * 2 ** attempt
+
+
+def test_429_waits_retry_after_then_succeeds():
+    """429 응답 후 retry-after만큼 기다렸다가 재시도하여 성공하고, 같은 키의 제한기도 멈추는지 확인"""
+    responses = [
+        (429, {"retry-after-ms": "200"}, {"error": {"code": "rate_limit_exceeded"}}),
+        (200, {}, CHAT_RESPONSE),
+    ]
+
+    async def scenario(client, hits):
+        record = LLMCallRecord(call_site="test", model=client.model_name)
+        async with client._post("/chat/completions", chat_data(client), 10, record) as response:
+            result = await response.json()
+        limiter = rate_limiter.get_rate_limiter(client.api_key, client.model_name)
+        return result, record, hits, limiter
+
+    result, record, hits, limiter = asyncio.run(run_with_server(responses, scenario))
+    assert result["choices"][0]["message"]["content"] == "ok"
+    assert len(hits) == 2
+    assert record.retries == 1
+    assert hits[1] - hits[0] >= 0.2
+    assert limiter.blocked_until > 0
+
+
+def test_insufficient_quota_fails_without_retry():
+    """할당량 소진(insufficient_quota) 429는 재시도하지 않고 바로 실패하는지 확인"""
+    responses = [
+        (429, {"retry-after": "0"}, {"error": {"code": "insufficient_quota", "type": "insufficient_quota"}}),
+        (200, {}, CHAT_RESPONSE),
+    ]
+
+    async def scenario(client, hits):
+        record = LLMCallRecord(call_site="test", model=client.model_name)
+        with pytest.raises(Exception, match="429"):
+            async with client._post("/chat/completions", chat_data(client), 10, record):
+                pass
+        return record, hits
+
+    record, hits = asyncio.run(run_with_server(responses, scenario))
+    assert len(hits) == 1
+    assert record.retries == 0
+
+
+def test_chat_completion_retries_server_errors():
+    """5xx 응답은 재시도 후 채팅 응답 내용을 반환하는지 확인"""
+    responses = [
+        (503, {}, {"error": {"message": "overloaded"}}),
+        (200, {}, CHAT_RESPONSE),
+    ]
+
+    async def scenario(client, hits):
+        content = await client._call_chat_completion("hi", call_site="test")
+        return content, hits
+
+    content, hits = asyncio.run(run_with_server(responses, scenario))
+    assert content == "ok"
+    assert len(hits) == 2
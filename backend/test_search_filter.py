@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+메타데이터 비트맵 필터 검색 테스트
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(__file__))
+
+from app.shared.infra.search.embedding_index import EmbeddingIndex, SearchFilter
+from app.shared.infra.search.ivf_index import IVFIndex
+
+CONFERENCES = ["CVPR", "ICML", "NeurIPS", "ACL"]
+FIELDS = ["Computer Vision", "Machine Learning", "NLP"]
+
+
+def make_rows(count=400, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "id": 1000 + i,
+            "conference": CONFERENCES[rng.integers(len(CONFERENCES))],
+            "year": int(rng.integers(2018, 2025)) if i % 17 else None,
+            "field": FIELDS[rng.integers(len(FIELDS))],
+            "combined_embedding": rng.standard_normal(dim).tolist(),
+        }
+        for i in range(count)
+    ]
+
+
+def matches(row, filters):
+    """행 메타데이터를 직접 비교 (연도 조건이 있으면 연도 미상 행은 제외 - DB 범위 조건과 동일)"""
+    year = row["year"]
+    if (filters.year_from is not None or filters.year_to is not None) and year is None:
+        return False
+    return ((filters.conferences is None or row["conference"] in filters.conferences)
+            and (filters.year_from is None or year >= filters.year_from)
+            and (filters.year_to is None or year <= filters.year_to)
+            and (filters.fields is None or row["field"] in filters.fields))
+
+
+def brute_force(rows, query, limit, filters):
+    """조건을 만족하는 행만 골라 코사인 유사도 상위 limit개 계산"""
+    candidates = [row for row in rows if matches(row, filters)]
+    if not candidates:
+        return []
+    vectors = np.asarray([row["combined_embedding"] for row in candidates], dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = vectors @ (query / np.linalg.norm(query))
+    order = np.argsort(-scores, kind="stable")[:limit]
+    return [(candidates[i]["id"], float(scores[i])) for i in order]
+
+
+FILTERS = [
+    SearchFilter.create(conferences=["CVPR"]),
+    SearchFilter.create(conferences=["ICML", "ACL"], year_from=2021),
+    SearchFilter.create(year_from=2019, year_to=2020),
+    SearchFilter.create(year_to=2022, fields=["NLP"]),
+    SearchFilter.create(conferences=["NeurIPS"], year_from=2020, year_to=2023, fields=["Machine Learning", "NLP"]),
+    SearchFilter.create(conferences=["Unknown Conference"]),
+]
+
+
+def assert_same(results, expected):
+    assert [paper_id for paper_id, _ in results] == [paper_id for paper_id, _ in expected]
+    np.testing.assert_allclose([score for _, score in results], [score for _, score in expected], atol=1e-5)
+
+
+def test_create_without_conditions_returns_none():
+    assert SearchFilter.create() is None
+    assert SearchFilter.create(conferences=[], fields=[]) is None
+
+
+def test_filter_rows_match_metadata():
+    """filter_rows가 행 메타데이터를 직접 비교한 결과와 같은지 확인"""
+    rows = make_rows()
+    index = EmbeddingIndex.from_rows(rows)
+    by_id = {row["id"]: row for row in rows}
+    for filters in FILTERS:
+        selected = index.filter_rows(filters)
+        expected = {row["id"] for row in rows if matches(row, filters)}
+        assert set(index.paper_ids[selected].tolist()) == expected
+        assert all(matches(by_id[paper_id], filters) for paper_id in index.paper_ids[selected].tolist())
+
+
+def test_filtered_search_matches_brute_force():
+    """필터 검색 결과가 조건을 만족하는 행 전체 탐색 결과와 같은지 확인"""
+    rows = make_rows()
+    index = EmbeddingIndex.from_rows(rows)
+    rng = np.random.default_rng(1)
+    for filters in FILTERS:
+        query = rng.standard_normal(16).astype(np.float32)
+        assert_same(index.search(query, limit=10, filters=filters), brute_force(rows, query, 10, filters))
+
+
+def test_filtered_search_with_ann_all_lists_matches_brute_force():
+    """IVF 인덱스가 연결되어 있어도 모든 목록을 탐색하면 정확 검색과 같은지 확인"""
+    rows = make_rows()
+    index = EmbeddingIndex.from_rows(rows)
+    index.ann = IVFIndex.build(index, n_lists=8)
+    rng = np.random.default_rng(2)
+    for filters in FILTERS:
+        query = rng.standard_normal(16).astype(np.float32)
+        expected = brute_force(rows, query, 10, filters)
+        assert_same(index.search(query, limit=10, nprobe=8, filters=filters), expected)
+        assert_same(index.search(query, limit=10, nprobe=0, filters=filters), expected)